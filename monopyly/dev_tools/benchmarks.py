@@ -0,0 +1,406 @@
+"""
+Benchmarks for the hot paths of the `monopyly` package.
+
+Run them as a script:
+
+    python -m monopyly.dev_tools.benchmarks                      # print results as JSON
+    python -m monopyly.dev_tools.benchmarks --output run.json    # also write them to a file
+    python -m monopyly.dev_tools.benchmarks --check              # fail if slower than the baseline
+    python -m monopyly.dev_tools.benchmarks --save-baseline      # record a new baseline
+
+Each benchmark is timed over several repeats and the best repeat is kept, as nanoseconds per operation. Results are
+compared against `benchmark_baseline.json`; a benchmark regresses when it is more than its threshold slower than the
+baseline. Baselines are only comparable on the same machine, so re-record one when the hardware changes.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+
+BASELINE_FILE = Path(__file__).parent / 'benchmark_baseline.json'
+
+DEFAULT_THRESHOLD = 0.25
+"""How much slower than the baseline (as a fraction) a benchmark may get before it counts as a regression."""
+
+THRESHOLDS = {
+    'deeds.parse_csv':   0.50,
+    'game.play':         0.35,
+}
+"""Per-benchmark thresholds for the noisier benchmarks."""
+
+NUM_PLAYERS = 4
+STARTING_CASH = 1500
+
+
+class BenchmarkResult(NamedTuple):
+    name:        str
+    ns_per_op:   float
+    ops_per_sec: float
+    ops:         int
+    repeats:     int
+
+
+def _players(n: int = NUM_PLAYERS) -> list['Player']:
+    from monopyly.models.player import Player
+
+    players = []
+
+    for seat in range(n):
+        player = Player()
+        player.name = f'Player {seat + 1}'
+        player.cash = STARTING_CASH
+        players.append(player)
+
+    return players
+
+
+def _session(seed: int = 0) -> 'GameSession':
+    from monopyly.models.deeds.deed import PropertyDeed
+    from monopyly.models.session.session import GameSession
+
+    return GameSession(_players(), PropertyDeed.from_catalog(), rng=seed)
+
+
+def time_it(name: str, setup: Callable[[], Callable[[int], None]], ops: int, repeats: int = 5) -> BenchmarkResult:
+    """
+    Time a benchmark.
+
+    Parameters:
+        name (str):
+            The benchmark's name.
+
+        setup (Callable[[], Callable[[int], None]]):
+            Called before each repeat; returns the function to time, which is passed the number of operations to run.
+
+        ops (int):
+            The number of operations per repeat.
+
+        repeats (int):
+            The number of repeats; the fastest is kept.
+
+    Returns:
+        BenchmarkResult:
+            The result.
+    """
+    best = None
+
+    for _ in range(max(1, repeats)):
+        run   = setup()
+        start = time.perf_counter_ns()
+        run(ops)
+        elapsed = time.perf_counter_ns() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    ns_per_op = best / ops
+
+    return BenchmarkResult(name, ns_per_op, 1e9 / ns_per_op if ns_per_op else float('inf'), ops, repeats)
+
+
+def bench_die_roll():
+    from monopyly.models.dice.die import Die
+
+    die = Die()
+
+    def run(n):
+        roll = die.roll
+        for _ in range(n):
+            roll()
+
+    return run
+
+
+def bench_pair_roll():
+    from monopyly.models.dice.die import Die
+    from monopyly.models.dice.pair import Pair
+    from monopyly.utils.rng import RNGSource
+
+    pair = Pair(Die(), Die(), rng=RNGSource(0))
+
+    def run(n):
+        roll = pair.roll
+        for _ in range(n):
+            roll()
+
+    return run
+
+
+def bench_next_turn(restrictions: int):
+    def setup():
+        from monopyly.models.restrictions.development.base import DevelopmentRestriction
+
+        session = _session()
+        counter = session.turn_counter
+        seats   = counter.players
+
+        for i in range(restrictions):
+            DevelopmentRestriction(
+                session.deeds[i % len(session.deeds)], 1_000_000, seats[i % len(seats)], turn_counter=counter
+            )
+
+        def run(n):
+            next_turn = counter.next_turn
+            for _ in range(n):
+                next_turn()
+
+        return run
+
+    return setup
+
+
+def bench_rent_owed():
+    session = _session()
+    deed    = session.deeds[1]
+    deed.transfer(session.players[0])
+    session.deeds[0].transfer(session.players[0])
+
+    # The same deed on an unchanging board: every read after the first is a quote cache hit. See
+    # `bench_quote_rent_cold` for the cost of working a quote out.
+    def run(n):
+        for _ in range(n):
+            deed.rent_owed
+
+    return run
+
+
+def bench_quote_rent_cold():
+    session = _session()
+    players = session.players
+
+    for index, deed in enumerate(session.deeds):
+        if index % 4 != 3:
+            deed.transfer(players[index % len(players)])
+            deed.current_houses = index % 5
+
+    owned = [deed for deed in session.deeds if deed.owner is not None]
+
+    # Walk the owned deeds with a different dice total every call. A deed comes round again every len(owned) calls,
+    # which is not a multiple of the 11 totals, so its quote key has always changed and every call misses the cache.
+
+    def run(n):
+        count = len(owned)
+        for i in range(n):
+            owned[i % count].quote_rent(None, 2 + i % 11)
+
+    return run
+
+
+def bench_transaction_commit():
+    from monopyly.models.ledger.transactions.transaction import Transaction
+
+    session = _session()
+    ledger  = session.ledger
+    payer, payee = session.players[:2]
+
+    def run(n):
+        for _ in range(n):
+            Transaction(1, payer, payee).commit(ledger)
+
+    return run
+
+
+def bench_parse_csv():
+    from monopyly.models.deeds.loader import parse_deed_csv
+
+    def run(n):
+        for _ in range(n):
+            parse_deed_csv()
+
+    return run
+
+
+def bench_load_deed_file():
+    from monopyly.models.deeds.loader import load_deed_file, load_deeds
+
+    load_deeds()  # Make sure the compiled file exists.
+
+    def run(n):
+        for _ in range(n):
+            load_deed_file()
+
+    return run
+
+
+def bench_play_game(turns: int):
+    def setup():
+        from monopyly.models.session.simulation import play_game
+
+        sessions = iter([_session(seed) for seed in range(64)])
+
+        def run(n):
+            for _ in range(n):
+                play_game(next(sessions), max_turns=turns)
+
+        return run
+
+    return setup
+
+
+def bench_lockstep(games: int):
+    def setup():
+        from monopyly.models.session.lockstep import LockstepSimulation
+
+        simulation = LockstepSimulation(games, seed=0)
+
+        def run(n):
+            played = 0
+            while played < n:
+                stepped = simulation.step()
+                if not stepped:
+                    break
+                played += stepped
+
+        return run
+
+    return setup
+
+
+def run_benchmarks(quick: bool = False) -> list[BenchmarkResult]:
+    """
+    Run every benchmark.
+
+    Parameters:
+        quick (bool):
+            Run fewer operations and repeats, for a fast (noisier) check.
+
+    Returns:
+        list[BenchmarkResult]:
+            The results.
+    """
+    scale   = 10 if quick else 1
+    repeats = 3 if quick else 5
+
+    benchmarks = [
+        ('dice.die_roll',                    bench_die_roll,                200_000),
+        ('dice.pair_roll',                   bench_pair_roll,               100_000),
+        ('turns.next_turn',                  bench_next_turn(0),            100_000),
+        ('turns.next_turn.restrictions_100', bench_next_turn(100),          100_000),
+        ('turns.next_turn.restrictions_1k',  bench_next_turn(1_000),        100_000),
+        ('deeds.rent_owed',                  bench_rent_owed,               200_000),
+        ('deeds.quote_rent.cold',            bench_quote_rent_cold,         100_000),
+        ('ledger.transaction_commit',        bench_transaction_commit,       50_000),
+        ('deeds.parse_csv',                  bench_parse_csv,                   200),
+        ('deeds.load_deed_file',             bench_load_deed_file,            2_000),
+        ('game.play',                        bench_play_game(500),               10),
+        ('game.lockstep_turn',               bench_lockstep(10_000),      1_000_000),
+    ]
+
+    return [
+        time_it(name, setup, max(1, ops // scale), repeats)
+        for name, setup, ops in benchmarks
+    ]
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+
+    return {
+        'commit':    commit,
+        'python':    platform.python_version(),
+        'numpy':     numpy_version,
+        'machine':   platform.machine(),
+        'platform':  platform.platform(),
+        'timestamp': int(time.time()),
+    }
+
+
+def to_json(results: list[BenchmarkResult]) -> dict:
+    """Turn results into the JSON document written by the script."""
+    return {
+        'metadata': _metadata(),
+        'results':  {result.name: result._asdict() for result in results},
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: Optional[float] = None) -> list[str]:
+    """
+    Compare a run against a baseline.
+
+    Parameters:
+        results (dict):
+            A JSON document from `to_json`.
+
+        baseline (dict):
+            The baseline JSON document.
+
+        threshold (Optional[float]):
+            The regression threshold for every benchmark. Defaults to `THRESHOLDS`, then `DEFAULT_THRESHOLD`.
+
+    Returns:
+        list[str]:
+            A description of every regression. Empty if nothing got slower than allowed.
+    """
+    regressions = []
+
+    for name, result in results['results'].items():
+        base = baseline.get('results', {}).get(name)
+
+        if base is None:
+            continue
+
+        allowed = threshold if threshold is not None else THRESHOLDS.get(name, DEFAULT_THRESHOLD)
+        ratio   = result['ns_per_op'] / base['ns_per_op']
+
+        if ratio > 1 + allowed:
+            regressions.append(
+                f'{name}: {result["ns_per_op"]:.0f} ns/op vs {base["ns_per_op"]:.0f} ns/op baseline '
+                f'({ratio - 1:+.0%}, allowed {allowed:+.0%})'
+            )
+
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=Path, help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help='The baseline to compare against.')
+    parser.add_argument('--check', action='store_true', help='Exit with an error if anything regressed.')
+    parser.add_argument('--save-baseline', action='store_true', help='Record the results as the new baseline.')
+    parser.add_argument('--threshold', type=float, help='Override every regression threshold.')
+    parser.add_argument(
+        '--quick', action='store_true', help='Run fewer operations; too noisy to check against a full baseline.'
+    )
+    args = parser.parse_args(argv)
+
+    document = to_json(run_benchmarks(args.quick))
+    text     = json.dumps(document, indent=2)
+
+    print(text)
+
+    if args.output:
+        args.output.write_text(text + '\n')
+
+    if args.save_baseline:
+        args.baseline.write_text(text + '\n')
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    regressions = compare(document, json.loads(args.baseline.read_text()), args.threshold)
+
+    for regression in regressions:
+        print(regression, file=sys.stderr)
+
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
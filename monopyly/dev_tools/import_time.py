@@ -0,0 +1,165 @@
+"""
+Import-time budget for the `monopyly` package.
+
+Run it as a script to check every budgeted module:
+
+    python -m monopyly.dev_tools.import_time
+
+Each module is imported in a fresh interpreter with `-X importtime`, best of a few runs, and checked against two
+limits: a budget for the package's own import time, and a list of heavy dependencies that must not be imported
+eagerly.
+
+Most of a module's cumulative import time is the standard library (`typing`, `re`, `enum` and friends), which is paid
+once per process whatever the package does, and swings by tens of milliseconds between machines and runs. So the
+budgets count only the self time of `monopyly` modules: the part the package controls, measured against the stdlib
+baseline it loads on top of.
+"""
+import re
+import subprocess
+import sys
+from typing import NamedTuple, Optional
+
+
+IMPORT_BUDGETS_US = {
+    'monopyly':                                         500,
+    'monopyly.models.player':                         1_500,
+    'monopyly.models.dice.pair':                      8_000,
+    'monopyly.models.deeds.loader':                  10_000,
+    'monopyly.models.ledger.ledger':                  4_000,
+    'monopyly.models.turns.counter':                 18_000,
+    'monopyly.models.session.registry':              30_000,
+    'monopyly.models.board.markov':                  15_000,
+    'monopyly.models.deeds.utils':                    7_000,
+    'monopyly.dev_tools.players':                    20_000,
+}
+"""The most the package's own modules may take to import, for each module, in microseconds."""
+
+HEAVY_MODULES = ('numpy', 'pandas', 'faker')
+"""Dependencies that must only be loaded when first used."""
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+class ImportTiming(NamedTuple):
+    module:        str
+    cumulative_us: int
+    heavy_loaded:  tuple[str, ...]
+    slowest:       tuple[tuple[str, int], ...]
+    package_us:    int
+
+
+def measure_import_time(module: str, runs: int = 5, python: Optional[str] = None) -> ImportTiming:
+    """
+    Measure how long a module takes to import in a fresh interpreter.
+
+    Parameters:
+        module (str):
+            The module to import.
+
+        runs (int):
+            The number of fresh interpreters to try; the fastest run is kept.
+
+        python (Optional[str]):
+            The interpreter to use. Defaults to the current one.
+
+    Returns:
+        ImportTiming:
+            The cumulative import time of `module`, any heavy modules that were actually loaded, the five slowest
+            modules by self time, and the self time of the package's own modules.
+    """
+    python = python or sys.executable
+    # A lazily imported module still shows up in `sys.modules`; only count the ones that really loaded.
+    probe  = (
+        f'import sys, types, {module}\n'
+        f'print(",".join(n for n in {HEAVY_MODULES!r} '
+        f'if type(sys.modules.get(n)) is types.ModuleType))'
+    )
+
+    best = None
+
+    for _ in range(max(1, runs)):
+        result = subprocess.run(
+            [python, '-X', 'importtime', '-c', probe],
+            capture_output=True, text=True, check=True
+        )
+
+        self_times  = []
+        cumulative  = None
+        package     = 0
+
+        for line in result.stderr.splitlines():
+            match = _LINE.match(line)
+
+            if not match:
+                continue
+
+            self_us, cumulative_us, _, name = match.groups()
+            self_times.append((name, int(self_us)))
+
+            if name == 'monopyly' or name.startswith('monopyly.'):
+                package += int(self_us)
+
+            if name == module:
+                cumulative = int(cumulative_us)
+
+        if cumulative is None:
+            raise RuntimeError(f'No import time was reported for {module}; was it already imported at startup?')
+
+        heavy   = tuple(name for name in result.stdout.strip().split(',') if name)
+        slowest = tuple(sorted(self_times, key=lambda item: item[1], reverse=True)[:5])
+        timing  = ImportTiming(module, cumulative, heavy, slowest, package)
+
+        if best is None or timing.package_us < best.package_us:
+            best = timing
+
+    return best
+
+
+def check_import_budgets(budgets: Optional[dict[str, int]] = None, runs: int = 5) -> list[str]:
+    """
+    Check every budgeted module.
+
+    Parameters:
+        budgets (Optional[dict[str, int]]):
+            Budgets for the package's own import time in microseconds, keyed by module. Defaults to
+            `IMPORT_BUDGETS_US`.
+
+        runs (int):
+            The number of fresh interpreters to try per module.
+
+    Returns:
+        list[str]:
+            A description of every budget that was broken. Empty if everything is within budget.
+    """
+    failures = []
+
+    for module, budget in (budgets or IMPORT_BUDGETS_US).items():
+        timing = measure_import_time(module, runs)
+
+        if timing.heavy_loaded:
+            failures.append(f'{module} eagerly imports {", ".join(timing.heavy_loaded)}')
+
+        if timing.package_us > budget:
+            slowest = ', '.join(f'{name} ({us} us)' for name, us in timing.slowest)
+            failures.append(
+                f'{module} spent {timing.package_us} us in monopyly modules (budget {budget} us, '
+                f'{timing.cumulative_us} us in all); slowest: {slowest}'
+            )
+
+    return failures
+
+
+def main() -> int:
+    failures = check_import_budgets()
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+
+    if not failures:
+        print(f'All {len(IMPORT_BUDGETS_US)} modules are within their import budgets.')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
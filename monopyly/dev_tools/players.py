@@ -1,12 +1,30 @@
-from faker import Faker
 from monopyly.models.player import Player
 from monopyly.models.turns.counter import TurnCounter
 
 
-FAKE = Faker()
+_FAKE = None
 
 
-def get_fake_player_list(fake = FAKE, num_players = 4):
+def __getattr__(name):
+    # `FAKE` is built on first use; creating a `Faker` is slow and most imports of this module never need one.
+    if name == 'FAKE':
+        return get_fake()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_fake():
+    global _FAKE
+
+    if _FAKE is None:
+        from faker import Faker
+        _FAKE = Faker()
+
+    return _FAKE
+
+
+def get_fake_player_list(fake = None, num_players = 4):
+    fake = fake or get_fake()
     players = []
     for i in range(num_players):
         player = Player()
@@ -17,9 +35,8 @@ def get_fake_player_list(fake = FAKE, num_players = 4):
     return players
 
 
-def get_fake_turn_counter(fake = FAKE, num_players = 4):
+def get_fake_turn_counter(fake = None, num_players = 4):
     players = get_fake_player_list(fake, num_players)
 
     return TurnCounter(players)
 
-
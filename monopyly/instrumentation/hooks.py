@@ -0,0 +1,258 @@
+"""
+Counters, timers and histograms around the hot paths of a game.
+
+Instrumentation works by swapping the instrumented methods on their classes for measuring wrappers, and swapping the
+originals back when it is turned off. While it is off, the classes hold exactly the code they always had, so there is
+nothing to pay for it: no flag checks, no lookups, no extra calls.
+
+Instrumented:
+    - `TurnCounter.next_turn`: how long each call takes, and the time between turns of each game.
+    - `Transaction.commit` (and its subclasses): calls, amount moved and duration.
+    - `PropertyDeed.rent_owed`: reads and duration.
+    - `PropertyDeed.collect_rent`: calls and amount collected.
+    - `Pair.roll` and `Die.roll`: rolls, and duration of a pair roll.
+
+Example:
+    >>> instrumentation = Instrumentation(sinks=[OpenMetricsSink('metrics.txt')])
+    >>> with instrumentation:
+    ...     play_game(session)
+    >>> instrumentation.turn_latency(session.turn_counter).quantile(0.99)
+    >>> instrumentation.flush()
+"""
+import time
+from functools import wraps
+from typing import Optional, Sequence
+from weakref import WeakKeyDictionary, finalize
+
+from monopyly.instrumentation.metrics import Histogram, Registry
+
+
+TURN_LATENCY = 'monopyly_turn_latency_ns'
+"""The per-game histogram of the time between consecutive turns."""
+
+_active = None
+
+
+def active() -> Optional['Instrumentation']:
+    """Get the instrumentation that is currently on, if any."""
+    return _active
+
+
+class Instrumentation:
+    """
+    A set of metrics around the hot paths, and the sinks they are flushed to.
+
+    Only one instrumentation can be on at a time, since it works by patching classes.
+
+    Parameters:
+        registry (Optional[Registry]):
+            Where to keep the metrics. Defaults to a new registry.
+
+        sinks (Sequence):
+            Where `flush` sends the metrics. Anything with an `emit(registry)` method; see
+            `monopyly.instrumentation.sinks`.
+    """
+    def __init__(self, registry: Optional[Registry] = None, sinks: Sequence = ()):
+        self.__registry  = registry or Registry()
+        self.__sinks     = list(sinks)
+        self.__originals = []
+        self.__games     = WeakKeyDictionary()
+
+    def __enter__(self) -> 'Instrumentation':
+        self.instrument()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstrument()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__originals)
+
+    @property
+    def registry(self) -> Registry:
+        return self.__registry
+
+    @property
+    def sinks(self) -> list:
+        return self.__sinks
+
+    def __patch(self, cls: type, name: str, replacement):
+        self.__originals.append((cls, name, cls.__dict__[name]))
+        setattr(cls, name, replacement)
+
+    def __game(self, counter: 'TurnCounter') -> list:
+        game_id = counter.game_id if counter.game_id is not None else id(counter)
+        labels  = {'game': str(game_id)}
+        entry   = self.__games[counter] = [
+            self.__registry.histogram(TURN_LATENCY, 'Time between consecutive turns of a game.', labels),
+            None,
+            # The histogram goes when the game does, so games nobody calls `end_game` on don't pile up in the
+            # registry. Calling the finalizer early (from `end_game`) removes it once and detaches it.
+            finalize(counter, self.__registry.remove, TURN_LATENCY, labels),
+        ]
+
+        return entry
+
+    def end_game(self, counter: 'TurnCounter'):
+        """
+        Stop reporting a game's turn latency, such as once it has finished and been flushed.
+
+        This happens on its own when the game's turn counter is garbage collected, so only call it to drop the
+        histogram sooner.
+
+        Parameters:
+            counter (TurnCounter):
+                The game's turn counter.
+        """
+        entry = self.__games.pop(counter, None)
+
+        if entry is not None:
+            entry[2]()
+
+    def turn_latency(self, counter: 'TurnCounter') -> Optional[Histogram]:
+        """
+        Get the histogram of the time between consecutive turns of a game, in nanoseconds.
+
+        Parameters:
+            counter (TurnCounter):
+                The game's turn counter.
+
+        Returns:
+            Optional[Histogram]:
+                The histogram, or None if the game has not played a turn while instrumented.
+        """
+        entry = self.__games.get(counter)
+
+        return entry[0] if entry is not None else None
+
+    def instrument(self):
+        """Turn instrumentation on."""
+        global _active
+
+        if _active is self:
+            return
+
+        if _active is not None:
+            raise RuntimeError('Another instrumentation is already on.')
+
+        from monopyly.models.deeds.deed import PropertyDeed
+        from monopyly.models.dice.die import Die
+        from monopyly.models.dice.pair import Pair
+        from monopyly.models.ledger.transactions.transaction import Transaction
+        from monopyly.models.turns.counter import TurnCounter
+
+        registry = self.__registry
+        clock    = time.perf_counter_ns
+        games    = self.__games
+        new_game = self.__game
+
+        # Each wrapper closes over the metrics it updates, so recording is an attribute update, never a lookup.
+        next_turn_duration = registry.histogram('monopyly_next_turn_duration_ns', 'Time spent in next_turn.')
+        next_turn_original = TurnCounter.next_turn
+
+        @wraps(next_turn_original)
+        def next_turn(counter):
+            start = clock()
+            result = next_turn_original(counter)
+            end = clock()
+
+            next_turn_duration.record(end - start)
+
+            entry = games.get(counter)
+            if entry is None:
+                entry = new_game(counter)
+            elif entry[1] is not None:
+                entry[0].record(end - entry[1])
+
+            entry[1] = end
+
+            return result
+
+        commit_calls    = registry.counter('monopyly_transaction_commits', 'Transactions committed.')
+        commit_amount   = registry.counter('monopyly_transaction_amount', 'Total amount moved by transactions.')
+        commit_duration = registry.histogram('monopyly_transaction_commit_duration_ns', 'Time spent committing.')
+        commit_original = Transaction.commit
+
+        @wraps(commit_original)
+        def commit(transaction, *args, **kwargs):
+            start = clock()
+            result = commit_original(transaction, *args, **kwargs)
+            commit_duration.record(clock() - start)
+            commit_calls.value  += 1
+            commit_amount.value += transaction.amount
+
+            return result
+
+        rent_reads    = registry.counter('monopyly_rent_owed_reads', 'Reads of PropertyDeed.rent_owed.')
+        rent_duration = registry.histogram('monopyly_rent_owed_duration_ns', 'Time spent computing rent_owed.')
+        rent_original = PropertyDeed.__dict__['rent_owed']
+        rent_getter   = rent_original.fget
+
+        @wraps(rent_getter)
+        def rent_owed(deed):
+            start = clock()
+            result = rent_getter(deed)
+            rent_duration.record(clock() - start)
+            rent_reads.value += 1
+
+            return result
+
+        collect_calls    = registry.counter('monopyly_rent_collections', 'Rent payments collected.')
+        collect_amount   = registry.counter('monopyly_rent_collected', 'Total rent collected.')
+        collect_original = PropertyDeed.collect_rent
+
+        @wraps(collect_original)
+        def collect_rent(deed, amount, *args, **kwargs):
+            result = collect_original(deed, amount, *args, **kwargs)
+            collect_calls.value  += 1
+            collect_amount.value += amount
+
+            return result
+
+        pair_rolls    = registry.counter('monopyly_pair_rolls', 'Rolls of a pair of dice.')
+        pair_duration = registry.histogram('monopyly_pair_roll_duration_ns', 'Time spent rolling a pair of dice.')
+        pair_original = Pair.roll
+
+        @wraps(pair_original)
+        def pair_roll(pair):
+            start = clock()
+            result = pair_original(pair)
+            pair_duration.record(clock() - start)
+            pair_rolls.value += 1
+
+            return result
+
+        die_rolls    = registry.counter('monopyly_die_rolls', 'Rolls of a single die.')
+        die_original = Die.roll
+
+        @wraps(die_original)
+        def die_roll(die):
+            die_rolls.value += 1
+
+            return die_original(die)
+
+        self.__patch(TurnCounter, 'next_turn', next_turn)
+        self.__patch(Transaction, 'commit', commit)
+        self.__patch(PropertyDeed, 'rent_owed', property(rent_owed, doc=rent_original.__doc__))
+        self.__patch(PropertyDeed, 'collect_rent', collect_rent)
+        self.__patch(Pair, 'roll', pair_roll)
+        self.__patch(Die, 'roll', die_roll)
+
+        _active = self
+
+    def uninstrument(self):
+        """Turn instrumentation off, putting back the original methods."""
+        global _active
+
+        while self.__originals:
+            cls, name, original = self.__originals.pop()
+            setattr(cls, name, original)
+
+        if _active is self:
+            _active = None
+
+    def flush(self):
+        """Send the current metrics to every sink."""
+        for sink in self.__sinks:
+            sink.emit(self.__registry)
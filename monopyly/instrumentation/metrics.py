@@ -0,0 +1,195 @@
+from typing import Iterator, Optional
+
+
+SUB_BUCKETS = 8
+"""The number of buckets per power of two in a `Histogram`; values are kept to within 1/8 (12.5%)."""
+
+_SUB_BITS = SUB_BUCKETS.bit_length() - 1
+_BUCKETS  = SUB_BUCKETS + (64 - _SUB_BITS) * SUB_BUCKETS
+
+
+class Counter:
+    """A number that only goes up."""
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name: str, help: str = ''):
+        self.name  = name
+        self.help  = help
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0
+
+
+class Histogram:
+    """
+    A log-linear histogram of non-negative integers, such as latencies in nanoseconds.
+
+    Values are counted in buckets `SUB_BUCKETS` to a power of two, so recording a value is a few integer operations
+    and memory stays fixed however many values are recorded. Quantiles are accurate to within one bucket.
+
+    Parameters:
+        name (str):
+            The metric's name.
+
+        help (str):
+            What the metric measures.
+    """
+    __slots__ = ('name', 'help', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, name: str, help: str = ''):
+        self.name   = name
+        self.help   = help
+        self.counts = [0] * _BUCKETS
+        self.count  = 0
+        self.total  = 0
+        self.min    = None
+        self.max    = None
+
+    @staticmethod
+    def bucket_of(value: int) -> int:
+        """Get the index of the bucket a value is counted in."""
+        if value < SUB_BUCKETS:
+            return max(value, 0)
+
+        exponent = value.bit_length() - 1 - _SUB_BITS
+
+        return SUB_BUCKETS + exponent * SUB_BUCKETS + (value >> exponent) - SUB_BUCKETS
+
+    @staticmethod
+    def bucket_bounds(bucket: int) -> tuple[int, int]:
+        """Get the smallest value counted in a bucket, and the smallest counted in the next one."""
+        if bucket < SUB_BUCKETS:
+            return bucket, bucket + 1
+
+        exponent, sub = divmod(bucket - SUB_BUCKETS, SUB_BUCKETS)
+        low = (SUB_BUCKETS + sub) << exponent
+
+        return low, low + (1 << exponent)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, value: int):
+        self.counts[self.bucket_of(value)] += 1
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram'):
+        """Add every value recorded in another histogram to this one."""
+        for bucket, count in enumerate(other.counts):
+            if count:
+                self.counts[bucket] += count
+
+        self.count += other.count
+        self.total += other.total
+
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Parameters:
+            q (float):
+                The quantile, from 0 to 1 (0.5 for the median, 0.99 for p99).
+
+        Returns:
+            Optional[float]:
+                The estimate (the midpoint of the bucket the quantile falls in, clamped to the recorded range), or
+                None if nothing has been recorded.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError('Quantile must be between 0 and 1.')
+
+        if not self.count:
+            return None
+
+        rank = max(1, round(q * self.count))
+        seen = 0
+
+        for bucket, count in enumerate(self.counts):
+            seen += count
+
+            if seen >= rank:
+                low, high = self.bucket_bounds(bucket)
+
+                return min(max((low + high - 1) / 2, self.min), self.max)
+
+        return float(self.max)
+
+    def buckets(self) -> Iterator[tuple[int, int]]:
+        """Yield the upper bound (exclusive) and the cumulative count of every non-empty bucket."""
+        seen = 0
+
+        for bucket, count in enumerate(self.counts):
+            if count:
+                seen += count
+                yield self.bucket_bounds(bucket)[1], seen
+
+    def reset(self):
+        self.counts = [0] * _BUCKETS
+        self.count  = 0
+        self.total  = 0
+        self.min    = None
+        self.max    = None
+
+
+class Registry:
+    """
+    The metrics of a process, by name and labels.
+
+    Metrics are created once, when instrumentation is set up, and the instrumented code holds on to them; nothing on
+    the hot path looks a metric up by name.
+    """
+    def __init__(self):
+        self.__metrics = {}
+
+    def __iter__(self) -> Iterator[tuple[dict[str, str], 'Counter | Histogram']]:
+        for (_, labels), metric in self.__metrics.items():
+            yield dict(labels), metric
+
+    def __len__(self) -> int:
+        return len(self.__metrics)
+
+    def __get(self, cls, name: str, help: str, labels: Optional[dict[str, str]]):
+        key    = (name, tuple(sorted((labels or {}).items())))
+        metric = self.__metrics.get(key)
+
+        if metric is None:
+            metric = self.__metrics[key] = cls(name, help)
+        elif not isinstance(metric, cls):
+            raise TypeError(f'{name} is already registered as a {type(metric).__name__}.')
+
+        return metric
+
+    def counter(self, name: str, help: str = '', labels: Optional[dict[str, str]] = None) -> Counter:
+        """Get a counter, creating it if needed."""
+        return self.__get(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str = '', labels: Optional[dict[str, str]] = None) -> Histogram:
+        """Get a histogram, creating it if needed."""
+        return self.__get(Histogram, name, help, labels)
+
+    def remove(self, name: str, labels: Optional[dict[str, str]] = None):
+        """Drop a metric, if it exists."""
+        self.__metrics.pop((name, tuple(sorted((labels or {}).items()))), None)
+
+    def reset(self):
+        """Zero every metric."""
+        for metric in self.__metrics.values():
+            metric.reset()
@@ -0,0 +1,176 @@
+import json
+import time
+from pathlib import Path
+from typing import IO, Optional, Union
+
+from monopyly.instrumentation.metrics import Counter, Histogram, Registry
+
+
+QUANTILES = (0.5, 0.9, 0.99)
+"""The quantiles reported for every histogram."""
+
+
+def summarize(registry: Registry) -> list[dict]:
+    """
+    Get a plain summary of every metric in a registry.
+
+    Parameters:
+        registry (Registry):
+            The metrics.
+
+    Returns:
+        list[dict]:
+            One dictionary per metric, with its name, type, labels and values. Histograms report their count, sum,
+            min, max and `QUANTILES` (as `p50`, `p90`, `p99`).
+    """
+    summary = []
+
+    for labels, metric in registry:
+        entry = {'name': metric.name, 'labels': labels}
+
+        if isinstance(metric, Counter):
+            entry.update(type='counter', value=metric.value)
+        else:
+            entry.update(type='histogram', count=metric.count, sum=metric.total, min=metric.min, max=metric.max)
+            entry.update({f'p{round(q * 100)}': metric.quantile(q) for q in QUANTILES})
+
+        summary.append(entry)
+
+    return summary
+
+
+class MemorySink:
+    """
+    Keeps the summary of every flush in memory, for tests and in-process dashboards.
+
+    Parameters:
+        maxlen (Optional[int]):
+            The number of flushes to keep. If not specified, only the latest is kept.
+    """
+    def __init__(self, maxlen: Optional[int] = 1):
+        self.__maxlen    = maxlen
+        self.__summaries = []
+
+    @property
+    def latest(self) -> list[dict]:
+        """The summary from the most recent flush, or an empty list."""
+        return self.__summaries[-1][1] if self.__summaries else []
+
+    @property
+    def summaries(self) -> list[tuple[float, list[dict]]]:
+        """The time and summary of every kept flush, oldest first."""
+        return list(self.__summaries)
+
+    def emit(self, registry: Registry):
+        self.__summaries.append((time.time(), summarize(registry)))
+
+        if self.__maxlen is not None and len(self.__summaries) > self.__maxlen:
+            del self.__summaries[:-self.__maxlen]
+
+
+def _labels(labels: dict[str, str], **extra) -> str:
+    labels = {**labels, **extra}
+
+    if not labels:
+        return ''
+
+    def escape(value) -> str:
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def render_openmetrics(registry: Registry) -> str:
+    """
+    Render every metric in a registry in the OpenMetrics text format.
+
+    Counters get a `_total` sample. Histograms are written as summaries, with `QUANTILES`, `_count` and `_sum`.
+
+    Parameters:
+        registry (Registry):
+            The metrics.
+
+    Returns:
+        str:
+            The exposition, ending in `# EOF`.
+    """
+    families = {}
+
+    for labels, metric in registry:
+        families.setdefault(metric.name, []).append((labels, metric))
+
+    lines = []
+
+    for name, members in sorted(families.items()):
+        first = members[0][1]
+        kind  = 'counter' if isinstance(first, Counter) else 'summary'
+
+        lines.append(f'# TYPE {name} {kind}')
+
+        if first.help:
+            lines.append(f'# HELP {name} {first.help}')
+
+        for labels, metric in members:
+            if isinstance(metric, Counter):
+                lines.append(f'{name}_total{_labels(labels)} {metric.value}')
+                continue
+
+            for q in QUANTILES:
+                value = metric.quantile(q)
+
+                if value is not None:
+                    lines.append(f'{name}{_labels(labels, quantile=q)} {value}')
+
+            lines.append(f'{name}_count{_labels(labels)} {metric.count}')
+            lines.append(f'{name}_sum{_labels(labels)} {metric.total}')
+
+    lines.append('# EOF')
+
+    return '\n'.join(lines) + '\n'
+
+
+class OpenMetricsSink:
+    """
+    Writes every metric in the OpenMetrics text format, replacing the previous dump.
+
+    Parameters:
+        target (Union[str, Path, IO[str]]):
+            The file to write to (rewritten on every flush), or a text stream to write each dump to.
+    """
+    def __init__(self, target: Union[str, Path, IO[str]]):
+        self.__target = Path(target) if isinstance(target, str) else target
+
+    def emit(self, registry: Registry):
+        text = render_openmetrics(registry)
+
+        if isinstance(self.__target, Path):
+            # Write then rename, so a scraper never reads a half-written dump.
+            partial = self.__target.with_name(self.__target.name + '.tmp')
+            partial.write_text(text)
+            partial.replace(self.__target)
+        else:
+            self.__target.write(text)
+            self.__target.flush()
+
+
+class JsonLinesSink:
+    """
+    Appends one JSON line per metric to a file on every flush.
+
+    Parameters:
+        path (Union[str, Path]):
+            The file to append to.
+    """
+    def __init__(self, path: Union[str, Path]):
+        self.__path = Path(path)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def emit(self, registry: Registry):
+        now = time.time()
+
+        with self.__path.open('a') as file:
+            for entry in summarize(registry):
+                file.write(json.dumps({'time': now, **entry}) + '\n')
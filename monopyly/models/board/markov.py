@@ -0,0 +1,229 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.dice.pair import Pair
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+BOARD_SIZE        = 40
+JAIL_SPACE        = 10
+GO_TO_JAIL_SPACE  = 30
+JAIL_STRATEGIES   = ('short', 'long')
+
+MAX_DOUBLES       = 3
+MAX_JAIL_ATTEMPTS = 3
+
+
+def _roll_outcomes(sides: int) -> 'tuple[np.ndarray, np.ndarray, float]':
+    faces   = np.arange(1, sides + 1)
+    die_1   = np.repeat(faces, sides)
+    die_2   = np.tile(faces, sides)
+
+    return die_1 + die_2, die_1 == die_2, 1.0 / (sides * sides)
+
+
+def _build_transitions(
+        sides: int,
+        board_size: int,
+        jail: int,
+        go_to_jail: int,
+        jail_strategy: str
+) -> 'tuple[np.ndarray, np.ndarray]':
+    """
+    Build the roll-by-roll transition matrix and the landing matrix.
+
+    States `0 .. board_size * MAX_DOUBLES - 1` are `(space, doubles rolled so far this turn)`, laid out as
+    `doubles * board_size + space`. With the 'long' jail strategy, the final `MAX_JAIL_ATTEMPTS` states are the
+    turns spent in jail.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]:
+            - The `(states, states)` transition matrix.
+            - The `(states, board_size)` matrix of where the token ends up after a roll from each state.
+    """
+    sums, doubles, p = _roll_outcomes(sides)
+
+    jail_states = MAX_JAIL_ATTEMPTS if jail_strategy == 'long' else 0
+    n_states    = board_size * MAX_DOUBLES + jail_states
+    first_jail  = board_size * MAX_DOUBLES
+
+    # Being sent to jail means starting the next turn in jail; with the 'short' strategy that is just space
+    # `jail` with no doubles rolled, since the fine is paid straight away.
+    sent_to_jail = first_jail if jail_states else jail
+
+    transitions = np.zeros((n_states, n_states))
+    landings    = np.zeros((n_states, board_size))
+
+    spaces      = np.arange(board_size)
+    destination = (spaces[:, None] + sums[None, :]) % board_size
+    to_jail     = destination == go_to_jail
+
+    for rolled in range(MAX_DOUBLES):
+        rows = np.broadcast_to((rolled * board_size + spaces)[:, None], destination.shape)
+
+        if rolled == MAX_DOUBLES - 1:
+            # A third double in a row goes straight to jail.
+            next_rolled = np.zeros_like(destination)
+            caught      = to_jail | doubles[None, :]
+        else:
+            next_rolled = np.where(doubles, rolled + 1, 0)[None, :].repeat(board_size, axis=0)
+            caught      = to_jail
+
+        targets = np.where(caught, sent_to_jail, next_rolled * board_size + destination)
+        landed  = np.where(caught, jail, destination)
+
+        np.add.at(transitions, (rows, targets), p)
+        np.add.at(landings, (rows, landed), p)
+
+    for attempt in range(jail_states):
+        row         = first_jail + attempt
+        destination = (jail + sums) % board_size
+
+        if attempt == jail_states - 1:
+            # The last attempt pays the fine and moves on whatever was rolled, with no extra roll for doubles.
+            targets = destination
+            landed  = destination
+        else:
+            targets = np.where(doubles, destination, row + 1)
+            landed  = np.where(doubles, destination, jail)
+
+        np.add.at(transitions[row], targets, p)
+        np.add.at(landings[row], landed, p)
+
+    return transitions, landings
+
+
+def _steady_state(transitions: 'np.ndarray') -> 'np.ndarray':
+    n = len(transitions)
+
+    # Solve pi (P - I) = 0 with the last equation swapped for sum(pi) = 1.
+    system     = transitions.T - np.eye(n)
+    system[-1] = 1.0
+    rhs        = np.zeros(n)
+    rhs[-1]    = 1.0
+
+    return np.linalg.solve(system, rhs)
+
+
+@lru_cache(maxsize=32)
+def _space_probabilities(
+        sides: int,
+        board_size: int,
+        jail: int,
+        go_to_jail: int,
+        jail_strategy: str
+) -> 'np.ndarray':
+    transitions, landings = _build_transitions(sides, board_size, jail, go_to_jail, jail_strategy)
+    probabilities = _steady_state(transitions) @ landings
+    probabilities.setflags(write=False)
+
+    return probabilities
+
+
+def space_landing_probabilities(
+        sides: int = 6,
+        board_size: int = BOARD_SIZE,
+        jail: int = JAIL_SPACE,
+        go_to_jail: int = GO_TO_JAIL_SPACE,
+        jail_strategy: str = 'short',
+        pair: Optional[Pair] = None
+) -> 'np.ndarray':
+    """
+    Get the long-run probability of a roll leaving a token on each space of the board.
+
+    The chain accounts for extra rolls on doubles, going to jail on a third double in a row, and the go-to-jail
+    space. Cards are not modelled. Results are cached per board layout and number of sides.
+
+    Parameters:
+        sides (int):
+            The number of sides on each die. Ignored if `pair` is given.
+
+        board_size (int):
+            The number of spaces on the board.
+
+        jail (int):
+            The jail space.
+
+        go_to_jail (int):
+            The go-to-jail space. Tokens never stay on it, so its probability is always zero.
+
+        jail_strategy (str):
+            One of;
+              - 'short';
+                  Pay the fine and leave jail straight away.
+              - 'long';
+                  Stay in jail as long as possible, trying for doubles, and only pay on the third failed attempt.
+
+        pair (Optional[Pair]):
+            The dice to model. If given, the number of sides is taken from them.
+
+    Returns:
+        numpy.ndarray:
+            A read-only array of `board_size` probabilities that sums to one.
+    """
+    if pair is not None:
+        sides = pair.die_1.sides
+
+    if jail_strategy not in JAIL_STRATEGIES:
+        raise ValueError(f'Invalid jail strategy: {jail_strategy}. Must be one of {JAIL_STRATEGIES}.')
+
+    if not 0 <= jail < board_size or not 0 <= go_to_jail < board_size:
+        raise ValueError('Jail and go-to-jail must be spaces on the board.')
+
+    return _space_probabilities(int(sides), int(board_size), int(jail), int(go_to_jail), jail_strategy)
+
+
+def read_board_spaces(csv_file: Optional[Union[str, Path]] = None) -> tuple[tuple[str, int], ...]:
+    """
+    Read the name and board space of every deed from a properties CSV.
+
+    Parameters:
+        csv_file (Optional[Union[str, Path]]):
+            The CSV to read. If not specified, the bundled `properties.csv` is used.
+
+    Returns:
+        tuple[tuple[str, int], ...]:
+            `(name, space)` pairs, in file order.
+    """
+    return tuple((spec.name, spec.space) for spec in load_deeds(csv_file))
+
+
+def property_landing_probabilities(
+        csv_file: Optional[Union[str, Path]] = None,
+        sides: int = 6,
+        jail_strategy: str = 'short',
+        pair: Optional[Pair] = None
+) -> dict[str, float]:
+    """
+    Get the long-run landing probability of every deed on the board.
+
+    Parameters:
+        csv_file (Optional[Union[str, Path]]):
+            The properties CSV defining the board. If not specified, the bundled `properties.csv` is used.
+
+        sides (int):
+            The number of sides on each die. Ignored if `pair` is given.
+
+        jail_strategy (str):
+            See `space_landing_probabilities`.
+
+        pair (Optional[Pair]):
+            The dice to model. If given, the number of sides is taken from them.
+
+    Returns:
+        dict[str, float]:
+            The landing probability of each deed, keyed by deed name.
+
+    Example:
+        >>> probabilities = property_landing_probabilities()
+        >>> round(probabilities['Illinois'], 4)
+        0.0268
+    """
+    spaces = space_landing_probabilities(sides=sides, jail_strategy=jail_strategy, pair=pair)
+
+    return {name: float(spaces[space]) for name, space in read_board_spaces(csv_file)}
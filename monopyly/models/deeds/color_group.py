@@ -9,4 +9,12 @@ class ColorGroup:
         self.color_name = color_name
         self.total_properties = total_properties
 
-        self.__deeds = []
\ No newline at end of file
+        self.__deeds = []
+
+    @property
+    def deeds(self) -> list['PropertyDeed']:
+        return self.__deeds
+
+    def add_deed(self, deed: 'PropertyDeed'):
+        if deed not in self.__deeds:
+            self.__deeds.append(deed)
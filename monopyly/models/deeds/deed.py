@@ -1,16 +1,40 @@
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Sequence
 
 from monopyly.models.deeds.color_group import ColorGroup
+from monopyly.models.deeds.ownership import OwnershipIndex, group_key
+from monopyly.models.deeds.rent import AVERAGE_DICE_TOTAL, HOTEL, RAILROAD_RENTS, UTILITY_MULTIPLIERS, deed_rent
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.models.deeds.state import DeedState
 from monopyly.models.player import Player
 
 
-
 class PropertyDeed:
+    """
+    A deed in a game: a view over its printed facts (a shared `DeedSpec`) and its row of game state (a `DeedState`).
+
+    Deeds of one game should share one `DeedState`; see `from_catalog`. A deed created without one gets its own.
+    """
     ALLOWED_TYPES = [
         'street',
         'railroad',
         'utility'
     ]
+
+    __slots__ = (
+        '__spec',
+        '__state',
+        '__row',
+        '__color',
+        '__base_rent',
+        '__rent_schedule',
+        '__ownership_index',
+        '__quote',
+        '__quote_key',
+        'event_log',
+    )
+
     def __init__(
         self,
         color: 'ColorGroup',
@@ -23,31 +47,234 @@ class PropertyDeed:
         rent_history: Optional['RentHistory'] = None,
         development_allowed: bool = False,
         type_of_development_allowed: Optional[str] = None,
-        immunity_tracker: Optional['ImmunityTracker'] = None
+        immunity_tracker: Optional['ImmunityTracker'] = None,
+        deed_type: str = 'street',
+        rent_schedule: Optional[tuple[int, ...]] = None,
+        ownership_index: Optional['OwnershipIndex'] = None,
+        state: Optional['DeedState'] = None
     ):
-        self.__base_rent    = None
-        self.__color        = None
-        self.__listed_price = None
-        self.__type         = None
-
-        self.color = color
-        self.name = name
-        self.listed_price = listed_price
+        if not isinstance(base_rent, int):
+            raise ValueError("Base rent must be an integer.")
+
+        if deed_type not in self.ALLOWED_TYPES:
+            raise ValueError(f"Invalid deed type: {deed_type}. Must be one of {self.ALLOWED_TYPES}.")
+
+        if rent_schedule is not None:
+            rent_schedule = tuple(rent_schedule)
+
+            if len(rent_schedule) != HOTEL + 1 or not all(isinstance(rent, int) for rent in rent_schedule):
+                raise ValueError(f"Rent schedule must be {HOTEL + 1} integers (0-4 houses and a hotel).")
+
+        spec = DeedSpec(
+            index=-1,
+            name=name,
+            deed_type=deed_type,
+            color=getattr(color, 'color_name', color) if deed_type == 'street' else None,
+            space=-1,
+            cost=listed_price,
+            mortgage=listed_price // 2,
+            house_price=0,
+            rents=rent_schedule or (0,) * (HOTEL + 1),
+        )
+
+        self.__bind(spec, color, base_rent, rent_schedule, state, owner, mortgaged, mortgage_amount, rent_history,
+                    development_allowed, type_of_development_allowed, immunity_tracker, ownership_index)
+
+    def __bind(
+            self,
+            spec: DeedSpec,
+            color,
+            base_rent: int,
+            rent_schedule: Optional[tuple[int, ...]],
+            state: Optional['DeedState'],
+            owner: Optional['Player'] = None,
+            mortgaged: bool = False,
+            mortgage_amount: int = 0,
+            rent_history: Optional['RentHistory'] = None,
+            development_allowed: bool = False,
+            type_of_development_allowed: Optional[str] = None,
+            immunity_tracker: Optional['ImmunityTracker'] = None,
+            ownership_index: Optional['OwnershipIndex'] = None
+    ):
+        state = DeedState() if state is None else state
+
+        self.__spec            = spec
+        self.__state           = state
+        self.__row             = state.add(development_allowed, type_of_development_allowed, rent_history,
+                                           immunity_tracker)
+        self.__color           = color
+        self.__base_rent       = base_rent
+        self.__rent_schedule   = rent_schedule
+        self.__ownership_index = None
+        self.__quote           = None
+        self.__quote_key       = None
+
+        self.event_log = None
+
         self.owner = owner
         self.mortgaged = mortgaged
         self.mortgage_amount = mortgage_amount
-        self._rent_history = rent_history or RentHistory()
-        self.development_allowed = development_allowed
-        self.type_of_development_allowed = type_of_development_allowed
-        self.current_houses = 0
-        self.current_hotels = 0
-        self.immunity_tracker = immunity_tracker or ImmunityTracker()
-        self.total_rent_collected_by_owner = 0
-        self.total_rent_collected = 0
-        self.total_revenue = 0
-        self.last_purchase_price = 0
 
-        self.base_rent = base_rent
+        if ownership_index is not None:
+            self.ownership_index = ownership_index
+
+    @classmethod
+    def from_spec(
+            cls,
+            spec: DeedSpec,
+            color: Optional['ColorGroup'] = None,
+            state: Optional['DeedState'] = None,
+            **kwargs
+    ) -> 'PropertyDeed':
+        """
+        Create a deed from its catalog entry.
+
+        Parameters:
+            spec (DeedSpec):
+                The catalog entry, as returned by `load_deeds`.
+
+            color (Optional[ColorGroup]):
+                The color group the deed belongs to. If not specified, the deed is grouped by the color name in its
+                catalog entry.
+
+            state (Optional[DeedState]):
+                The game's deed state to add the deed's row to. If not specified, the deed gets its own.
+
+        Returns:
+            PropertyDeed:
+                The new deed.
+        """
+        deed = cls.__new__(cls)
+        deed.__bind(
+            spec,
+            color if color is not None else spec.color,
+            deed_rent(spec),
+            spec.rents if spec.developable else None,
+            state,
+            development_allowed=spec.developable,
+            **kwargs
+        )
+
+        if isinstance(color, ColorGroup):
+            color.add_deed(deed)
+
+        return deed
+
+    @classmethod
+    def from_catalog(
+            cls,
+            specs: Optional[Sequence[DeedSpec]] = None,
+            state: Optional['DeedState'] = None,
+            **kwargs
+    ) -> list['PropertyDeed']:
+        """
+        Create the deeds of a game, sharing one `DeedState`.
+
+        Parameters:
+            specs (Optional[Sequence[DeedSpec]]):
+                The catalog. Defaults to the bundled one.
+
+            state (Optional[DeedState]):
+                The game's deed state. If not specified, a new one is created.
+
+        Returns:
+            list[PropertyDeed]:
+                A deed for every spec, in catalog order.
+        """
+        state = DeedState() if state is None else state
+        specs = load_deeds() if specs is None else specs
+
+        return [cls.from_spec(spec, state=state, **kwargs) for spec in specs]
+
+    @property
+    def color(self):
+        return self.__color
+
+    @property
+    def current_hotels(self) -> int:
+        return self.__state.hotels[self.__row]
+
+    @current_hotels.setter
+    def current_hotels(self, new: int):
+        self.__state.hotels[self.__row] = new
+
+    @property
+    def current_houses(self) -> int:
+        return self.__state.houses[self.__row]
+
+    @current_houses.setter
+    def current_houses(self, new: int):
+        self.__state.houses[self.__row] = new
+
+    @property
+    def immunity_tracker(self) -> 'ImmunityTracker':
+        return self.__state.immunity_tracker(self.__row)
+
+    @property
+    def last_purchase_price(self) -> int:
+        return self.__state.last_purchase_price[self.__row]
+
+    @last_purchase_price.setter
+    def last_purchase_price(self, new: int):
+        self.__state.last_purchase_price[self.__row] = new
+
+    @property
+    def listed_price(self) -> int:
+        return self.__spec.cost
+
+    @property
+    def mortgage_amount(self) -> int:
+        return self.__state.mortgage_amount[self.__row]
+
+    @mortgage_amount.setter
+    def mortgage_amount(self, new: int):
+        self.__state.mortgage_amount[self.__row] = new
+
+    @property
+    def name(self) -> str:
+        return self.__spec.name
+
+    @property
+    def spec(self) -> DeedSpec:
+        """The deed's printed facts. Deeds created from a catalog share their spec with every other game."""
+        return self.__spec
+
+    @property
+    def state(self) -> 'DeedState':
+        """The deed state of the game the deed belongs to."""
+        return self.__state
+
+    @property
+    def total_rent_collected(self) -> int:
+        return self.__state.rent_collected[self.__row]
+
+    @total_rent_collected.setter
+    def total_rent_collected(self, new: int):
+        self.__state.rent_collected[self.__row] = new
+
+    @property
+    def total_rent_collected_by_owner(self) -> int:
+        return self.__state.rent_collected_by_owner[self.__row]
+
+    @total_rent_collected_by_owner.setter
+    def total_rent_collected_by_owner(self, new: int):
+        self.__state.rent_collected_by_owner[self.__row] = new
+
+    @property
+    def total_revenue(self) -> int:
+        return self.__state.revenue[self.__row]
+
+    @total_revenue.setter
+    def total_revenue(self, new: int):
+        self.__state.revenue[self.__row] = new
+
+    @property
+    def type_of_development_allowed(self) -> Optional[str]:
+        return self.__state.development_type(self.__row)
+
+    @type_of_development_allowed.setter
+    def type_of_development_allowed(self, new: Optional[str]):
+        self.__state.set_development_type(self.__row, new)
 
     @property
     def base_rent(self):
@@ -88,7 +315,83 @@ class PropertyDeed:
                 - False:
                   Development is not allowed on the property.
         """
-        return self.__development_allowed
+        return bool(self.__state.development_allowed[self.__row])
+
+    @development_allowed.setter
+    def development_allowed(self, new: bool):
+        self.__state.development_allowed[self.__row] = bool(new)
+
+    @property
+    def development_level(self) -> int:
+        """
+        Get the development level of the property.
+
+        Returns:
+            int:
+                The number of houses (0-4), or `HOTEL` if the property has a hotel.
+        """
+        if self.current_hotels:
+            return HOTEL
+
+        return min(self.current_houses, HOTEL - 1)
+
+    @property
+    def group(self):
+        """
+        Get the key of the group the property counts towards for monopolies.
+
+        Returns:
+            Hashable:
+                The color name of a street, or 'railroad' or 'utility'.
+        """
+        return group_key(self)
+
+    @property
+    def mortgaged(self) -> bool:
+        return bool(self.__state.mortgaged[self.__row])
+
+    @mortgaged.setter
+    def mortgaged(self, new: bool):
+        new = bool(new)
+
+        if new == self.mortgaged:
+            return
+
+        self.__state.mortgaged[self.__row] = new
+
+        if self.__ownership_index is not None:
+            self.__ownership_index.mortgage_changed(self, new)
+
+        if self.event_log is not None:
+            self.event_log.on_mortgage(self)
+
+    @property
+    def owner(self) -> Optional['Player']:
+        return self.__state.owners[self.__row]
+
+    @owner.setter
+    def owner(self, new: Optional['Player']):
+        owners = self.__state.owners
+        old = owners[self.__row]
+        owners[self.__row] = new
+
+        if self.__ownership_index is not None:
+            self.__ownership_index.transferred(self, old, new)
+
+    @property
+    def ownership_index(self) -> Optional['OwnershipIndex']:
+        return self.__ownership_index
+
+    @ownership_index.setter
+    def ownership_index(self, new: 'OwnershipIndex'):
+        if self.__ownership_index is not None:
+            raise ValueError("Ownership index is already set.")
+
+        if not isinstance(new, OwnershipIndex):
+            raise ValueError("Ownership index must be an OwnershipIndex instance.")
+
+        self.__ownership_index = new
+        new.register(self)
 
     @property
     def mortgage_owed(self) -> int:
@@ -107,15 +410,80 @@ class PropertyDeed:
                 - True:
                   The owner owns all properties in the color group.
         """
+        if self.owner is None:
+            return False
+
+        if self.__ownership_index is not None:
+            return self.__ownership_index.has_monopoly(self.owner, self.group)
+
+        deeds = getattr(self.color, 'deeds', None)
+
+        return bool(deeds) and all(deed.owner is self.owner for deed in deeds)
+
+    @property
+    def rent_history(self) -> 'RentHistory':
+        return self.__state.rent_history(self.__row)
 
     @property
     def rent_owed(self) -> int:
-        """Calculate the rent owed based on development and immunity status."""
-        if self.immunity_tracker.is_active():
+        """
+        Calculate the rent owed based on ownership, development and immunity status.
+
+        Reading this has no side effects; use `charge_rent` to actually collect rent.
+        """
+        tracker = self.__state.immunity_trackers.get(self.__row)
+
+        if tracker is not None and tracker.is_active():
             return 0
-        base_rent = self._calculate_base_rent()
-        self._rent_history.log(base_rent)
-        return base_rent
+
+        return self.quote_rent()
+
+    def quote_rent(self, payer: Optional['Player'] = None, dice_total: int = AVERAGE_DICE_TOTAL) -> int:
+        """
+        Quote the rent a player landing on the property would owe, without collecting it.
+
+        Quotes are cached until ownership, mortgages or development in the property's group change.
+
+        Parameters:
+            payer (Optional[Player]):
+                The player who landed on the property. Used to check for immunity; if not specified, no immunity
+                applies.
+
+            dice_total (int):
+                The total of the roll that brought the payer here. Only matters for utilities.
+
+        Returns:
+            int:
+                The rent owed. Zero if the property is unowned, mortgaged, owned by the payer, or the payer is immune.
+        """
+        state = self.__state
+        row   = self.__row
+        owner = state.owners[row]
+
+        if owner is None or state.mortgaged[row] or payer is owner:
+            return 0
+
+        if payer is not None:
+            tracker = state.immunity_trackers.get(row)
+
+            if tracker is not None and tracker.is_active(payer):
+                return 0
+
+        index = self.__ownership_index
+
+        if index is not None:
+            group = index.version(self.group)
+        else:
+            # Without an index, a monopoly is read off the group's deeds, so their owners are part of the key.
+            group = tuple(deed.owner for deed in getattr(self.color, 'deeds', None) or ())
+
+        key = (group, owner, state.houses[row], state.hotels[row], dice_total)
+
+        if key != self.__quote_key:
+            self.__quote     = self._calculate_base_rent(dice_total)
+            self.__quote_key = key
+
+        return self.__quote
 
     @property
     def deed_type(self) -> str:
@@ -127,9 +495,37 @@ class PropertyDeed:
           - 'utility'
 
         """
+        return self.__spec.deed_type
+
+    @property
+    def rent_schedule(self) -> Optional[tuple[int, ...]]:
+        """
+        Get the printed rent schedule of a street.
+
+        Returns:
+            Optional[tuple[int, ...]]:
+                The rent with 0-4 houses and with a hotel, or None if the deed has no schedule.
+        """
+        return self.__rent_schedule
 
-    def _calculate_base_rent(self) -> int:
+    def _calculate_base_rent(self, dice_total: int = AVERAGE_DICE_TOTAL) -> int:
         """Private method to calculate the base rent."""
+        if self.rent_schedule is not None:
+            rent = self.rent_schedule[self.development_level]
+
+            return rent * 2 if self.owner_has_monopoly and not self.development_level else rent
+
+        if self.deed_type != 'street':
+            if self.__ownership_index is None or self.owner is None:
+                return self.base_rent
+
+            if self.deed_type == 'railroad':
+                owned = self.__ownership_index.railroads_owned(self.owner)
+                return RAILROAD_RENTS[min(owned, len(RAILROAD_RENTS) - 1)]
+
+            owned = self.__ownership_index.utilities_owned(self.owner)
+            return UTILITY_MULTIPLIERS[min(owned, len(UTILITY_MULTIPLIERS) - 1)] * dice_total
+
         base_rent = self.listed_price // 10  # Example calculation
         if self.current_houses > 0:
             base_rent += self.current_houses * (self.listed_price // 5)
@@ -140,21 +536,65 @@ class PropertyDeed:
     def mortgage(self):
         """Mortgage the property."""
         if not self.mortgaged:
-            self.mortgaged = True
             self.mortgage_amount = self.listed_price // 2
+            self.mortgaged = True
 
     def lift_mortgage(self):
         """Lift the mortgage on the property."""
         if self.mortgaged:
-            self.mortgaged = False
             self.mortgage_amount = 0
+            self.mortgaged = False
 
-    def collect_rent(self, amount: int):
+    def collect_rent(self, amount: int, turn: int = 0):
         """Record rent collection."""
         self.total_rent_collected += amount
         if self.owner:
             self.total_rent_collected_by_owner += amount
         self.total_revenue += amount
+        self.rent_history.log(amount, turn)
+
+        if self.event_log is not None:
+            self.event_log.on_rent(self, amount, turn)
+
+    def charge_rent(
+            self,
+            payer: 'Player',
+            dice_total: int = AVERAGE_DICE_TOTAL,
+            ledger: Optional['Ledger'] = None,
+            turn: int = 0
+    ) -> Optional['RentTransaction']:
+        """
+        Collect rent from a player who landed on the property.
+
+        Parameters:
+            payer (Player):
+                The player who landed on the property.
+
+            dice_total (int):
+                The total of the roll that brought them here. Only matters for utilities.
+
+            ledger (Optional[Ledger]):
+                If given, the payment is recorded in it.
+
+            turn (int):
+                The turn the rent is paid on.
+
+        Returns:
+            Optional[RentTransaction]:
+                The settled payment, or None if no rent was owed.
+        """
+        from monopyly.models.ledger.transactions.rent import RentTransaction
+
+        amount = self.quote_rent(payer, dice_total)
+
+        if not amount:
+            return None
+
+        transaction = RentTransaction(amount, payer, self.owner, self.name)
+        transaction.commit(ledger, turn)
+        self.collect_rent(amount, turn)
+
+        return transaction
 
     def develop(self, development_type: str):
         """Develop the property with houses or hotels."""
@@ -167,6 +607,11 @@ class PropertyDeed:
             self.current_houses += 1
         elif development_type == "hotel" and self.type_of_development_allowed == "hotel":
             self.current_hotels += 1
+        else:
+            return
+
+        if self.event_log is not None:
+            self.event_log.on_develop(self)
 
     def transfer(self, new_owner: Player, price_paid: int = None):
         """Transfer ownership of the property."""
@@ -175,7 +620,10 @@ class PropertyDeed:
             price_paid = self.listed_price
 
         self.owner = new_owner
-        self.last_purchase_price = self.listed_price
+        self.last_purchase_price = price_paid
+
+        if self.event_log is not None:
+            self.event_log.on_transfer(self, price_paid)
 
     def __str__(self):
         """String representation for debugging and display."""
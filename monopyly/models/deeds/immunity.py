@@ -0,0 +1,69 @@
+from typing import Optional
+
+
+class ImmunityTracker:
+    """
+    Tracks which players are immune from paying rent on a deed.
+
+    Immunities either last until revoked, or for a number of the immune player's turns, in which case the game's
+    `EffectScheduler` revokes them when they run out.
+    """
+    def __init__(self):
+        self.__immune_players = {}
+
+    def grant(self, player: 'Player', turns: Optional[int] = None, scheduler: Optional['EffectScheduler'] = None):
+        """
+        Make a player immune from paying rent.
+
+        Parameters:
+            player (Player):
+                The player.
+
+            turns (Optional[int]):
+                The number of the player's turns the immunity lasts. If not specified, it lasts until revoked.
+
+            scheduler (Optional[EffectScheduler]):
+                The scheduler of the game, usually `TurnCounter.scheduler`. Required when `turns` is given.
+        """
+        self.revoke(player)
+
+        effect = None
+
+        if turns is not None:
+            if scheduler is None:
+                raise ValueError('A scheduler is needed to grant an immunity for a number of turns.')
+
+            if not turns:
+                return
+
+            effect = scheduler.schedule(player, turns, lambda: self.__expire(player, effect))
+
+        self.__immune_players[player] = effect
+
+    def is_active(self, player: Optional['Player'] = None) -> bool:
+        """
+        Check for an active immunity.
+
+        Parameters:
+            player (Optional[Player]):
+                The player to check. If not specified, checks whether anyone is immune.
+
+        Returns:
+            bool:
+                - True:
+                  The player (or anyone, if no player was given) is immune.
+        """
+        if player is None:
+            return bool(self.__immune_players)
+
+        return player in self.__immune_players
+
+    def revoke(self, player: 'Player'):
+        effect = self.__immune_players.pop(player, None)
+
+        if effect is not None:
+            effect.cancel()
+
+    def __expire(self, player: 'Player', effect: 'ScheduledEffect'):
+        if self.__immune_players.get(player) is effect:
+            del self.__immune_players[player]
@@ -1,32 +1,328 @@
+import csv
+import hashlib
+import mmap
+import os
+import struct
+from functools import lru_cache
 from pathlib import Path
-import pickle
-from typing import Union, List, Optional
-from monopyly.models.deeds.color_group import ColorGroup
+from typing import Union, Optional
 
+from monopyly.models.deeds.spec import DEED_TYPES, DeedSpec
 
-DEFAULT_DEED_FILE = Path(__file__).parent / 'deeds.pkl'
 
+DEFAULT_CSV_FILE  = Path(__file__).parent / 'properties.csv'
+DEFAULT_DEED_FILE = DEFAULT_CSV_FILE.with_suffix('.bin')
 
-def load_deed_file(deed_file: Optional[Union[str, Path]] = None):
-    deed_file = deed_file or DEFAULT_DEED_FILE
+RENT_COLUMNS = ('rent_0', 'rent_1', 'rent_2', 'rent_3', 'rent_4', 'rent_hotel')
 
+# The compiled deed file is a fixed-size header, one fixed-size record per deed, then a blob of UTF-8 strings
+# the records point into.
+MAGIC   = b'MPDK'
+VERSION = 1
+HEADER  = struct.Struct('<4sHHqq32sI')  # magic, version, count, csv mtime_ns, csv size, csv sha256, strings offset
+RECORD  = struct.Struct('<BxHHHH6HIHIH')  # type, space, cost, mortgage, house price, rents, name, color
 
-def load_deeds(deed_file: Optional[Union[str, Path]] = None) -> List:
+NO_COLOR = 0xFFFFFFFF
+
+
+def _resolve(path: Union[str, Path]) -> Path:
+    if not isinstance(path, (Path, str)):
+        raise TypeError("path must be a string or Path object.")
+
+    return Path(path).expanduser().resolve().absolute()
+
+
+def deed_file_for(csv_file: Union[str, Path]) -> Path:
+    """
+    Get where the compiled cache of a properties CSV lives: beside it, with a `.bin` suffix.
+
+    Every CSV gets its own cache, so loading a custom catalog never overwrites the bundled one.
+
+    Parameters:
+        csv_file (Union[str, Path]):
+            The properties CSV.
+
+    Returns:
+        Path:
+            The compiled deed file.
+    """
+    return _resolve(csv_file).with_suffix('.bin')
+
+
+def _int(value: str) -> int:
+    return int(value) if value else 0
+
+
+def parse_deed_csv(csv_file: Optional[Union[str, Path]] = None) -> tuple[DeedSpec, ...]:
+    """
+    Parse a properties CSV into deed specs, without using the compiled cache.
+
+    Parameters:
+        csv_file (Optional[Union[str, Path]]):
+            The CSV to parse. If not specified, the bundled `properties.csv` is used.
+
+    Returns:
+        tuple[DeedSpec, ...]:
+            A spec for every deed, in file order.
+    """
+    csv_file = _resolve(csv_file or DEFAULT_CSV_FILE)
+
+    if not csv_file.is_file():
+        raise FileNotFoundError(f"File not found: {csv_file}")
+
+    specs = []
+
+    with open(csv_file, newline='') as file:
+        for index, row in enumerate(csv.DictReader(file)):
+            if row['type'] not in DEED_TYPES:
+                raise ValueError(f"Invalid deed type for {row['name']}: {row['type']}.")
+
+            specs.append(DeedSpec(
+                index=index,
+                name=row['name'],
+                deed_type=row['type'],
+                color=row['color'] or None,
+                space=int(row['spaces']),
+                cost=_int(row['cost']),
+                mortgage=_int(row['mortgage']),
+                house_price=_int(row['house_price']),
+                rents=tuple(_int(row[column]) for column in RENT_COLUMNS),
+            ))
+
+    return tuple(specs)
+
+
+def pack_deeds(
+        specs: tuple[DeedSpec, ...],
+        csv_mtime_ns: int = 0,
+        csv_size: int = 0,
+        csv_digest: bytes = bytes(32)
+) -> bytes:
+    """
+    Encode deed specs in the compiled deed file format.
+
+    Parameters:
+        specs (tuple[DeedSpec, ...]):
+            The specs to encode.
+
+        csv_mtime_ns (int):
+            The modification time of the CSV the specs came from.
+
+        csv_size (int):
+            The size of the CSV the specs came from.
+
+        csv_digest (bytes):
+            The SHA-256 digest of the CSV the specs came from.
+
+    Returns:
+        bytes:
+            The encoded specs, readable with `specs_from_buffer`.
+    """
+    strings = bytearray()
+    records = bytearray()
+
+    def intern(text: Optional[str]) -> tuple[int, int]:
+        if text is None:
+            return NO_COLOR, 0
+
+        encoded = text.encode('utf-8')
+        offset  = len(strings)
+        strings.extend(encoded)
+
+        return offset, len(encoded)
+
+    for spec in specs:
+        name_offset, name_length   = intern(spec.name)
+        color_offset, color_length = intern(spec.color)
+
+        records.extend(RECORD.pack(
+            DEED_TYPES.index(spec.deed_type), spec.space, spec.cost, spec.mortgage, spec.house_price, *spec.rents,
+            name_offset, name_length, color_offset, color_length
+        ))
+
+    strings_offset = HEADER.size + len(records)
+    header = HEADER.pack(MAGIC, VERSION, len(specs), csv_mtime_ns, csv_size, csv_digest, strings_offset)
+
+    return header + bytes(records) + bytes(strings)
+
+
+def compile_deed_file(
+        specs: tuple[DeedSpec, ...],
+        deed_file: Optional[Union[str, Path]] = None,
+        csv_mtime_ns: int = 0,
+        csv_size: int = 0,
+        csv_digest: bytes = bytes(32)
+) -> Path:
+    """
+    Write deed specs to a compiled deed file.
+
+    The file is written to a temporary name and swapped into place, so readers never see a partial file.
+
+    Parameters:
+        specs (tuple[DeedSpec, ...]):
+            The specs to write.
+
+        deed_file (Optional[Union[str, Path]]):
+            Where to write them. If not specified, the default deed file is used.
+
+        csv_mtime_ns (int):
+            The modification time of the CSV the specs came from.
+
+        csv_size (int):
+            The size of the CSV the specs came from.
+
+        csv_digest (bytes):
+            The SHA-256 digest of the CSV the specs came from.
+
+    Returns:
+        Path:
+            The path of the compiled file.
     """
-    Load property deeds from a pickle file.
+    deed_file = _resolve(deed_file or DEFAULT_DEED_FILE)
+    temporary = deed_file.with_name(f'{deed_file.name}.{os.getpid()}.tmp')
+
+    with open(temporary, 'wb') as file:
+        file.write(pack_deeds(specs, csv_mtime_ns, csv_size, csv_digest))
+
+    os.replace(temporary, deed_file)
+
+    return deed_file
+
+
+def _read_header(buffer) -> tuple:
+    if len(buffer) < HEADER.size:
+        raise ValueError('Deed file is truncated.')
+
+    header = HEADER.unpack_from(buffer, 0)
+
+    if header[0] != MAGIC or header[1] != VERSION:
+        raise ValueError('Not a compiled deed file, or one from an incompatible version.')
+
+    return header
+
+
+def load_deed_file(deed_file: Optional[Union[str, Path]] = None) -> tuple[DeedSpec, ...]:
+    """
+    Read deed specs from a compiled deed file.
+
+    The file is memory-mapped, and the records are decoded straight out of the mapping.
 
     Parameters:
-        deed_file (Optional[Union[str, Path]]): The path to the pickle file containing the property deeds.
+        deed_file (Optional[Union[str, Path]]):
+            The compiled file to read. If not specified, the default deed file is used.
 
     Returns:
-        List: A list of property deeds.
+        tuple[DeedSpec, ...]:
+            A spec for every deed, in catalog order.
     """
-    deed_data = None
-    deed_list = []
+    deed_file = _resolve(deed_file or DEFAULT_DEED_FILE)
+
+    with open(deed_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return specs_from_buffer(mapped)
+
+
+def specs_from_buffer(buffer) -> tuple[DeedSpec, ...]:
+    """
+    Decode deed specs from the bytes of a compiled deed file.
+
+    Parameters:
+        buffer:
+            Any object supporting the buffer protocol (bytes, an `mmap`, a `memoryview`, shared memory).
+
+    Returns:
+        tuple[DeedSpec, ...]:
+            A spec for every deed, in catalog order.
+    """
+    _, _, count, _, _, _, strings_offset = _read_header(buffer)
+
+    view  = memoryview(buffer)
+    specs = []
+
+    try:
+        for index, fields in enumerate(RECORD.iter_unpack(view[HEADER.size:HEADER.size + count * RECORD.size])):
+            deed_type, space, cost, mortgage, house_price = fields[:5]
+            rents = fields[5:11]
+            name_offset, name_length, color_offset, color_length = fields[11:]
+
+            name_start = strings_offset + name_offset
+            name = str(view[name_start:name_start + name_length], 'utf-8')
+
+            if color_offset == NO_COLOR:
+                color = None
+            else:
+                color_start = strings_offset + color_offset
+                color = str(view[color_start:color_start + color_length], 'utf-8')
+
+            specs.append(DeedSpec(index, name, DEED_TYPES[deed_type], color, space, cost, mortgage, house_price,
+                                  tuple(rents)))
+    finally:
+        view.release()
+
+    return tuple(specs)
+
+
+def _cache_is_fresh(deed_file: Path, stat: os.stat_result, csv_file: Path) -> bool:
+    try:
+        with open(deed_file, 'rb') as file:
+            _, _, _, mtime_ns, size, digest, _ = _read_header(file.read(HEADER.size))
+    except (OSError, ValueError, struct.error):
+        return False
+
+    if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+        return True
+
+    # The CSV was touched; it only needs recompiling if its content actually changed.
+    return size == stat.st_size and digest == hashlib.sha256(csv_file.read_bytes()).digest()
+
+
+@lru_cache(maxsize=8)
+def _load_deeds(csv_file: Path, deed_file: Path, mtime_ns: int, size: int) -> tuple[DeedSpec, ...]:
+    stat = csv_file.stat()
+
+    if _cache_is_fresh(deed_file, stat, csv_file):
+        return load_deed_file(deed_file)
+
+    specs = parse_deed_csv(csv_file)
+
+    try:
+        compile_deed_file(specs, deed_file, stat.st_mtime_ns, stat.st_size,
+                          hashlib.sha256(csv_file.read_bytes()).digest())
+    except OSError:
+        # A read-only install just goes without the cache.
+        pass
+
+    return specs
+
+
+def load_deeds(
+        csv_file: Optional[Union[str, Path]] = None,
+        deed_file: Optional[Union[str, Path]] = None
+) -> tuple[DeedSpec, ...]:
+    """
+    Load the deed catalog.
+
+    The CSV is only parsed when the compiled deed file is missing or out of date (by modification time and size,
+    falling back to a content hash); otherwise the compiled file is memory-mapped. Results are also memoised for the
+    life of the process.
+
+    Parameters:
+        csv_file (Optional[Union[str, Path]]):
+            The properties CSV. If not specified, the bundled `properties.csv` is used.
+
+        deed_file (Optional[Union[str, Path]]):
+            The compiled deed file to use as a cache. If not specified, the file beside the CSV is used; see
+            `deed_file_for`.
+
+    Returns:
+        tuple[DeedSpec, ...]:
+            A spec for every deed, in catalog order.
+    """
+    csv_file  = _resolve(csv_file or DEFAULT_CSV_FILE)
+    deed_file = _resolve(deed_file) if deed_file else deed_file_for(csv_file)
+
+    if not csv_file.is_file():
+        raise FileNotFoundError(f"File not found: {csv_file}")
+
+    stat = csv_file.stat()
 
-        
-    if not deed_data:
-        return deed_list
-    
-    for deed in deed_data:
-        name = deed['name']
+    return _load_deeds(csv_file, deed_file, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,213 @@
+from collections import defaultdict
+from typing import Hashable, Optional
+
+
+def group_key(deed: 'PropertyDeed') -> Hashable:
+    """
+    Get the key of the group a deed counts towards.
+
+    Streets are grouped by color; railroads and utilities form one group each.
+
+    Parameters:
+        deed (PropertyDeed):
+            The deed.
+
+    Returns:
+        Hashable:
+            The color name of a street, or the deed type of a railroad or utility.
+    """
+    if deed.deed_type != 'street':
+        return deed.deed_type
+
+    color = deed.color
+
+    return getattr(color, 'color_name', color)
+
+
+class OwnershipIndex:
+    """
+    Who owns what, kept up to date as deeds change hands.
+
+    Deeds registered with the index report every change of owner and of mortgage status, so every query here is a
+    dictionary lookup; nothing ever scans the deeds on the board.
+
+    Example:
+        >>> index = OwnershipIndex()
+        >>> deeds = [PropertyDeed.from_spec(spec, ownership_index=index) for spec in load_deeds()]
+        >>> deeds[0].transfer(player)
+        >>> index.count(player, 'purple')
+        1
+    """
+    def __init__(self):
+        self.__group_sizes = defaultdict(int)
+        self.__holdings    = defaultdict(set)
+        self.__counts      = defaultdict(int)
+        self.__mortgaged   = defaultdict(int)
+        self.__versions    = defaultdict(int)
+        self.__deeds       = set()
+
+    def __contains__(self, deed: 'PropertyDeed') -> bool:
+        return deed in self.__deeds
+
+    def __len__(self) -> int:
+        return len(self.__deeds)
+
+    def __add(self, deed: 'PropertyDeed', owner: Optional['Player']):
+        if owner is None:
+            return
+
+        key = (owner, group_key(deed))
+        self.__holdings[owner].add(deed)
+        self.__counts[key] += 1
+
+        if deed.mortgaged:
+            self.__mortgaged[key] += 1
+
+    def __remove(self, deed: 'PropertyDeed', owner: Optional['Player']):
+        if owner is None:
+            return
+
+        key = (owner, group_key(deed))
+        holdings = self.__holdings[owner]
+        holdings.discard(deed)
+
+        if not holdings:
+            del self.__holdings[owner]
+
+        self.__counts[key] -= 1
+        if not self.__counts[key]:
+            del self.__counts[key]
+
+        if deed.mortgaged:
+            self.__mortgaged[key] -= 1
+            if not self.__mortgaged[key]:
+                del self.__mortgaged[key]
+
+    def register(self, deed: 'PropertyDeed'):
+        """
+        Start tracking a deed.
+
+        Parameters:
+            deed (PropertyDeed):
+                The deed.
+        """
+        if deed in self.__deeds:
+            return
+
+        self.__deeds.add(deed)
+        self.__group_sizes[group_key(deed)] += 1
+        self.__add(deed, deed.owner)
+
+    def transferred(self, deed: 'PropertyDeed', old_owner: Optional['Player'], new_owner: Optional['Player']):
+        """
+        Record that a deed changed hands. Called by the deed itself.
+
+        Parameters:
+            deed (PropertyDeed):
+                The deed.
+
+            old_owner (Optional[Player]):
+                Who owned it before, or None.
+
+            new_owner (Optional[Player]):
+                Who owns it now, or None.
+        """
+        if old_owner is new_owner:
+            return
+
+        self.__remove(deed, old_owner)
+        self.__add(deed, new_owner)
+        self.__versions[group_key(deed)] += 1
+
+    def mortgage_changed(self, deed: 'PropertyDeed', mortgaged: bool):
+        """
+        Record that a deed was mortgaged or had its mortgage lifted. Called by the deed itself.
+
+        Parameters:
+            deed (PropertyDeed):
+                The deed.
+
+            mortgaged (bool):
+                Whether the deed is now mortgaged.
+        """
+        if deed.owner is None:
+            return
+
+        self.__versions[group_key(deed)] += 1
+
+        key = (deed.owner, group_key(deed))
+        self.__mortgaged[key] += 1 if mortgaged else -1
+
+        if not self.__mortgaged[key]:
+            del self.__mortgaged[key]
+
+    def count(self, owner: 'Player', group: Hashable) -> int:
+        """Get the number of deeds in a group an owner holds."""
+        return self.__counts.get((owner, group), 0)
+
+    def group_size(self, group: Hashable) -> int:
+        """Get the number of registered deeds in a group."""
+        return self.__group_sizes.get(group, 0)
+
+    def has_monopoly(self, owner: Optional['Player'], group: Hashable) -> bool:
+        """Check whether an owner holds every deed in a group."""
+        if owner is None:
+            return False
+
+        size = self.__group_sizes.get(group, 0)
+
+        return bool(size) and self.__counts.get((owner, group), 0) == size
+
+    def can_develop(self, owner: 'Player', group: Hashable) -> bool:
+        """Check whether an owner holds every deed in a group, with none of them mortgaged."""
+        return self.has_monopoly(owner, group) and not self.__mortgaged.get((owner, group), 0)
+
+    def holdings(self, owner: 'Player') -> frozenset:
+        """
+        Get every deed an owner holds.
+
+        Returns:
+            frozenset[PropertyDeed]:
+                The deeds.
+        """
+        return frozenset(self.__holdings.get(owner, ()))
+
+    def mortgaged_count(self, owner: 'Player', group: Hashable) -> int:
+        """Get the number of mortgaged deeds in a group an owner holds."""
+        return self.__mortgaged.get((owner, group), 0)
+
+    def railroads_owned(self, owner: 'Player') -> int:
+        return self.__counts.get((owner, 'railroad'), 0)
+
+    def utilities_owned(self, owner: 'Player') -> int:
+        return self.__counts.get((owner, 'utility'), 0)
+
+    def version(self, group: Hashable) -> int:
+        """
+        Get a counter that changes whenever ownership or mortgages change within a group.
+
+        Anything derived from the ownership of a group (such as a rent quote) can be cached against it.
+        """
+        return self.__versions.get(group, 0)
+
+    def release(self, owner: 'Player', new_owner: Optional['Player'] = None) -> list['PropertyDeed']:
+        """
+        Hand every deed an owner holds to someone else (or back to the bank), as on bankruptcy.
+
+        Parameters:
+            owner (Player):
+                The owner giving the deeds up.
+
+            new_owner (Optional[Player]):
+                Who gets them. If not specified, they go back to the bank.
+
+        Returns:
+            list[PropertyDeed]:
+                The deeds that changed hands.
+        """
+        deeds = list(self.__holdings.get(owner, ()))
+
+        for deed in deeds:
+            deed.transfer(new_owner, price_paid=0)
+
+        return deeds
@@ -0,0 +1,365 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+UNOWNED = -1
+"""The owner id used for deeds nobody owns."""
+
+HOTEL = 5
+"""The development level of a street with a hotel; levels 0-4 are the number of houses."""
+
+RAILROAD_RENTS = (0, 25, 50, 100, 200)
+"""Railroad rent, indexed by the number of railroads the owner holds."""
+
+UTILITY_MULTIPLIERS = (0, 4, 10)
+"""The dice-total multiplier for utility rent, indexed by the number of utilities the owner holds."""
+
+AVERAGE_DICE_TOTAL = 7
+"""The dice total used to quote utility rent when no roll is given."""
+
+
+class RentTable:
+    """
+    Precomputed rent for every deed on a board.
+
+    Holds the rent schedule of every street as a `(deeds, 6)` matrix (development levels 0-4 houses and a hotel),
+    plus the railroad and utility tables, so rent for a whole board is a handful of array lookups against the current
+    ownership, development and mortgage state. Works on one board (arrays of shape `(deeds,)`) or many boards at once
+    (arrays of shape `(boards, deeds)`).
+
+    Parameters:
+        specs (Sequence[DeedSpec]):
+            The deeds on the board, in catalog order.
+
+    Example:
+        >>> table = RentTable(load_deeds())
+        >>> rents = table.evaluate(owners, development, mortgaged, dice_total=8)
+    """
+    def __init__(self, specs: Sequence[DeedSpec]):
+        specs = tuple(specs)
+        colors = sorted({spec.color for spec in specs if spec.color})
+
+        self.__specs        = specs
+        self.__colors       = tuple(colors)
+        self.__street_rents = np.array([spec.rents for spec in specs], dtype=np.int32).reshape(len(specs), HOTEL + 1)
+        self.__is_street    = np.array([spec.deed_type == 'street' for spec in specs])
+        self.__is_railroad  = np.array([spec.deed_type == 'railroad' for spec in specs])
+        self.__is_utility   = np.array([spec.deed_type == 'utility' for spec in specs])
+        self.__group        = np.array([colors.index(spec.color) if spec.color else -1 for spec in specs],
+                                       dtype=np.int32)
+        self.__group_sizes  = np.bincount(self.__group[self.__group >= 0], minlength=len(colors)).astype(np.int32)
+        self.__rent_group   = np.where(
+            self.__is_railroad, len(colors), np.where(self.__is_utility, len(colors) + 1, self.__group)
+        ).astype(np.int32)
+
+        self.__railroad_rents      = np.array(RAILROAD_RENTS, dtype=np.int32)
+        self.__utility_multipliers = np.array(UTILITY_MULTIPLIERS, dtype=np.int32)
+        self.__holding_rents       = self.__build_holding_rents()
+
+        for array in (self.__street_rents, self.__is_street, self.__is_railroad, self.__is_utility, self.__group,
+                      self.__group_sizes, self.__rent_group, self.__holding_rents):
+            array.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.__specs)
+
+    def __build_holding_rents(self) -> 'np.ndarray':
+        # Rent by (deed, number held in its rent group, development level); utilities hold their dice multiplier.
+        held_counts = max(len(RAILROAD_RENTS), len(UTILITY_MULTIPLIERS), int(self.__group_sizes.max(initial=0)) + 1)
+        held        = np.arange(held_counts)[None, :, None]
+        level       = np.arange(HOTEL + 1)[None, None, :]
+        sizes       = self.__group_sizes[np.maximum(self.__group, 0)][:, None, None]
+
+        street   = self.__street_rents[:, None, :]
+        street   = np.where((held == sizes) & (level == 0), street * 2, street)
+        railroad = self.__railroad_rents[np.minimum(held, len(RAILROAD_RENTS) - 1)]
+        utility  = self.__utility_multipliers[np.minimum(held, len(UTILITY_MULTIPLIERS) - 1)]
+
+        rents = np.where(self.__is_street[:, None, None], street,
+                         np.where(self.__is_railroad[:, None, None], railroad, utility))
+
+        return np.broadcast_to(rents, (len(self.__specs), held_counts, HOTEL + 1)).astype(np.int32)
+
+    @property
+    def colors(self) -> tuple[str, ...]:
+        """The color groups on the board, indexed by group id."""
+        return self.__colors
+
+    @property
+    def group_sizes(self) -> 'np.ndarray':
+        """The number of streets in each color group."""
+        return self.__group_sizes
+
+    @property
+    def groups(self) -> 'np.ndarray':
+        """The color group id of every deed, or -1 for railroads and utilities."""
+        return self.__group
+
+    @property
+    def is_railroad(self) -> 'np.ndarray':
+        return self.__is_railroad
+
+    @property
+    def is_street(self) -> 'np.ndarray':
+        return self.__is_street
+
+    @property
+    def is_utility(self) -> 'np.ndarray':
+        return self.__is_utility
+
+    @property
+    def rent_group_count(self) -> int:
+        """The number of rent groups; see `rent_groups`."""
+        return len(self.__colors) + 2
+
+    @property
+    def rent_groups(self) -> 'np.ndarray':
+        """
+        The group whose holdings set each deed's rent: the color group id for streets, then one more id for the
+        railroads and one for the utilities.
+        """
+        return self.__rent_group
+
+    @property
+    def specs(self) -> tuple[DeedSpec, ...]:
+        return self.__specs
+
+    @property
+    def street_rents(self) -> 'np.ndarray':
+        """The `(deeds, 6)` rent schedule; all zero for railroads and utilities."""
+        return self.__street_rents
+
+    def evaluate(
+            self,
+            owners:      'np.ndarray',
+            development: Optional['np.ndarray'] = None,
+            mortgaged:   Optional['np.ndarray'] = None,
+            dice_total:  int = AVERAGE_DICE_TOTAL
+    ) -> 'np.ndarray':
+        """
+        Get the rent owed on every deed.
+
+        Unimproved streets in a color group the owner holds in full charge double rent. Unowned and mortgaged deeds
+        charge nothing.
+
+        Parameters:
+            owners (numpy.ndarray):
+                The owner id of each deed, `UNOWNED` if nobody owns it. Owner ids must be small non-negative
+                integers, such as seat numbers.
+
+            development (Optional[numpy.ndarray]):
+                The development level of each deed (0-4 houses, `HOTEL` for a hotel). Defaults to no development.
+
+            mortgaged (Optional[numpy.ndarray]):
+                Whether each deed is mortgaged. Defaults to none.
+
+            dice_total (int):
+                The dice total to charge utility rent against. May also be an array with one total per board.
+
+        Returns:
+            numpy.ndarray:
+                The rent on each deed, in the same shape as `owners`.
+        """
+        owners = np.asarray(owners)
+        single = owners.ndim == 1
+        owners = np.atleast_2d(owners)
+
+        boards, deeds = owners.shape
+        if deeds != len(self.__specs):
+            raise ValueError(f'Expected {len(self.__specs)} deeds, got {deeds}.')
+
+        development = np.zeros_like(owners) if development is None else np.atleast_2d(development)
+        owned       = owners != UNOWNED
+
+        if mortgaged is not None:
+            owned = owned & ~np.atleast_2d(mortgaged)
+
+        # Give every (board, owner) pair its own slot so ownership can be counted for all boards at once.
+        slots   = int(owners.max(initial=UNOWNED)) + 2
+        slot    = np.where(owners == UNOWNED, slots - 1, owners) + np.arange(boards)[:, None] * slots
+        n_slots = boards * slots
+
+        streets = self.__is_street[None, :] & (owners != UNOWNED)
+        groups  = len(self.__colors)
+        held    = np.bincount((slot * groups + self.__group)[streets], minlength=n_slots * groups)
+        monopoly = self.__is_street[None, :] & (
+            held[slot * groups + np.maximum(self.__group, 0)] == self.__group_sizes[np.maximum(self.__group, 0)]
+        )
+
+        street_rent = self.__street_rents[np.arange(deeds)[None, :], development]
+        street_rent = np.where(monopoly & (development == 0), street_rent * 2, street_rent)
+
+        railroads     = np.bincount(slot[self.__is_railroad[None, :] & (owners != UNOWNED)], minlength=n_slots)
+        railroad_rent = self.__railroad_rents[np.minimum(railroads[slot], len(RAILROAD_RENTS) - 1)]
+
+        utilities    = np.bincount(slot[self.__is_utility[None, :] & (owners != UNOWNED)], minlength=n_slots)
+        utility_rent = (self.__utility_multipliers[np.minimum(utilities[slot], len(UTILITY_MULTIPLIERS) - 1)]
+                        * np.reshape(dice_total, (-1, 1)))
+
+        rent = np.where(self.__is_street, street_rent, np.where(self.__is_railroad, railroad_rent, utility_rent))
+        rent = np.where(owned, rent, 0)
+
+        return rent[0] if single else rent
+
+    def evaluate_at(
+            self,
+            owners:      'np.ndarray',
+            deeds:       'np.ndarray',
+            development: Optional['np.ndarray'] = None,
+            mortgaged:   Optional['np.ndarray'] = None,
+            dice_total:  int = AVERAGE_DICE_TOTAL
+    ) -> 'np.ndarray':
+        """
+        Get the rent owed on one deed of each of many boards.
+
+        Gives the same rent as `evaluate`, but only works out the deed asked for on each board, which is much cheaper
+        when only the deed a player landed on matters.
+
+        Parameters:
+            owners (numpy.ndarray):
+                The owner id of each deed of each board, `(boards, deeds)`.
+
+            deeds (numpy.ndarray):
+                The deed to get the rent of, for each board.
+
+            development (Optional[numpy.ndarray]):
+                The development level of each deed of each board. Defaults to no development.
+
+            mortgaged (Optional[numpy.ndarray]):
+                Whether each deed of each board is mortgaged. Defaults to none.
+
+            dice_total (int):
+                The dice total to charge utility rent against. May also be an array with one total per board.
+
+        Returns:
+            numpy.ndarray:
+                The rent on each board's deed.
+        """
+        owners = np.atleast_2d(owners)
+        deeds  = np.asarray(deeds)
+        rows   = np.arange(len(owners))
+
+        if owners.shape[1] != len(self.__specs):
+            raise ValueError(f'Expected {len(self.__specs)} deeds, got {owners.shape[1]}.')
+
+        owner = owners[rows, deeds]
+        owned = owner != UNOWNED
+
+        if mortgaged is not None:
+            owned &= ~np.atleast_2d(mortgaged)[rows, deeds]
+
+        level = np.zeros(len(deeds), dtype=np.intp) if development is None else np.atleast_2d(development)[rows, deeds]
+        same  = (owners == owner[:, None]) & (self.__rent_group[None, :] == self.__rent_group[deeds][:, None])
+        rent  = self.rent_for_holdings(deeds, np.count_nonzero(same, axis=1), level, dice_total)
+
+        return np.where(owned, rent, 0)
+
+    def rent_for_holdings(
+            self,
+            deeds:       'np.ndarray',
+            held:        'np.ndarray',
+            development: Optional['np.ndarray'] = None,
+            dice_total:  int = AVERAGE_DICE_TOTAL
+    ) -> 'np.ndarray':
+        """
+        Get the rent on owned, unmortgaged deeds, from how many deeds of each one's rent group its owner holds.
+
+        Callers that keep those counts up to date as deeds change hands (see `rent_groups`) get rent without looking
+        at the rest of the board at all.
+
+        Parameters:
+            deeds (numpy.ndarray):
+                The deeds to get the rent of.
+
+            held (numpy.ndarray):
+                For each deed, the number of deeds in its rent group that its owner holds, itself included.
+
+            development (Optional[numpy.ndarray]):
+                The development level of each deed. Defaults to no development.
+
+            dice_total (int):
+                The dice total to charge utility rent against. May also be an array with one total per deed.
+
+        Returns:
+            numpy.ndarray:
+                The rent on each deed.
+        """
+        deeds = np.asarray(deeds)
+        held  = np.minimum(held, self.__holding_rents.shape[1] - 1)
+        level = 0 if development is None else np.asarray(development)
+        rent  = self.__holding_rents[deeds, held, level]
+
+        return np.where(self.__is_utility[deeds], rent * dice_total, rent)
+
+
+def deed_rent(
+        spec: DeedSpec,
+        development: int = 0,
+        monopoly: bool = False,
+        railroads_owned: int = 1,
+        utilities_owned: int = 1,
+        dice_total: int = AVERAGE_DICE_TOTAL
+) -> int:
+    """
+    Get the rent owed on a single owned, unmortgaged deed.
+
+    Parameters:
+        spec (DeedSpec):
+            The deed.
+
+        development (int):
+            The development level (0-4 houses, `HOTEL` for a hotel). Streets only.
+
+        monopoly (bool):
+            Whether the owner holds the deed's whole color group. Streets only.
+
+        railroads_owned (int):
+            The number of railroads the owner holds. Railroads only.
+
+        utilities_owned (int):
+            The number of utilities the owner holds. Utilities only.
+
+        dice_total (int):
+            The dice total to charge against. Utilities only.
+
+    Returns:
+        int:
+            The rent.
+    """
+    if spec.deed_type == 'railroad':
+        return RAILROAD_RENTS[min(railroads_owned, len(RAILROAD_RENTS) - 1)]
+
+    if spec.deed_type == 'utility':
+        return UTILITY_MULTIPLIERS[min(utilities_owned, len(UTILITY_MULTIPLIERS) - 1)] * dice_total
+
+    rent = spec.rents[development]
+
+    return rent * 2 if monopoly and not development else rent
+
+
+@lru_cache(maxsize=8)
+def _rent_table(specs: tuple[DeedSpec, ...]) -> RentTable:
+    return RentTable(specs)
+
+
+def load_rent_table(csv_file: Optional[Union[str, Path]] = None) -> RentTable:
+    """
+    Get the rent table for a board, building it only once per process.
+
+    Parameters:
+        csv_file (Optional[Union[str, Path]]):
+            The properties CSV defining the board. If not specified, the bundled `properties.csv` is used.
+
+    Returns:
+        RentTable:
+            The shared rent table.
+    """
+    return _rent_table(load_deeds(csv_file))
@@ -0,0 +1,142 @@
+from typing import Optional
+
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+class RentHistory:
+    """
+    A record of the rent collected on a deed.
+
+    Only the most recent `maxlen` payments, and the totals of the most recent `turn_buckets` turns with any rent,
+    are kept, in fixed-size ring buffers. The count, total and largest payment are streaming aggregates that cover
+    every payment ever logged, so memory per deed stays the same however long the game runs.
+
+    Parameters:
+        maxlen (int):
+            The number of individual payments to keep.
+
+        turn_buckets (int):
+            The number of per-turn totals to keep.
+    """
+    DEFAULT_MAXLEN       = 64
+    DEFAULT_TURN_BUCKETS = 32
+
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN, turn_buckets: int = DEFAULT_TURN_BUCKETS):
+        if maxlen < 1 or turn_buckets < 1:
+            raise ValueError('Rent history sizes must be at least one.')
+
+        self.__amounts = None
+        self.__turns   = None
+        self.__maxlen  = maxlen
+        self.__next    = 0
+
+        self.__bucket_turns  = None
+        self.__bucket_totals = None
+        self.__buckets       = turn_buckets
+        self.__bucket_next   = 0
+        self.__bucket_size   = 0
+
+        self.__count   = 0
+        self.__total   = 0
+        self.__largest = 0
+
+    def __len__(self) -> int:
+        """The number of payments currently kept."""
+        return min(self.__count, self.__maxlen)
+
+    @property
+    def amounts(self) -> 'np.ndarray':
+        """The kept payments, oldest first."""
+        return self.__ordered(self.__amounts)
+
+    @property
+    def count(self) -> int:
+        """The number of payments ever logged."""
+        return self.__count
+
+    @property
+    def largest(self) -> int:
+        """The largest single payment ever logged."""
+        return self.__largest
+
+    @property
+    def mean(self) -> float:
+        if not self.__count:
+            return 0.0
+
+        return self.__total / self.__count
+
+    @property
+    def total(self) -> int:
+        """The total of every payment ever logged."""
+        return self.__total
+
+    @property
+    def turns(self) -> 'np.ndarray':
+        """The turn of each kept payment, oldest first."""
+        return self.__ordered(self.__turns)
+
+    def __ordered(self, column: Optional['np.ndarray']) -> 'np.ndarray':
+        if column is None:
+            return np.empty(0, dtype=np.int32)
+
+        if self.__count < self.__maxlen:
+            return column[:self.__count]
+
+        return np.concatenate((column[self.__next:], column[:self.__next]))
+
+    def log(self, amount: int, turn: int = 0):
+        """
+        Record a rent payment.
+
+        Parameters:
+            amount (int):
+                The amount paid.
+
+            turn (int):
+                The turn it was paid on.
+        """
+        if self.__amounts is None:
+            # Deeds that never collect rent never allocate anything.
+            self.__amounts       = np.zeros(self.__maxlen, dtype=np.int32)
+            self.__turns         = np.zeros(self.__maxlen, dtype=np.int32)
+            self.__bucket_turns  = np.zeros(self.__buckets, dtype=np.int32)
+            self.__bucket_totals = np.zeros(self.__buckets, dtype=np.int64)
+
+        self.__amounts[self.__next] = amount
+        self.__turns[self.__next]   = turn
+        self.__next = (self.__next + 1) % self.__maxlen
+
+        self.__count += 1
+        self.__total += amount
+        if amount > self.__largest:
+            self.__largest = amount
+
+        last = (self.__bucket_next - 1) % self.__buckets
+
+        if self.__bucket_size and self.__bucket_turns[last] == turn:
+            self.__bucket_totals[last] += amount
+        else:
+            self.__bucket_turns[self.__bucket_next]  = turn
+            self.__bucket_totals[self.__bucket_next] = amount
+            self.__bucket_next = (self.__bucket_next + 1) % self.__buckets
+            self.__bucket_size = min(self.__bucket_size + 1, self.__buckets)
+
+    def per_turn(self) -> dict[int, int]:
+        """
+        Get the rent collected in each of the most recent turns with any rent.
+
+        Returns:
+            dict[int, int]:
+                The total collected, keyed by turn, oldest first.
+        """
+        if not self.__bucket_size:
+            return {}
+
+        start = (self.__bucket_next - self.__bucket_size) % self.__buckets
+        order = (start + np.arange(self.__bucket_size)) % self.__buckets
+
+        return dict(zip(self.__bucket_turns[order].tolist(), self.__bucket_totals[order].tolist()))
@@ -0,0 +1,52 @@
+from typing import NamedTuple, Optional
+
+
+DEED_TYPES = ('street', 'railroad', 'utility')
+
+
+class DeedSpec(NamedTuple):
+    """
+    The printed facts of a deed, which never change during a game.
+
+    Properties:
+        index (int):
+            The position of the deed in the catalog.
+
+        name (str):
+            The name of the deed.
+
+        deed_type (str):
+            One of 'street', 'railroad' or 'utility'.
+
+        color (Optional[str]):
+            The color group of a street, or None for railroads and utilities.
+
+        space (int):
+            The board space the deed sits on.
+
+        cost (int):
+            The listed price.
+
+        mortgage (int):
+            The mortgage value.
+
+        house_price (int):
+            The price of one house (or of the hotel). Zero if the deed cannot be developed.
+
+        rents (tuple[int, ...]):
+            The rent with 0-4 houses and with a hotel. All zero for railroads and utilities, whose rent depends on
+            how many of them the owner holds.
+    """
+    index:       int
+    name:        str
+    deed_type:   str
+    color:       Optional[str]
+    space:       int
+    cost:        int
+    mortgage:    int
+    house_price: int
+    rents:       tuple[int, ...]
+
+    @property
+    def developable(self) -> bool:
+        return self.deed_type == 'street'
@@ -0,0 +1,123 @@
+from array import array
+from typing import Optional
+
+from monopyly.models.deeds.immunity import ImmunityTracker
+from monopyly.models.deeds.rent_history import RentHistory
+
+
+class DeedState:
+    """
+    The changing state of every deed in one game, stored column by column.
+
+    The printed facts of a deed (name, price, rent schedule) live in its shared `DeedSpec`; only what changes during a
+    game is kept here, as one row per deed: owner, houses, hotels, mortgage, and the rent and purchase counters. Rent
+    histories, immunity trackers and development limits are only created for the rows that use them. A
+    `PropertyDeed` is a view over a spec and a row.
+
+    Example:
+        >>> state = DeedState()
+        >>> deeds = [PropertyDeed.from_spec(spec, state=state) for spec in load_deeds()]
+    """
+    __slots__ = (
+        'owners',
+        'houses',
+        'hotels',
+        'mortgaged',
+        'development_allowed',
+        'mortgage_amount',
+        'last_purchase_price',
+        'rent_collected',
+        'rent_collected_by_owner',
+        'revenue',
+        '__development_types',
+        '__rent_histories',
+        '__immunity_trackers',
+    )
+
+    def __init__(self):
+        # The columns are plain attributes, since deeds read them on every rent quote.
+        self.owners                  = []
+        self.houses                  = array('b')
+        self.hotels                  = array('b')
+        self.mortgaged               = array('b')
+        self.development_allowed     = array('b')
+        self.mortgage_amount         = array('q')
+        self.last_purchase_price     = array('q')
+        self.rent_collected          = array('q')
+        self.rent_collected_by_owner = array('q')
+        self.revenue                 = array('q')
+
+        self.__development_types = {}
+        self.__rent_histories    = {}
+        self.__immunity_trackers = {}
+
+    def __len__(self) -> int:
+        return len(self.owners)
+
+    @property
+    def immunity_trackers(self) -> dict[int, ImmunityTracker]:
+        """The immunity tracker of every row that has one."""
+        return self.__immunity_trackers
+
+    def add(
+            self,
+            development_allowed:         bool = False,
+            type_of_development_allowed: Optional[str] = None,
+            rent_history:                Optional[RentHistory] = None,
+            immunity_tracker:            Optional[ImmunityTracker] = None
+    ) -> int:
+        """
+        Add a row for a deed, unowned and undeveloped.
+
+        Returns:
+            int:
+                The row.
+        """
+        row = len(self.owners)
+
+        self.owners.append(None)
+
+        for column in (self.houses, self.hotels, self.mortgaged, self.mortgage_amount, self.last_purchase_price,
+                       self.rent_collected, self.rent_collected_by_owner, self.revenue):
+            column.append(0)
+
+        self.development_allowed.append(bool(development_allowed))
+
+        if type_of_development_allowed is not None:
+            self.__development_types[row] = type_of_development_allowed
+
+        if rent_history is not None:
+            self.__rent_histories[row] = rent_history
+
+        if immunity_tracker is not None:
+            self.__immunity_trackers[row] = immunity_tracker
+
+        return row
+
+    def development_type(self, row: int) -> Optional[str]:
+        """Get the only kind of development ('house' or 'hotel') allowed on a row, or None for either."""
+        return self.__development_types.get(row)
+
+    def set_development_type(self, row: int, development_type: Optional[str]):
+        if development_type is None:
+            self.__development_types.pop(row, None)
+        else:
+            self.__development_types[row] = development_type
+
+    def rent_history(self, row: int, create: bool = True) -> Optional[RentHistory]:
+        """Get a row's rent history, creating it if needed (and asked to)."""
+        history = self.__rent_histories.get(row)
+
+        if history is None and create:
+            history = self.__rent_histories[row] = RentHistory()
+
+        return history
+
+    def immunity_tracker(self, row: int, create: bool = True) -> Optional[ImmunityTracker]:
+        """Get a row's immunity tracker, creating it if needed (and asked to)."""
+        tracker = self.__immunity_trackers.get(row)
+
+        if tracker is None and create:
+            tracker = self.__immunity_trackers[row] = ImmunityTracker()
+
+        return tracker
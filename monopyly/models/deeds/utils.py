@@ -1,8 +1,12 @@
 import pickle
-import pandas as pd
 from pathlib import Path
 from typing import Union, Optional, List
 
+from monopyly.utils.lazy import lazy_import
+
+
+pd = lazy_import('pandas')
+
 
 DEFAULT_CSV_FILEPATH = Path(__file__).parent / "properties.csv"
 DEFAULT_PKL_FILEPATH = DEFAULT_CSV_FILEPATH.parent / 'deeds.pkl'
@@ -37,7 +41,7 @@ def download_csv(local_file_path: Optional[Union[Path, str]]) -> Path:
 
 
 
-def load_csv_data(csv_file: Union[str, Path] = None) -> pd.DataFrame:
+def load_csv_data(csv_file: Union[str, Path] = None) -> 'pd.DataFrame':
     """
     Load a CSV file into a pandas `DataFrame` object.
 
@@ -73,7 +77,7 @@ def save_csv_to_pickle(csv_file: Optional[Union[str, Path]] = None, pickle_file:
 
 
 
-def save_data_to_pickle(data: Union[pd.DataFrame, List[dict]], pickle_file: Optional[Union[str, Path]] = None) -> Path:
+def save_data_to_pickle(data: Union['pd.DataFrame', List[dict]], pickle_file: Optional[Union[str, Path]] = None) -> Path:
     pickle_file = pickle_file or DEFAULT_PKL_FILEPATH
 
     if not isinstance(pickle_file, (Path, str)):
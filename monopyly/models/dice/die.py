@@ -1,30 +1,90 @@
-import random
-import numpy as np
+from typing import Optional
+
+from monopyly.models.dice.history import RollHistory
+from monopyly.utils.lazy import lazy_import
+from monopyly.utils.rng import RNGLike, resolve_generator
+
+
+np = lazy_import('numpy')
 
 
 class Die:
-    def __init__(self, sides=6):
-        self.__roll_history = []
-        self.__sides = None
+    """
+    A single die.
+
+    Rolls are drawn from a NumPy `Generator` in blocks of `BUFFER_SIZE` faces, so a call to `roll` is usually just an
+    index into an already-filled buffer. Single rolls are copied from the buffer into `roll_history` in bulk, when the
+    buffer runs out or the history is read. Use `roll_many` when you need a large number of rolls at once.
+
+    Parameters:
+        sides (int):
+            The number of sides on the die. Defaults to 6.
+
+        history_size (Optional[int]):
+            The number of rolls to keep in `roll_history`. If not specified, every roll is kept. The roll statistics
+            always cover every roll made, whatever the history size.
+
+        rng (RNGLike):
+            Where the die gets its randomness; a seed, an `RNGSource`, or a NumPy `Generator`. If not specified, the
+            die gets its own stream seeded from fresh OS entropy.
+    """
+    BUFFER_SIZE = 4096
+
+    def __init__(self, sides=6, history_size: Optional[int] = None, rng: RNGLike = None):
+        self.__history_size = history_size
+        self.__roll_history = None
+        self.__sides        = None
+        self.__rng          = None
+        self.__buffer       = None
+        self.__buffer_pos   = 0
+        self.__recorded     = 0
 
         self.sides = sides
+        self.rng   = rng
 
     @property
     def average_roll(self):
-        return sum(self.__roll_history) / len(self.__roll_history)
+        return self.roll_history.mean
+
+    @property
+    def face_dtype(self):
+        """
+        The smallest NumPy integer type that can hold every face of this die.
+
+        Returns:
+            numpy.dtype:
+                The dtype used for arrays of faces returned by `roll_many`.
+        """
+        return np.dtype(np.int8) if self.sides <= np.iinfo(np.int8).max else np.dtype(np.int32)
 
     @property
     def most_common_roll(self):
-        return max(set(self.__roll_history), key=self.__roll_history.count)
+        return self.roll_history.mode
 
     @property
     def roll_count(self):
-        return len(self.__roll_history)
+        return self.roll_history.count
 
     @property
-    def roll_history(self):
+    def roll_history(self) -> RollHistory:
+        self.__record()
+
         return self.__roll_history
 
+    @property
+    def rng(self) -> 'np.random.Generator':
+        return self.__rng
+
+    @rng.setter
+    def rng(self, new: RNGLike):
+        self.__rng = resolve_generator(new)
+
+        # Anything still buffered came from the old stream.
+        self.__record()
+        self.__buffer     = None
+        self.__buffer_pos = 0
+        self.__recorded   = 0
+
     @property
     def sides(self):
         return self.__sides
@@ -40,14 +100,102 @@ class Die:
         if value < 2:
             raise ValueError('A die must have at least two sides!')
 
+        self.__record()
         self.__sides = value
 
+        if self.__roll_history is None:
+            self.__roll_history = RollHistory(value, self.__history_size)
+        else:
+            self.__roll_history.resize(value)
+
+        # Anything still buffered was drawn for the old number of sides.
+        self.__buffer     = None
+        self.__buffer_pos = 0
+        self.__recorded   = 0
+
+    def __record(self):
+        """Copy the single rolls made since the last call into the roll history."""
+        if self.__buffer_pos > self.__recorded:
+            self.__roll_history.extend(self.__buffer[self.__recorded:self.__buffer_pos])
+            self.__recorded = self.__buffer_pos
+
+    def __refill(self):
+        self.__record()
+        self.__buffer     = self.__rng.integers(1, self.sides + 1, size=self.BUFFER_SIZE, dtype=self.face_dtype)
+        self.__buffer_pos = 0
+        self.__recorded   = 0
+
+    def _draw(self, n: int) -> 'np.ndarray':
+        """
+        Draw `n` faces without recording them.
+
+        Faces left over in the buffer are used first, so interleaving `roll` and `roll_many` consumes a single stream.
+
+        Parameters:
+            n (int):
+                The number of faces to draw.
+
+        Returns:
+            numpy.ndarray:
+                A one-dimensional array of `n` faces.
+        """
+        self.__record()
+
+        buffered = 0 if self.__buffer is None else len(self.__buffer) - self.__buffer_pos
+
+        if buffered >= n:
+            faces = self.__buffer[self.__buffer_pos:self.__buffer_pos + n].copy()
+            self.__buffer_pos += n
+            self.__recorded    = self.__buffer_pos
+            return faces
+
+        faces = np.empty(n, dtype=self.face_dtype)
+
+        if buffered:
+            faces[:buffered] = self.__buffer[self.__buffer_pos:]
+            self.__buffer_pos += buffered
+            self.__recorded    = self.__buffer_pos
+
+        faces[buffered:] = self.__rng.integers(1, self.sides + 1, size=n - buffered, dtype=self.face_dtype)
+
+        return faces
+
     def roll(self):
-        #roll = random.randint(1, self.sides)
-        roll = np.random.randint(1, 7)
-        self.__roll_history.append(roll)
+        if self.__buffer is None or self.__buffer_pos >= len(self.__buffer):
+            self.__refill()
+
+        roll = int(self.__buffer[self.__buffer_pos])
+        self.__buffer_pos += 1
 
         return roll
 
+    def roll_many(self, n: int) -> 'np.ndarray':
+        """
+        Roll the die `n` times in one go and record the results.
+
+        Parameters:
+            n (int):
+                The number of rolls to make.
+
+        Returns:
+            numpy.ndarray:
+                A one-dimensional array of `n` faces, in the order they were rolled.
+
+        Example:
+            >>> die = Die()
+            >>> die.roll_many(5)
+            array([3, 6, 1, 1, 4], dtype=int8)
+        """
+        if not isinstance(n, (int, np.integer)):
+            raise TypeError('The number of rolls must be an integer!')
+
+        if n < 0:
+            raise ValueError('The number of rolls cannot be negative!')
+
+        faces = self._draw(int(n))
+        self.__roll_history.extend(faces)
+
+        return faces
+
     def number_of_rolls_with_value(self, value):
-        return self.__roll_history.count(value)
+        return self.roll_history.count_of(value)
@@ -0,0 +1,337 @@
+from typing import Optional
+
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+class _RollStore:
+    """
+    Compact storage for recorded rolls.
+
+    Rolls are kept as rows of a small-integer array. Without a `maxlen` the array grows geometrically, so appends are
+    amortised O(1). With a `maxlen` the array is a fixed ring buffer that only keeps the most recent `maxlen` rows.
+
+    Single rolls are queued in a plain list and copied into the array in bulk, when the queue fills or the rows are
+    read, since writing one NumPy row costs more than the roll itself.
+    """
+    INITIAL_CAPACITY = 64
+    PENDING_SIZE = 256
+
+    def __init__(self, width: int, dtype, maxlen: Optional[int] = None):
+        if maxlen is not None:
+            if not isinstance(maxlen, int):
+                raise TypeError('The history length must be an integer!')
+
+            if maxlen < 1:
+                raise ValueError('The history length must be at least one!')
+
+        self.__maxlen  = maxlen
+        self.__rows    = np.empty((maxlen or self.INITIAL_CAPACITY, width), dtype=dtype)
+        self.__size    = 0
+        self.__start   = 0
+        self._pending = []
+
+    def __len__(self) -> int:
+        size = self.__size + len(self._pending)
+
+        return size if self.__maxlen is None else min(size, self.__maxlen)
+
+    @property
+    def maxlen(self) -> Optional[int]:
+        return self.__maxlen
+
+    @property
+    def rows(self) -> 'np.ndarray':
+        """
+        The retained rows, oldest first.
+
+        Returns:
+            numpy.ndarray:
+                A view of the backing array when the rows are contiguous, otherwise an ordered copy.
+        """
+        if self._pending:
+            self._drain()
+
+        end = self.__start + self.__size
+
+        if end <= len(self.__rows):
+            return self.__rows[self.__start:end]
+
+        return np.concatenate((self.__rows[self.__start:], self.__rows[:end - len(self.__rows)]))
+
+    def _astype(self, dtype):
+        if self._pending:
+            self._drain()
+
+        self.__rows = self.__rows.astype(dtype)
+
+    def _row(self, index: int) -> 'np.ndarray':
+        if self._pending:
+            self._drain()
+
+        if index < 0:
+            index += self.__size
+
+        if not 0 <= index < self.__size:
+            raise IndexError('Roll history index out of range.')
+
+        return self.__rows[(self.__start + index) % len(self.__rows)]
+
+    def _drain(self):
+        pending = self._pending
+        self._pending = []
+        self.__write(np.array(pending, dtype=self.__rows.dtype).reshape(len(pending), -1))
+
+    def _append_rows(self, rows: 'np.ndarray'):
+        if self._pending:
+            self._drain()
+
+        self.__write(rows)
+
+    def __write(self, rows: 'np.ndarray'):
+        n = len(rows)
+
+        if self.__maxlen is None:
+            needed = self.__size + n
+
+            if needed > len(self.__rows):
+                capacity = len(self.__rows)
+                while capacity < needed:
+                    capacity *= 2
+
+                grown = np.empty((capacity, self.__rows.shape[1]), dtype=self.__rows.dtype)
+                grown[:self.__size] = self.__rows[:self.__size]
+                self.__rows = grown
+
+            self.__rows[self.__size:needed] = rows
+            self.__size = needed
+            return
+
+        capacity = self.__maxlen
+
+        if n >= capacity:
+            self.__rows[:] = rows[-capacity:]
+            self.__start = 0
+            self.__size  = capacity
+            return
+
+        end   = (self.__start + self.__size) % capacity
+        first = min(n, capacity - end)
+
+        self.__rows[end:end + first] = rows[:first]
+        self.__rows[:n - first]      = rows[first:]
+
+        overflow = max(0, self.__size + n - capacity)
+
+        self.__start = (self.__start + overflow) % capacity
+        self.__size  = min(capacity, self.__size + n)
+
+    def _append_row(self, row):
+        pending = self._pending
+        pending.append(row)
+
+        if len(pending) >= self.PENDING_SIZE:
+            self._drain()
+
+
+class RollHistory(_RollStore):
+    """
+    The roll history of a single die.
+
+    The statistics (`count`, `total`, `mean`, `mode` and `count_of`) are read off a running count of each face, so
+    they cover every roll ever recorded, even when a bounded `maxlen` means the oldest rolls are no longer retained.
+
+    Parameters:
+        sides (int):
+            The number of sides on the die.
+
+        maxlen (Optional[int]):
+            The number of rolls to retain. If not specified, every roll is retained.
+    """
+    def __init__(self, sides: int, maxlen: Optional[int] = None):
+        dtype = np.int8 if sides <= np.iinfo(np.int8).max else np.int32
+        super().__init__(1, dtype, maxlen)
+
+        # A plain list, since `append` runs on every roll.
+        self.__counts = [0] * (sides + 1)
+
+    def __getitem__(self, index: int) -> int:
+        return int(self._row(index)[0])
+
+    def __iter__(self):
+        return iter(self.values.tolist())
+
+    @property
+    def count(self) -> int:
+        """The number of rolls ever recorded."""
+        return sum(self.__counts)
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+
+        if not count:
+            raise ZeroDivisionError('No rolls have been recorded.')
+
+        return self.total / count
+
+    @property
+    def mode(self) -> Optional[int]:
+        """The most common face, ties going to the lowest face."""
+        counts = self.__counts
+        most   = max(counts)
+
+        return counts.index(most) if most else None
+
+    @property
+    def total(self) -> int:
+        return sum(face * count for face, count in enumerate(self.__counts))
+
+    @property
+    def values(self) -> 'np.ndarray':
+        """The retained faces, oldest first."""
+        return self.rows[:, 0]
+
+    def append(self, face: int):
+        # `_append_row`, inlined: this runs on every roll.
+        pending = self._pending
+        pending.append(face)
+
+        if len(pending) >= self.PENDING_SIZE:
+            self._drain()
+
+        self.__counts[face] += 1
+
+    def count_of(self, face: int) -> int:
+        if not 0 <= face < len(self.__counts):
+            return 0
+
+        return self.__counts[face]
+
+    def resize(self, sides: int):
+        """
+        Make room for the faces of a die with `sides` sides.
+
+        Parameters:
+            sides (int):
+                The new number of sides on the die.
+        """
+        if sides + 1 > len(self.__counts):
+            self.__counts += [0] * (sides + 1 - len(self.__counts))
+
+        if sides > np.iinfo(self.rows.dtype).max:
+            self._astype(np.int32)
+
+    def extend(self, faces: 'np.ndarray'):
+        if not len(faces):
+            return
+
+        self._append_rows(faces.reshape(-1, 1))
+
+        counts = np.bincount(faces, minlength=len(self.__counts))
+        counts[:len(self.__counts)] += self.__counts
+
+        self.__counts = counts.tolist()
+
+
+class PairRollHistory(_RollStore):
+    """
+    The roll history of a pair of dice.
+
+    Each roll is stored as its two faces; totals and doubles are derived on read. Running counts of each total, and of
+    doubles, cover every roll ever recorded.
+
+    Parameters:
+        sides (int):
+            The number of sides on each die.
+
+        maxlen (Optional[int]):
+            The number of rolls to retain. If not specified, every roll is retained.
+    """
+    def __init__(self, sides: int, maxlen: Optional[int] = None):
+        dtype = np.int8 if sides <= np.iinfo(np.int8).max else np.int32
+        super().__init__(2, dtype, maxlen)
+
+        # Plain ints, since `append` runs on every roll.
+        self.__total_counts = [0] * (sides * 2 + 1)
+        self.__doubles      = 0
+
+    def __getitem__(self, index: int) -> tuple[int, tuple[int, int], bool]:
+        res_1, res_2 = self._row(index).tolist()
+
+        return res_1 + res_2, (res_1, res_2), res_1 == res_2
+
+    def __iter__(self):
+        for res_1, res_2 in self.rows.tolist():
+            yield res_1 + res_2, (res_1, res_2), res_1 == res_2
+
+    @property
+    def count(self) -> int:
+        """The number of rolls ever recorded."""
+        return sum(self.__total_counts)
+
+    @property
+    def doubles(self) -> int:
+        """The number of doubles ever rolled."""
+        return self.__doubles
+
+    @property
+    def doubles_rate(self) -> float:
+        count = self.count
+
+        if not count:
+            raise ZeroDivisionError('No rolls have been recorded.')
+
+        return self.__doubles / count
+
+    @property
+    def faces(self) -> 'np.ndarray':
+        """The retained faces as an `(n, 2)` array, oldest first."""
+        return self.rows
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+
+        if not count:
+            raise ZeroDivisionError('No rolls have been recorded.')
+
+        return sum(total * n for total, n in enumerate(self.__total_counts)) / count
+
+    @property
+    def totals(self) -> 'np.ndarray':
+        """The retained totals, oldest first."""
+        return self.rows.sum(axis=1, dtype=np.int32)
+
+    def append(self, res_1: int, res_2: int):
+        pending = self._pending
+        pending.append((res_1, res_2))
+
+        if len(pending) >= self.PENDING_SIZE:
+            self._drain()
+
+        self.__total_counts[res_1 + res_2] += 1
+
+        if res_1 == res_2:
+            self.__doubles += 1
+
+    def count_of_total(self, total: int) -> int:
+        if not 0 <= total < len(self.__total_counts):
+            return 0
+
+        return self.__total_counts[total]
+
+    def extend(self, faces: 'np.ndarray'):
+        if not len(faces):
+            return
+
+        self._append_rows(faces)
+
+        totals = faces.sum(axis=1, dtype=np.int64)
+        counts = np.bincount(totals, minlength=len(self.__total_counts))
+        counts[:len(self.__total_counts)] += self.__total_counts
+
+        self.__total_counts  = counts.tolist()
+        self.__doubles      += int(np.count_nonzero(faces[:, 0] == faces[:, 1]))
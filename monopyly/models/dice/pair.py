@@ -1,18 +1,51 @@
+from typing import Optional
+
 from monopyly.models.dice.die import Die
+from monopyly.models.dice.history import PairRollHistory
+from monopyly.utils.lazy import lazy_import
+from monopyly.utils.rng import RNGSource
+
+
+np = lazy_import('numpy')
 
 
 class Pair:
     """
     A pair of dice.
+
+    Parameters:
+        die_1 (Die):
+            The first die.
+
+        die_2 (Die):
+            The second die. Must have the same number of sides as the first.
+
+        history_size (Optional[int]):
+            The number of rolls to keep in `roll_history`. If not specified, every roll is kept.
+
+        rng (Optional[RNGSource]):
+            If specified, each die is given its own stream from this source, replacing whatever it was rolling
+            with. Use this to make a pair reproducible from a single seed.
     """
-    def __init__(self, die_1: Die, die_2: Die):
+    def __init__(
+        self,
+        die_1: Die,
+        die_2: Die,
+        history_size: Optional[int] = None,
+        rng: Optional[RNGSource] = None
+    ):
         self.__die_1 = None
         self.__die_2 = None
 
+        self.event_log = None
+
         self.die_1 = die_1
         self.die_2 = die_2
 
-        self.__roll_history = []
+        self.__roll_history = PairRollHistory(self.die_1.sides, history_size)
+
+        if rng is not None:
+            self.seed(rng)
 
     @property
     def die_1(self) -> Die:
@@ -45,14 +78,41 @@ class Pair:
 
         self.__die_2 = new
 
+    @property
+    def doubles_rate(self) -> float:
+        return self.__roll_history.doubles_rate
+
     @property
     def roll_count(self) -> int:
-        return len(self.__roll_history)
+        return self.__roll_history.count
 
     @property
-    def roll_history(self) -> list[tuple[int, int]]:
+    def roll_history(self) -> PairRollHistory:
         return self.__roll_history
 
+    def __check_dice(self):
+        if not self.die_1 or not self.die_2:
+            missing = []
+            if not self.die_1:
+                missing.append('die_1')
+            if not self.die_2:
+                missing.append('die_2')
+
+            raise ValueError(f'Both dice must be set before rolling! Missing dice: {", ".join(missing)}')
+
+    def seed(self, rng: RNGSource):
+        """
+        Give each die its own independent stream from `rng`.
+
+        Parameters:
+            rng (RNGSource):
+                The source to draw the streams from.
+        """
+        if not isinstance(rng, RNGSource):
+            raise TypeError('rng must be an RNGSource instance.')
+
+        self.die_1.rng, self.die_2.rng = rng.spawn(2)
+
     def roll(self):
         """
         Rolls the dice and records the result.
@@ -69,20 +129,42 @@ class Pair:
             >>> pair.roll()
             (7, (3, 4), False)
         """
-        if not self.die_1 or not self.die_2:
-            missing = []
-            if not self.die_1:
-                missing.append('die_1')
-            if not self.die_2:
-                missing.append('die_2')
-
-            raise ValueError(f'Both dice must be set before rolling! Missing dice: {", ".join(missing)}')
+        self.__check_dice()
 
         res_1 = self.die_1.roll()
         res_2 = self.die_2.roll()
         double = res_1 == res_2
         result = (res_1 + res_2, (res_1, res_2), double)
-        self.__roll_history.append(result)
+        self.__roll_history.append(res_1, res_2)
+
+        if self.event_log is not None:
+            self.event_log.on_roll(res_1, res_2)
 
         return result
 
+    def roll_many(self, n: int) -> 'tuple[np.ndarray, np.ndarray, np.ndarray]':
+        """
+        Rolls the dice `n` times in one go and records the results.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+                The result comes in three parts, each with one entry per roll:
+                    - The totals of the two dice.
+                    - The individual results of the two dice, as an `(n, 2)` array.
+                    - Whether the two dice were the same.
+
+        Example:
+            >>> pair = Pair(Die(), Die())
+            >>> totals, faces, doubles = pair.roll_many(3)
+            >>> totals
+            array([ 7, 10,  4], dtype=int32)
+        """
+        self.__check_dice()
+
+        faces = np.column_stack((self.die_1.roll_many(n), self.die_2.roll_many(n)))
+        totals = faces.sum(axis=1, dtype=np.int32)
+        doubles = faces[:, 0] == faces[:, 1]
+
+        self.__roll_history.extend(faces)
+
+        return totals, faces, doubles
@@ -6,3 +6,515 @@ LastEditTime: 2025-01-16 17:00:04
 FilePath: monopyly/models/ledger/ledger.py
 Description: 这是默认设置,可以在设置》工具》File Description中进行配置
 """
+import time
+from array import array
+from bisect import bisect_right
+from typing import Hashable, Optional, Sequence, Union
+
+from monopyly.models.player import Player
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+BANK = -1
+"""The participant id used for the bank."""
+
+NO_PROPERTY = -1
+"""The property id used for entries that are not about a property."""
+
+NO_GROUP = -1
+"""The group id used for entries that were not recorded as part of a group."""
+
+KINDS = (
+    'transfer',
+    'rent',
+    'purchase',
+    'salary',
+    'tax',
+    'fine',
+    'mortgage',
+    'development',
+)
+
+
+class Ledger:
+    """
+    An append-only record of every transaction in a game.
+
+    Entries are stored column by column in NumPy arrays (amount, source, destination, kind, turn, property, group and
+    a monotonic nanosecond timestamp), rather than as one object per entry. Running totals are kept as entries are
+    appended, so the current balance of a player, and the totals by kind or by property, are O(1) reads. The balance
+    of a player as of any turn is an O(log n) lookup.
+
+    Players, and properties, are given small integer ids the first time they appear in the ledger. The bank is
+    always `BANK`. Entries appended together with `extend(..., grouped=True)` share a group id, so a multi-party
+    settlement can be read back as a single unit with `group`.
+
+    Parameters:
+        players (Optional[Sequence[Player]]):
+            Players to register up front, so their ids follow seat order.
+
+        capacity (int):
+            The number of entries to allocate room for initially. The columns grow as needed.
+    """
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, players: Optional[Sequence[Player]] = None, capacity: int = INITIAL_CAPACITY):
+        capacity = max(1, capacity)
+
+        self.__size        = 0
+        self.__amount      = np.empty(capacity, dtype=np.int64)
+        self.__source      = np.empty(capacity, dtype=np.int32)
+        self.__destination = np.empty(capacity, dtype=np.int32)
+        self.__kind        = np.empty(capacity, dtype=np.int8)
+        self.__turn        = np.empty(capacity, dtype=np.int32)
+        self.__property    = np.empty(capacity, dtype=np.int32)
+        self.__group       = np.empty(capacity, dtype=np.int32)
+        self.__timestamp   = np.empty(capacity, dtype=np.int64)
+
+        self.__player_ids     = {}
+        self.__players        = []
+        self.__property_ids   = {}
+        self.__properties     = []
+
+        self.__balances          = []
+        self.__balance_turns     = []
+        self.__balance_history   = []
+        self.__kind_totals       = [0] * len(KINDS)
+        self.__property_totals   = []
+        self.__group_slices      = []
+
+        self.event_log = None
+        self.backend   = None
+
+        for player in players or ():
+            self.player_id(player)
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @property
+    def amounts(self) -> 'np.ndarray':
+        return self.__amount[:self.__size]
+
+    @property
+    def destinations(self) -> 'np.ndarray':
+        return self.__destination[:self.__size]
+
+    @property
+    def groups(self) -> 'np.ndarray':
+        return self.__group[:self.__size]
+
+    @property
+    def kinds(self) -> 'np.ndarray':
+        return self.__kind[:self.__size]
+
+    @property
+    def last_turn(self) -> int:
+        """The turn of the most recent entry, or -1 if the ledger is empty."""
+        return int(self.__turn[self.__size - 1]) if self.__size else -1
+
+    @property
+    def players(self) -> list[Player]:
+        """The registered players, indexed by id."""
+        return self.__players
+
+    @property
+    def properties(self) -> 'np.ndarray':
+        return self.__property[:self.__size]
+
+    @property
+    def property_keys(self) -> list[Hashable]:
+        """The registered property keys, indexed by id."""
+        return self.__properties
+
+    @property
+    def sources(self) -> 'np.ndarray':
+        return self.__source[:self.__size]
+
+    @property
+    def timestamps(self) -> 'np.ndarray':
+        return self.__timestamp[:self.__size]
+
+    @property
+    def turns(self) -> 'np.ndarray':
+        return self.__turn[:self.__size]
+
+    @staticmethod
+    def kind_id(kind: Union[str, int]) -> int:
+        """
+        Get the id of a kind of entry.
+
+        Parameters:
+            kind (Union[str, int]):
+                The name of the kind (one of `KINDS`), or its id.
+
+        Returns:
+            int:
+                The id.
+        """
+        if isinstance(kind, str):
+            try:
+                return KINDS.index(kind)
+            except ValueError:
+                raise ValueError(f'Invalid kind: {kind}. Must be one of {KINDS}.') from None
+
+        if not 0 <= kind < len(KINDS):
+            raise ValueError(f'Invalid kind id: {kind}.')
+
+        return int(kind)
+
+    def player_id(self, player: Optional[Player]) -> int:
+        """
+        Get the ledger id of a player, registering them if needed.
+
+        Parameters:
+            player (Optional[Player]):
+                The player, or None for the bank.
+
+        Returns:
+            int:
+                The id.
+        """
+        if player is None:
+            return BANK
+
+        player_id = self.__player_ids.get(player)
+
+        if player_id is None:
+            if not isinstance(player, Player):
+                raise ValueError('Ledger participants must be Player instances (or None for the bank).')
+
+            player_id = self.__player_ids[player] = len(self.__players)
+            self.__players.append(player)
+            self.__balances.append(0)
+            self.__balance_turns.append(array('l'))
+            self.__balance_history.append(array('q'))
+
+        return player_id
+
+    def property_id(self, property_key: Optional[Hashable]) -> int:
+        """
+        Get the ledger id of a property, registering it if needed.
+
+        Parameters:
+            property_key (Optional[Hashable]):
+                Anything that identifies the property (usually its name), or None for no property.
+
+        Returns:
+            int:
+                The id.
+        """
+        if property_key is None:
+            return NO_PROPERTY
+
+        property_id = self.__property_ids.get(property_key)
+
+        if property_id is None:
+            property_id = self.__property_ids[property_key] = len(self.__properties)
+            self.__properties.append(property_key)
+            self.__property_totals.append(0)
+
+        return property_id
+
+    def __reserve(self, extra: int):
+        needed = self.__size + extra
+
+        if needed <= len(self.__amount):
+            return
+
+        capacity = len(self.__amount)
+        while capacity < needed:
+            capacity *= 2
+
+        for name in ('amount', 'source', 'destination', 'kind', 'turn', 'property', 'group', 'timestamp'):
+            attr   = f'_Ledger__{name}'
+            column = getattr(self, attr)
+            grown  = np.empty(capacity, dtype=column.dtype)
+            grown[:self.__size] = column[:self.__size]
+            setattr(self, attr, grown)
+
+    def __check_turn(self, turn: int):
+        if self.__size and turn < self.__turn[self.__size - 1]:
+            raise ValueError('Ledger entries must be appended in turn order.')
+
+    def __post(self, player_id: int, delta: int, turn: int):
+        balance = self.__balances[player_id] + delta
+        self.__balances[player_id] = balance
+
+        turns = self.__balance_turns[player_id]
+
+        # Several entries in one turn only need the closing balance of that turn.
+        if turns and turns[-1] == turn:
+            self.__balance_history[player_id][-1] = balance
+        else:
+            turns.append(turn)
+            self.__balance_history[player_id].append(balance)
+
+    def append(
+            self,
+            amount:      int,
+            source:      Optional[Player],
+            destination: Optional[Player],
+            kind:        Union[str, int] = 'transfer',
+            turn:        int = 0,
+            property_key: Optional[Hashable] = None
+    ) -> int:
+        """
+        Record a single entry.
+
+        Parameters:
+            amount (int):
+                The amount paid from `source` to `destination`.
+
+            source (Optional[Player]):
+                Who paid, or None for the bank.
+
+            destination (Optional[Player]):
+                Who was paid, or None for the bank.
+
+            kind (Union[str, int]):
+                What sort of entry it is; one of `KINDS`.
+
+            turn (int):
+                The turn the entry belongs to. Entries must be appended in turn order.
+
+            property_key (Optional[Hashable]):
+                The property the entry is about, if any.
+
+        Returns:
+            int:
+                The index of the new entry.
+        """
+        kind_id = self.kind_id(kind)
+        self.__check_turn(turn)
+
+        source_id      = self.player_id(source)
+        destination_id = self.player_id(destination)
+        property_id    = self.property_id(property_key)
+
+        self.__reserve(1)
+
+        index = self.__size
+        self.__amount[index]      = amount
+        self.__source[index]      = source_id
+        self.__destination[index] = destination_id
+        self.__kind[index]        = kind_id
+        self.__turn[index]        = turn
+        self.__property[index]    = property_id
+        self.__group[index]       = NO_GROUP
+        self.__timestamp[index]   = time.monotonic_ns()
+        self.__size += 1
+
+        if source_id != BANK:
+            self.__post(source_id, -amount, turn)
+
+        if destination_id != BANK:
+            self.__post(destination_id, amount, turn)
+
+        self.__kind_totals[kind_id] += amount
+
+        if property_id != NO_PROPERTY:
+            self.__property_totals[property_id] += amount
+
+        if self.backend is not None:
+            self.backend.appended(index, turn)
+
+        return index
+
+    def extend(
+            self,
+            amounts:      Sequence[int],
+            sources:      Sequence[Optional[Player]],
+            destinations: Sequence[Optional[Player]],
+            kind:         Union[str, int] = 'transfer',
+            turn:         int = 0,
+            property_keys: Optional[Sequence[Optional[Hashable]]] = None,
+            grouped:       bool = False
+    ) -> slice:
+        """
+        Record a batch of entries of the same kind and turn in one go.
+
+        Parameters:
+            amounts (Sequence[int]):
+                The amount of each entry.
+
+            sources (Sequence[Optional[Player]]):
+                Who paid each entry, None for the bank.
+
+            destinations (Sequence[Optional[Player]]):
+                Who was paid for each entry, None for the bank.
+
+            kind (Union[str, int]):
+                What sort of entries they are; one of `KINDS`.
+
+            turn (int):
+                The turn the entries belong to.
+
+            property_keys (Optional[Sequence[Optional[Hashable]]]):
+                The property each entry is about, if any.
+
+            grouped (bool):
+                Whether to record the entries as a single group.
+
+        Returns:
+            slice:
+                The indices of the new entries.
+        """
+        amounts = np.asarray(amounts, dtype=np.int64)
+        n       = len(amounts)
+
+        if len(sources) != n or len(destinations) != n or (property_keys is not None and len(property_keys) != n):
+            raise ValueError('Every column of a batch must have the same length.')
+
+        kind_id = self.kind_id(kind)
+        self.__check_turn(turn)
+
+        source_ids      = np.fromiter((self.player_id(p) for p in sources), dtype=np.int32, count=n)
+        destination_ids = np.fromiter((self.player_id(p) for p in destinations), dtype=np.int32, count=n)
+
+        if property_keys is None:
+            property_ids = np.full(n, NO_PROPERTY, dtype=np.int32)
+        else:
+            property_ids = np.fromiter((self.property_id(k) for k in property_keys), dtype=np.int32, count=n)
+
+        self.__reserve(n)
+
+        start, stop = self.__size, self.__size + n
+        self.__amount[start:stop]      = amounts
+        self.__source[start:stop]      = source_ids
+        self.__destination[start:stop] = destination_ids
+        self.__kind[start:stop]        = kind_id
+        self.__turn[start:stop]        = turn
+        self.__property[start:stop]    = property_ids
+        self.__timestamp[start:stop]   = time.monotonic_ns()
+        self.__size = stop
+
+        if grouped:
+            self.__group[start:stop] = len(self.__group_slices)
+            self.__group_slices.append(slice(start, stop))
+        else:
+            self.__group[start:stop] = NO_GROUP
+
+        deltas = np.zeros(len(self.__players) + 1, dtype=np.int64)
+        np.add.at(deltas, source_ids, -amounts)
+        np.add.at(deltas, destination_ids, amounts)
+
+        # The bank's id is -1, so its deltas land in the spare last slot and are ignored.
+        for player_id in np.flatnonzero(deltas[:-1]).tolist():
+            self.__post(player_id, int(deltas[player_id]), turn)
+
+        self.__kind_totals[kind_id] += int(amounts.sum())
+
+        has_property = property_ids != NO_PROPERTY
+        if has_property.any():
+            totals = np.bincount(property_ids[has_property], weights=amounts[has_property],
+                                 minlength=len(self.__properties))
+            for property_id in np.flatnonzero(totals).tolist():
+                self.__property_totals[property_id] += int(totals[property_id])
+
+        if self.backend is not None:
+            self.backend.appended(start, turn)
+
+        return slice(start, stop)
+
+    def balance(self, player: Player, turn: Optional[int] = None) -> int:
+        """
+        Get the net amount a player has received through the ledger.
+
+        Parameters:
+            player (Player):
+                The player.
+
+            turn (Optional[int]):
+                If given, the balance as it stood at the end of that turn. Otherwise, the current balance.
+
+        Returns:
+            int:
+                The balance.
+        """
+        player_id = self.__player_ids.get(player)
+
+        if player_id is None:
+            return 0
+
+        if turn is None:
+            return self.__balances[player_id]
+
+        position = bisect_right(self.__balance_turns[player_id], turn)
+
+        return self.__balance_history[player_id][position - 1] if position else 0
+
+    def balances(self) -> dict[Player, int]:
+        """Get the current balance of every registered player."""
+        return dict(zip(self.__players, self.__balances))
+
+    def entries_for_turns(self, first: int, last: int) -> slice:
+        """
+        Find the entries recorded between two turns, inclusive.
+
+        Parameters:
+            first (int):
+                The first turn.
+
+            last (int):
+                The last turn.
+
+        Returns:
+            slice:
+                The indices of the entries, for use with the column properties.
+        """
+        turns = self.turns
+
+        return slice(int(np.searchsorted(turns, first, 'left')), int(np.searchsorted(turns, last, 'right')))
+
+    def group(self, group_id: int) -> slice:
+        """
+        Find the entries of a group.
+
+        Parameters:
+            group_id (int):
+                The group id, as found in the `groups` column.
+
+        Returns:
+            slice:
+                The indices of the entries, for use with the column properties.
+        """
+        return self.__group_slices[group_id]
+
+    def tail(self, n: int) -> 'dict[str, np.ndarray]':
+        """
+        Get the last `n` entries, column by column.
+
+        Parameters:
+            n (int):
+                The number of entries.
+
+        Returns:
+            dict[str, numpy.ndarray]:
+                Each column, keyed by name.
+        """
+        start = max(0, self.__size - n)
+
+        return {
+            'amount':      self.__amount[start:self.__size],
+            'source':      self.__source[start:self.__size],
+            'destination': self.__destination[start:self.__size],
+            'kind':        self.__kind[start:self.__size],
+            'turn':        self.__turn[start:self.__size],
+            'property':    self.__property[start:self.__size],
+            'group':       self.__group[start:self.__size],
+            'timestamp':   self.__timestamp[start:self.__size],
+        }
+
+    def total_by_kind(self, kind: Union[str, int]) -> int:
+        """Get the total amount of every entry of a kind."""
+        return self.__kind_totals[self.kind_id(kind)]
+
+    def total_by_property(self, property_key: Hashable) -> int:
+        """Get the total amount of every entry about a property."""
+        property_id = self.__property_ids.get(property_key)
+
+        return 0 if property_id is None else self.__property_totals[property_id]
@@ -0,0 +1,461 @@
+"""
+A durable home for ledger history, in an SQLite database.
+
+Attach a game's `Ledger` to a `SQLiteLedgerStore` and every entry it records is written to the database: entries are
+buffered until their turn is over, then inserted in a single transaction, so a turn is either stored whole or not at
+all. Committing costs more than inserting, so finished turns are held until there are `batch_size` entries' worth
+and written together; a batch size of 1 writes each turn as soon as it is over.
+
+The database runs in WAL mode, so queries can run while games write, and the entries are indexed by game and player,
+game and property, and game and turn. Queries are answered by SQLite and streamed from a cursor; no history is loaded
+into memory to answer them. A query first writes the game's finished turns, so it sees everything but the turn in
+progress.
+
+A turn is over when the ledger records an entry for a later turn, so commit transactions with the turn they belong
+to. Entries committed without one all go under turn 0, which never ends: none of them are written, or seen by
+queries, until the game is detached (or `SQLiteLedgerWriter.flush` is called with no limit).
+
+Example:
+    >>> with SQLiteLedgerStore('ledger.db') as store:
+    ...     store.attach(session.ledger, session.session_id)
+    ...     ...  # play
+    ...     store.rent_paid(session.session_id, 'Player 1', 'Boardwalk', turns=(0, 200))
+"""
+import operator
+import sqlite3
+from pathlib import Path
+from typing import Hashable, Iterator, NamedTuple, Optional, Union
+
+from monopyly.models.ledger.ledger import KINDS, Ledger
+
+
+DEFAULT_BATCH_SIZE = 1024
+"""The number of entries from finished turns to buffer before writing them."""
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        game        NOT NULL,
+        seq         INTEGER NOT NULL,
+        turn        INTEGER NOT NULL,
+        kind        INTEGER NOT NULL,
+        source      INTEGER NOT NULL,
+        destination INTEGER NOT NULL,
+        amount      INTEGER NOT NULL,
+        property    INTEGER NOT NULL,
+        grp         INTEGER NOT NULL,
+        timestamp   INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS players (
+        game NOT NULL,
+        id   INTEGER NOT NULL,
+        name TEXT,
+        PRIMARY KEY (game, id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS properties (
+        game NOT NULL,
+        id   INTEGER NOT NULL,
+        key  TEXT,
+        PRIMARY KEY (game, id)
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS entries_by_source ON entries (game, source, turn)',
+    'CREATE INDEX IF NOT EXISTS entries_by_destination ON entries (game, destination, turn)',
+    'CREATE INDEX IF NOT EXISTS entries_by_property ON entries (game, property, turn)',
+    'CREATE INDEX IF NOT EXISTS entries_by_turn ON entries (game, turn)',
+)
+
+_INSERT = 'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+# Stands in for a player name or property key the store has never seen, so the query matches nothing.
+_UNKNOWN = -2
+
+
+class StoredEntry(NamedTuple):
+    game:        Hashable
+    seq:         int
+    """The entry's index in its game's ledger."""
+
+    turn:        int
+    kind:        str
+    source:      int
+    """The ledger id of who paid, or `BANK`."""
+
+    destination: int
+    """The ledger id of who was paid, or `BANK`."""
+
+    amount:      int
+    property:    int
+    """The ledger id of the property, or `NO_PROPERTY`."""
+
+    group:       int
+    timestamp:   int
+
+
+class SQLiteLedgerWriter:
+    """
+    Writes one game's ledger to a store, a turn at a time. Created by `SQLiteLedgerStore.attach`.
+
+    Parameters:
+        store (SQLiteLedgerStore):
+            The store.
+
+        ledger (Ledger):
+            The game's ledger.
+
+        game (Hashable):
+            The game's id in the store.
+
+        batch_size (int):
+            The number of entries from finished turns to buffer before writing them.
+    """
+    def __init__(self, store: 'SQLiteLedgerStore', ledger: Ledger, game: Hashable, batch_size: int):
+        self.__store      = store
+        self.__ledger     = ledger
+        self.__game       = game
+        self.__batch_size = batch_size
+        self.__written    = 0
+        self.__players    = 0
+        self.__properties = 0
+        self.__turn       = ledger.last_turn
+        self.__current    = ledger.entries_for_turns(self.__turn, self.__turn).start if len(ledger) else 0
+
+    @property
+    def game(self) -> Hashable:
+        return self.__game
+
+    @property
+    def ledger(self) -> Ledger:
+        return self.__ledger
+
+    @property
+    def finished(self) -> int:
+        """The index of the first entry of the turn in progress; everything before it is from finished turns."""
+        return self.__current
+
+    @property
+    def pending(self) -> int:
+        """The number of entries recorded but not yet written."""
+        return len(self.__ledger) - self.__written
+
+    @property
+    def written(self) -> int:
+        return self.__written
+
+    def appended(self, index: int, turn: int):
+        """Called by the ledger after it records entries, from `index` on, for `turn`."""
+        if turn == self.__turn:
+            return
+
+        self.__turn    = turn
+        self.__current = index
+
+        # Everything before the new entries belongs to turns that are over; write it once there is enough of it.
+        if index - self.__written >= self.__batch_size:
+            self.flush(index)
+
+    def flush(self, stop: Optional[int] = None):
+        """
+        Write the buffered entries (up to `stop`) in one transaction.
+
+        Parameters:
+            stop (Optional[int]):
+                The index to write up to. If not specified, every buffered entry is written.
+        """
+        ledger = self.__ledger
+        start  = self.__written
+        stop   = len(ledger) if stop is None else stop
+        game   = self.__game
+
+        if stop <= start and len(ledger.players) == self.__players and len(ledger.property_keys) == self.__properties:
+            return
+
+        players    = ledger.players[self.__players:]
+        properties = ledger.property_keys[self.__properties:]
+
+        rows = zip(
+            [game] * (stop - start),
+            range(start, stop),
+            ledger.turns[start:stop].tolist(),
+            ledger.kinds[start:stop].tolist(),
+            ledger.sources[start:stop].tolist(),
+            ledger.destinations[start:stop].tolist(),
+            ledger.amounts[start:stop].tolist(),
+            ledger.properties[start:stop].tolist(),
+            ledger.groups[start:stop].tolist(),
+            ledger.timestamps[start:stop].tolist(),
+        )
+
+        with self.__store.connection as connection:
+            connection.executemany(
+                'INSERT INTO players VALUES (?, ?, ?)',
+                [(game, self.__players + offset, player.name) for offset, player in enumerate(players)]
+            )
+            connection.executemany(
+                'INSERT INTO properties VALUES (?, ?, ?)',
+                [(game, self.__properties + offset, str(key)) for offset, key in enumerate(properties)]
+            )
+            connection.executemany(_INSERT, rows)
+
+        self.__written     = stop
+        self.__players    += len(players)
+        self.__properties += len(properties)
+
+    def detach(self):
+        """Write anything buffered and stop following the ledger."""
+        self.flush()
+
+        if self.__ledger.backend is self:
+            self.__ledger.backend = None
+
+        self.__store._detached(self)
+
+
+class SQLiteLedgerStore:
+    """
+    Ledger history for any number of games, in one SQLite database.
+
+    Parameters:
+        path (Union[str, Path]):
+            The database file. Created if it does not exist. ':memory:' keeps it in memory.
+
+        batch_size (int):
+            The number of entries from finished turns each game buffers before writing them. 1 writes each turn as
+            soon as it is over.
+    """
+    def __init__(self, path: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE):
+        if batch_size < 1:
+            raise ValueError('Batch size must be at least one.')
+
+        self.__path       = path
+        self.__batch_size = batch_size
+        self.__writers    = {}
+        self.__connection = sqlite3.connect(path)
+
+        self.__connection.execute('PRAGMA journal_mode = WAL')
+        self.__connection.execute('PRAGMA synchronous = NORMAL')
+
+        with self.__connection:
+            for statement in SCHEMA:
+                self.__connection.execute(statement)
+
+    def __enter__(self) -> 'SQLiteLedgerStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self.__connection
+
+    @property
+    def path(self) -> Union[str, Path]:
+        return self.__path
+
+    def attach(self, ledger: Ledger, game: Hashable) -> SQLiteLedgerWriter:
+        """
+        Start writing a game's ledger to the store.
+
+        Entries already in the ledger are written along with the first turn that follows. Turns only end when an
+        entry is recorded for a later one, so a game that commits everything under the default turn 0 is only
+        written when it is detached.
+
+        Parameters:
+            ledger (Ledger):
+                The game's ledger.
+
+            game (Hashable):
+                The game's id in the store, such as its session id. Must be new to the store.
+
+        Returns:
+            SQLiteLedgerWriter:
+                The writer, through which the game can be flushed or detached.
+        """
+        if ledger.backend is not None:
+            raise ValueError('Ledger already has a backend.')
+
+        if game in self.__writers or self.__connection.execute(
+                'SELECT 1 FROM entries WHERE game = ? LIMIT 1', (game,)).fetchone():
+            raise ValueError(f'Game {game!r} already has entries in the store.')
+
+        writer = self.__writers[game] = SQLiteLedgerWriter(self, ledger, game, self.__batch_size)
+        ledger.backend = writer
+
+        return writer
+
+    def _detached(self, writer: SQLiteLedgerWriter):
+        if self.__writers.get(writer.game) is writer:
+            del self.__writers[writer.game]
+
+    def flush(self):
+        """Write the finished turns every attached game has buffered."""
+        for writer in list(self.__writers.values()):
+            writer.flush(writer.finished)
+
+    def close(self):
+        """Detach every game, writing what they have buffered, and close the database."""
+        for writer in list(self.__writers.values()):
+            writer.detach()
+
+        self.__connection.close()
+
+    def __resolve(self, table: str, column: str, game: Hashable, value: Union[int, str, None]) -> Optional[int]:
+        if value is None:
+            return None
+
+        # Anything integer-like, such as a NumPy integer, is an id; anything else is looked up by name.
+        try:
+            return operator.index(value)
+        except TypeError:
+            pass
+
+        row = self.__connection.execute(
+            f'SELECT id FROM {table} WHERE game = ? AND {column} = ?', (game, str(value))
+        ).fetchone()
+
+        return row[0] if row else _UNKNOWN
+
+    def __where(
+            self,
+            game:        Hashable,
+            player:      Union[int, str, None],
+            source:      Union[int, str, None],
+            destination: Union[int, str, None],
+            property:    Union[int, str, None],
+            kind:        Union[int, str, None],
+            turns:       Optional[tuple[int, int]]
+    ) -> tuple[str, list]:
+        writer = self.__writers.get(game)
+
+        # The turn in progress stays buffered, so no query ever sees part of a turn.
+        if writer is not None:
+            writer.flush(writer.finished)
+
+        clauses    = ['game = ?']
+        parameters = [game]
+
+        player      = self.__resolve('players', 'name', game, player)
+        source      = self.__resolve('players', 'name', game, source)
+        destination = self.__resolve('players', 'name', game, destination)
+        property    = self.__resolve('properties', 'key', game, property)
+
+        if player is not None:
+            clauses.append('(source = ? OR destination = ?)')
+            parameters += [player, player]
+
+        for column, value in (('source', source), ('destination', destination), ('property', property)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                parameters.append(value)
+
+        if kind is not None:
+            clauses.append('kind = ?')
+            parameters.append(Ledger.kind_id(kind))
+
+        if turns is not None:
+            clauses.append('turn BETWEEN ? AND ?')
+            parameters += list(turns)
+
+        return ' AND '.join(clauses), parameters
+
+    def entries(
+            self,
+            game:        Hashable,
+            player:      Union[int, str, None] = None,
+            source:      Union[int, str, None] = None,
+            destination: Union[int, str, None] = None,
+            property:    Union[int, str, None] = None,
+            kind:        Union[int, str, None] = None,
+            turns:       Optional[tuple[int, int]] = None
+    ) -> Iterator[StoredEntry]:
+        """
+        Stream a game's entries, in the order they were recorded.
+
+        Players can be given by ledger id (`BANK` for the bank) or by name, and properties by ledger id or key.
+
+        Parameters:
+            game (Hashable):
+                The game.
+
+            player (Union[int, str, None]):
+                Only entries this player paid or was paid.
+
+            source (Union[int, str, None]):
+                Only entries this player paid.
+
+            destination (Union[int, str, None]):
+                Only entries this player was paid.
+
+            property (Union[int, str, None]):
+                Only entries about this property.
+
+            kind (Union[int, str, None]):
+                Only entries of this kind; one of `KINDS`.
+
+            turns (Optional[tuple[int, int]]):
+                Only entries from the first turn to the last, inclusive.
+
+        Yields:
+            StoredEntry:
+                Each matching entry.
+        """
+        where, parameters = self.__where(game, player, source, destination, property, kind, turns)
+        cursor = self.__connection.execute(f'SELECT * FROM entries WHERE {where} ORDER BY turn, seq', parameters)
+
+        for row in cursor:
+            yield StoredEntry(row[0], row[1], row[2], KINDS[row[3]], *row[4:])
+
+    def total(
+            self,
+            game:        Hashable,
+            player:      Union[int, str, None] = None,
+            source:      Union[int, str, None] = None,
+            destination: Union[int, str, None] = None,
+            property:    Union[int, str, None] = None,
+            kind:        Union[int, str, None] = None,
+            turns:       Optional[tuple[int, int]] = None
+    ) -> int:
+        """Get the total amount of a game's matching entries. Takes the same filters as `entries`."""
+        where, parameters = self.__where(game, player, source, destination, property, kind, turns)
+
+        return self.__connection.execute(
+            f'SELECT COALESCE(SUM(amount), 0) FROM entries WHERE {where}', parameters
+        ).fetchone()[0]
+
+    def rent_paid(
+            self,
+            game:     Hashable,
+            payee:    Union[int, str],
+            property: Union[int, str],
+            turns:    Optional[tuple[int, int]] = None
+    ) -> int:
+        """
+        Get the rent a player was paid on a property.
+
+        Parameters:
+            game (Hashable):
+                The game.
+
+            payee (Union[int, str]):
+                The player who was paid, by ledger id or name.
+
+            property (Union[int, str]):
+                The property, by ledger id or key.
+
+            turns (Optional[tuple[int, int]]):
+                The first and last turn to count, inclusive. If not specified, every turn counts.
+
+        Returns:
+            int:
+                The total rent.
+        """
+        return self.total(game, destination=payee, property=property, kind='rent', turns=turns)
+
+    def games(self) -> list[Hashable]:
+        """Get the id of every game with entries in the store."""
+        return [row[0] for row in self.__connection.execute('SELECT DISTINCT game FROM entries')]
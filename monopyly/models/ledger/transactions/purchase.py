@@ -0,0 +1,24 @@
+from typing import Optional
+
+from monopyly.models.ledger.transactions.transaction import Transaction
+
+
+class PurchaseTransaction(Transaction):
+    """Class representing the purchase of a property."""
+    KIND = 'purchase'
+
+    def __init__(self,
+                 amount: int,
+                 source: Optional['Player'],
+                 destination: Optional['Player'],
+                 property_name: str,
+                 description: str = "Property Purchase"):
+        super().__init__(amount, source, destination, description)
+        self.property_name = property_name
+
+    @property
+    def property_key(self):
+        return self.property_name
+
+    def __str__(self):
+        return f"{super().__str__()} for property: {self.property_name}"
@@ -5,6 +5,8 @@ from monopyly.models.ledger.transactions.transaction import Transaction
 
 class RentTransaction(Transaction):
     """Class representing a rent transaction."""
+    KIND = 'rent'
+
     def __init__(self,
                  amount: int,
                  source: Optional['Player'],
@@ -14,5 +16,9 @@ class RentTransaction(Transaction):
         super().__init__(amount, source, destination, description)
         self.property_name = property_name
 
+    @property
+    def property_key(self):
+        return self.property_name
+
     def __str__(self):
         return f"{super().__str__()} for property: {self.property_name}"
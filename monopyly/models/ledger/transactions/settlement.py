@@ -0,0 +1,250 @@
+from typing import Iterable, Optional
+
+from monopyly.models.player import Player
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+class Settlement:
+    """
+    A batch of payments that settles all at once, or not at all.
+
+    Use this for effects that move money between many players at the same time, like "every player pays $50" or
+    "pay each player $10". All the payments are netted per player, solvency is checked for the whole batch, and only
+    then is any cash moved. If the ledger is given, the batch is recorded as a single group of entries.
+
+    Parameters:
+        description (str):
+            What the settlement is for.
+
+        kind (str):
+            The kind of ledger entry to record the payments as.
+
+    Example:
+        >>> settlement = Settlement.everyone_pays(players, 50, description='Street repairs')
+        >>> settlement.commit(ledger, turn=12)
+    """
+    def __init__(self, description: str = '', kind: str = 'transfer'):
+        self.__description  = description
+        self.__kind         = kind
+        self.__amounts      = []
+        self.__sources      = []
+        self.__destinations = []
+        self.__settled      = False
+
+    def __len__(self) -> int:
+        return len(self.__amounts)
+
+    @property
+    def description(self) -> str:
+        return self.__description
+
+    @property
+    def kind(self) -> str:
+        return self.__kind
+
+    @property
+    def settled(self) -> bool:
+        return self.__settled
+
+    @classmethod
+    def everyone_pays(
+            cls,
+            players:     Iterable[Player],
+            amount:      int,
+            destination: Optional[Player] = None,
+            **kwargs
+    ) -> 'Settlement':
+        """
+        Build a settlement where every player pays the same amount to one destination.
+
+        The destination itself, if it is one of the players, is skipped.
+
+        Parameters:
+            players (Iterable[Player]):
+                The players who pay.
+
+            amount (int):
+                The amount each player pays.
+
+            destination (Optional[Player]):
+                Who gets paid, or None for the bank.
+
+        Returns:
+            Settlement:
+                The settlement, ready to commit.
+        """
+        settlement = cls(**kwargs)
+
+        for player in players:
+            if player is not destination:
+                settlement.add(amount, player, destination)
+
+        return settlement
+
+    @classmethod
+    def pay_each(
+            cls,
+            source:  Optional[Player],
+            players: Iterable[Player],
+            amount:  int,
+            **kwargs
+    ) -> 'Settlement':
+        """
+        Build a settlement where one source pays the same amount to every player.
+
+        The source itself, if it is one of the players, is skipped.
+
+        Parameters:
+            source (Optional[Player]):
+                Who pays, or None for the bank.
+
+            players (Iterable[Player]):
+                The players who get paid.
+
+            amount (int):
+                The amount each player gets.
+
+        Returns:
+            Settlement:
+                The settlement, ready to commit.
+        """
+        settlement = cls(**kwargs)
+
+        for player in players:
+            if player is not source:
+                settlement.add(amount, source, player)
+
+        return settlement
+
+    def add(self, amount: int, source: Optional[Player], destination: Optional[Player]) -> 'Settlement':
+        """
+        Add a payment to the batch.
+
+        Parameters:
+            amount (int):
+                The amount paid.
+
+            source (Optional[Player]):
+                Who pays, or None for the bank.
+
+            destination (Optional[Player]):
+                Who gets paid, or None for the bank.
+
+        Returns:
+            Settlement:
+                The settlement, so calls can be chained.
+        """
+        if self.__settled:
+            raise ValueError('Settlement has already been settled.')
+
+        if not isinstance(amount, int) or amount < 0:
+            raise ValueError('Payment amounts must be non-negative integers.')
+
+        for party in (source, destination):
+            if party is not None and not isinstance(party, Player):
+                raise ValueError('Payment parties must be Player instances (or None for the bank).')
+
+        self.__amounts.append(amount)
+        self.__sources.append(source)
+        self.__destinations.append(destination)
+
+        return self
+
+    def net_deltas(self) -> dict[Player, int]:
+        """
+        Get the net change in cash each player would see if the settlement were committed.
+
+        Returns:
+            dict[Player, int]:
+                The change for every player in the batch.
+        """
+        players, deltas = self.__net()
+
+        return dict(zip(players, deltas.tolist()))
+
+    def __net(self) -> 'tuple[list[Player], np.ndarray]':
+        index   = {}
+        players = []
+
+        def seat(player: Optional[Player]) -> int:
+            if player is None:
+                return -1
+
+            position = index.get(player)
+            if position is None:
+                position = index[player] = len(players)
+                players.append(player)
+
+            return position
+
+        n            = len(self.__amounts)
+        amounts      = np.fromiter(self.__amounts, dtype=np.int64, count=n)
+        sources      = np.fromiter(map(seat, self.__sources), dtype=np.int64, count=n)
+        destinations = np.fromiter(map(seat, self.__destinations), dtype=np.int64, count=n)
+
+        # The bank sits at index -1, the spare last slot, and is dropped.
+        deltas = np.zeros(len(players) + 1, dtype=np.int64)
+        np.add.at(deltas, sources, -amounts)
+        np.add.at(deltas, destinations, amounts)
+
+        return players, deltas[:-1]
+
+    def insolvent_players(self) -> list[Player]:
+        """
+        Get the players who cannot cover their share of the settlement.
+
+        Returns:
+            list[Player]:
+                The players whose cash would drop below zero.
+        """
+        players, deltas = self.__net()
+        cash = np.fromiter((player.cash for player in players), dtype=np.int64, count=len(players))
+
+        return [players[i] for i in np.flatnonzero(cash + deltas < 0).tolist()]
+
+    def commit(self, ledger: Optional['Ledger'] = None, turn: int = 0, allow_debt: bool = False):
+        """
+        Apply every payment in the batch, or none of them.
+
+        Parameters:
+            ledger (Optional[Ledger]):
+                If given, the payments are recorded in it as a single group.
+
+            turn (int):
+                The turn to record the payments under.
+
+            allow_debt (bool):
+                Skip the solvency check and let players' cash go negative.
+
+        Raises:
+            ValueError:
+                If any player cannot cover their share. Nothing is changed.
+        """
+        if self.__settled:
+            raise ValueError('Settlement has already been settled.')
+
+        players, deltas = self.__net()
+        cash  = np.fromiter((player.cash for player in players), dtype=np.int64, count=len(players))
+        after = cash + deltas
+
+        if not allow_debt:
+            short = np.flatnonzero(after < 0)
+
+            if len(short):
+                names = ', '.join(str(players[i].name) for i in short.tolist())
+                raise ValueError(f'Settlement cannot be covered by: {names}.')
+
+        if ledger is not None:
+            ledger.extend(self.__amounts, self.__sources, self.__destinations, self.__kind, turn, grouped=True)
+
+            if ledger.event_log is not None:
+                for amount, source, destination in zip(self.__amounts, self.__sources, self.__destinations):
+                    ledger.event_log.on_payment(source, destination, amount, self.__kind)
+
+        for player, new_cash in zip(players, after.tolist()):
+            player.cash = new_cash
+
+        self.__settled = True
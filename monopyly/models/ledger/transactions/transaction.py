@@ -1,3 +1,4 @@
+import time
 from datetime import datetime
 from typing import Optional
 
@@ -6,49 +7,87 @@ from monopyly.models.player import Player
 
 class Transaction:
     """Class representing a single financial transaction."""
+    KIND = 'transfer'
+
     def __init__(self,
                  amount: int,
                  source: Optional['Player'],
                  destination: Optional['Player'],
                  description: str = ""):
-        self.__settled_at = None
+        self.__description = None
+        self.__settled_at  = None
 
         self.amount = amount
         self.source = source
         self.destination = destination
         self.description = description
-        self.__invoice_created_at = datetime.now()
+        self.__invoice_created_at = time.time_ns()
 
     @property
     def description(self):
         return self.__description
 
+    @description.setter
+    def description(self, new: str):
+        self.__description = new
+
     @property
-    def invoice_created_at(self):
-        return self.__invoice_created_at
+    def invoice_created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.__invoice_created_at / 1e9)
 
     @property
     def pending(self):
         return not self.settled
 
+    @property
+    def property_key(self):
+        """The property the transaction is about, if any."""
+        return None
+
     @property
     def settled(self):
-        return self.settled_at is not None
+        return self.__settled_at is not None
 
     @property
-    def settled_at(self):
-        return self.__settled_at
+    def settled_at(self) -> Optional[datetime]:
+        if self.__settled_at is None:
+            return None
+
+        return datetime.fromtimestamp(self.__settled_at / 1e9)
+
+    def commit(self, ledger: Optional['Ledger'] = None, turn: int = 0):
+        """
+        Move the money and mark the transaction as settled.
+
+        Parameters:
+            ledger (Optional[Ledger]):
+                If given, the transaction is recorded in it.
 
-    def commit(self):
-        if self.amount and isinstance(self.destination, Player):
-            self.source.cash -= self.amount
-            self.destination.cash += self.amount
-            self.__settled_at = datetime.now()
+            turn (int):
+                The turn to record the transaction under.
+        """
+        if self.settled:
+            raise ValueError('Transaction has already been settled.')
+
+        # Record first: if the ledger refuses the entry, no cash has moved.
+        if ledger is not None:
+            ledger.append(self.amount, self.source, self.destination, self.KIND, turn, self.property_key)
+
+        if self.amount:
+            if isinstance(self.source, Player):
+                self.source.cash -= self.amount
+
+            if isinstance(self.destination, Player):
+                self.destination.cash += self.amount
+
+        if ledger is not None and ledger.event_log is not None:
+            ledger.event_log.on_payment(self.source, self.destination, self.amount, self.KIND)
+
+        self.__settled_at = time.time_ns()
 
     def __str__(self):
         source_name = self.source.name if self.source else "Bank"
         destination_name = self.destination.name if self.destination else "Bank"
         return (
-            f"[{self.timestamp}] {source_name} -> {destination_name}: {self.amount} ({self.description})"
+            f"[{self.invoice_created_at}] {source_name} -> {destination_name}: {self.amount} ({self.description})"
         )
-
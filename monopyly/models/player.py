@@ -1,24 +1,64 @@
+class Player:
+    """
+    A player: a view onto one row of a `PlayerTable`.
 
+    Parameters:
+        table (Optional[PlayerTable]):
+            The table the player's state is kept in. If not specified, a new row is added to the shared table.
 
-class Player:
-    def __init__(self):
-        self.__name          = None
-        self.__token         = None
-        self.__cash          = 0
-        self.__real_estate   = []
-        self.__immunities    = []
-        self.__debt          = 0
-        self.__special_cards = []
+        row (Optional[int]):
+            The player's row in the table. If not specified, a new row is added, which is freed for reuse when the
+            player is garbage collected.
+
+    Copying or pickling a player copies only their own row, into a new row of the shared table.
+    """
+    __slots__ = ('__table', '__row', '__weakref__')
+
+    def __init__(self, table: 'Optional[PlayerTable]' = None, row: 'Optional[int]' = None):
+        if table is None:
+            # Imported here rather than at the top: the table module (and the lazy-import machinery it loads NumPy
+            # through) would take this module well past its import budget.
+            from monopyly.models.player_table import PlayerTable
+
+            table = PlayerTable.shared()
+
+        owned = row is None
+
+        if owned:
+            row = table.add()
+
+        self.__table = table
+        self.__row   = row
+
+        table._register_view(row, self, owned)
+
+    def __reduce__(self):
+        return Player._from_row, (self.__table._dump_row(self.__row),)
+
+    @classmethod
+    def _from_row(cls, state: dict) -> 'Player':
+        player = cls()
+        player.__table._load_row(player.__row, state)
+
+        return player
+
+    @property
+    def table(self) -> 'PlayerTable':
+        return self.__table
+
+    @property
+    def row(self) -> int:
+        return self.__row
 
     @property
     def name(self) -> str:
-        return self.__name
+        return self.__table.names[self.__row]
 
     @name.setter
     def name(self, name: str) -> None:
-        if self.__name is None:
+        if self.name is None:
             if isinstance(name, str):
-                self.__name = name
+                self.__table.names[self.__row] = name
             else:
                 raise TypeError(f"Name must be a string, not '{type(name)}'!")
 
@@ -27,5 +67,38 @@ class Player:
 
     @property
     def token(self) -> str:
-        return self.__token
+        return self.__table.tokens[self.__row]
+
+    @property
+    def cash(self) -> int:
+        return int(self.__table.cash[self.__row])
+
+    @cash.setter
+    def cash(self, new: int) -> None:
+        if not isinstance(new, int):
+            raise TypeError(f"Cash must be an integer, not '{type(new)}'!")
+
+        self.__table.cash[self.__row] = new
+
+    @property
+    def debt(self) -> int:
+        return int(self.__table.debt[self.__row])
 
+    @debt.setter
+    def debt(self, new: int) -> None:
+        if not isinstance(new, int):
+            raise TypeError(f"Debt must be an integer, not '{type(new)}'!")
+
+        self.__table.debt[self.__row] = new
+
+    @property
+    def real_estate(self) -> list:
+        return self.__table.collection('real_estate', self.__row)
+
+    @property
+    def immunities(self) -> list:
+        return self.__table.collection('immunities', self.__row)
+
+    @property
+    def special_cards(self) -> list:
+        return self.__table.collection('special_cards', self.__row)
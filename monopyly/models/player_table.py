@@ -0,0 +1,393 @@
+from copy import deepcopy
+from typing import Iterable, Optional, Union
+from weakref import KeyedRef
+
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+NO_GAME = -1
+"""The game id of players that are not in a game."""
+
+NO_SEAT = -1
+"""The seat of players that are not in a game."""
+
+
+class PlayerTable:
+    """
+    The state of many players, stored column by column.
+
+    Cash, debt, game id and seat are NumPy columns indexed by row; names and tokens are plain lists, and the
+    collections a player only sometimes has (deeds, immunities, special cards) are kept only for the rows that have
+    them. A `Player` is a small view onto one row, created when it is first asked for, so a table can hold millions of
+    simulated players, at 23 bytes of column storage each (plus a name, token and view slot), and work on all of them
+    at once: ranking, finding who is insolvent, fining whole games.
+
+    A row added by creating a `Player` without one belongs to that player: when the player is garbage collected, the
+    row is cleared and reused by the next `add`. Rows added with `add` or `add_many` stay until the table goes.
+
+    A live view costs about 150 bytes on top of its row: the view itself and the weak reference in its slot that the
+    table finds it through, so a player created with `Player()` comes to about 300 bytes in all. Use `add_many` for
+    large numbers of players, and only ask for the views you need.
+
+    Parameters:
+        capacity (int):
+            The number of rows to allocate room for initially. The columns grow as needed.
+
+    Example:
+        >>> table = PlayerTable()
+        >>> rows = table.add_many(4, cash=1500, game=0)
+        >>> table.fine(table.rows_in_games([0]), 50)
+        >>> table.insolvent()
+        array([], dtype=int64)
+    """
+    INITIAL_CAPACITY = 64
+
+    __shared = None
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        capacity = max(1, capacity)
+
+        self.__size  = 0
+        self.__cash  = np.zeros(capacity, dtype=np.int64)
+        self.__debt  = np.zeros(capacity, dtype=np.int64)
+        self.__game  = np.full(capacity, NO_GAME, dtype=np.int32)
+        self.__seat  = np.full(capacity, NO_SEAT, dtype=np.int16)
+        self.__owned = np.zeros(capacity, dtype=np.bool_)
+
+        self.__names  = []
+        self.__tokens = []
+
+        self.__real_estate   = {}
+        self.__immunities    = {}
+        self.__special_cards = {}
+
+        self.__views = []
+        self.__free  = []
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __getitem__(self, row: int) -> 'Player':
+        return self.player(row)
+
+    def __deepcopy__(self, memo: dict) -> 'PlayerTable':
+        table = memo[id(self)] = PlayerTable.__new__(PlayerTable)
+
+        for name in ('size', 'cash', 'debt', 'game', 'seat', 'owned', 'names', 'tokens', 'real_estate', 'immunities',
+                     'special_cards', 'free'):
+            attr = f'_PlayerTable__{name}'
+            setattr(table, attr, deepcopy(getattr(self, attr), memo))
+
+        # Weak references cannot be copied; the live views get copies that look at the same rows of the copy.
+        from monopyly.models.player import Player
+
+        table.__views = [None] * len(self.__views)
+
+        for row, ref in enumerate(self.__views):
+            view = None if ref is None else ref()
+
+            if view is not None:
+                memo[id(view)] = Player(table=table, row=row)
+
+        return table
+
+    @classmethod
+    def shared(cls) -> 'PlayerTable':
+        """
+        The table that players created without one are added to.
+
+        Their rows are reused once they are dropped, so the table only grows to the most such players alive at once.
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
+
+        return cls.__shared
+
+    @property
+    def cash(self) -> 'np.ndarray':
+        return self.__cash[:self.__size]
+
+    @property
+    def debt(self) -> 'np.ndarray':
+        return self.__debt[:self.__size]
+
+    @property
+    def games(self) -> 'np.ndarray':
+        return self.__game[:self.__size]
+
+    @property
+    def names(self) -> list[Optional[str]]:
+        return self.__names
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes the NumPy columns take up, including spare capacity."""
+        return (
+            self.__cash.nbytes + self.__debt.nbytes + self.__game.nbytes + self.__seat.nbytes + self.__owned.nbytes
+        )
+
+    @property
+    def seats(self) -> 'np.ndarray':
+        return self.__seat[:self.__size]
+
+    @property
+    def tokens(self) -> list[Optional[str]]:
+        return self.__tokens
+
+    def __reserve(self, extra: int):
+        needed = self.__size + extra
+
+        if needed <= len(self.__cash):
+            return
+
+        capacity = len(self.__cash)
+        while capacity < needed:
+            capacity *= 2
+
+        for name, fill in (('cash', 0), ('debt', 0), ('game', NO_GAME), ('seat', NO_SEAT), ('owned', False)):
+            attr   = f'_PlayerTable__{name}'
+            column = getattr(self, attr)
+            grown  = np.full(capacity, fill, dtype=column.dtype)
+            grown[:self.__size] = column[:self.__size]
+            setattr(self, attr, grown)
+
+    def add(self, name: Optional[str] = None, cash: int = 0, game: int = NO_GAME, seat: int = NO_SEAT) -> int:
+        """
+        Add a player.
+
+        Returns:
+            int:
+                The player's row.
+        """
+        if not self.__free:
+            return int(self.add_many(1, cash, game, seat, None if name is None else [name])[0])
+
+        row = self.__free.pop()
+
+        self.__owned[row] = False
+        self.__cash[row]  = cash
+        self.__game[row]  = game
+        self.__seat[row]  = seat
+        self.__names[row] = name
+
+        return row
+
+    def add_many(
+            self,
+            n:     int,
+            cash:  Union[int, 'np.ndarray'] = 0,
+            game:  Union[int, 'np.ndarray'] = NO_GAME,
+            seat:  Union[int, 'np.ndarray'] = NO_SEAT,
+            names: Optional[Iterable[str]] = None
+    ) -> 'np.ndarray':
+        """
+        Add many players at once, without creating a `Player` for any of them.
+
+        Parameters:
+            n (int):
+                The number of players.
+
+            cash, game, seat (Union[int, numpy.ndarray]):
+                The starting cash, game id and seat of each player, or one value for all of them.
+
+            names (Optional[Iterable[str]]):
+                The players' names. If not specified, they have none.
+
+        Returns:
+            numpy.ndarray:
+                The new rows.
+        """
+        if n < 0:
+            raise ValueError('Cannot add a negative number of players.')
+
+        self.__reserve(n)
+
+        start, end = self.__size, self.__size + n
+
+        self.__cash[start:end] = cash
+        self.__debt[start:end] = 0
+        self.__game[start:end] = game
+        self.__seat[start:end] = seat
+        self.__owned[start:end] = False
+
+        names = [None] * n if names is None else list(names)
+        if len(names) != n:
+            raise ValueError(f'Expected {n} names, got {len(names)}.')
+
+        self.__names.extend(names)
+        self.__tokens.extend([None] * n)
+        self.__views.extend([None] * n)
+        self.__size = end
+
+        return np.arange(start, end)
+
+    def player(self, row: int) -> 'Player':
+        """
+        Get the `Player` view of a row.
+
+        The same view is returned for as long as anything holds on to it, so players can be compared with `is`.
+        """
+        if not 0 <= row < self.__size:
+            raise IndexError(f'No player in row {row}.')
+
+        ref  = self.__views[row]
+        view = None if ref is None else ref()
+
+        if view is None:
+            from monopyly.models.player import Player
+
+            view = Player(table=self, row=row)
+
+        return view
+
+    def _register_view(self, row: int, view: 'Player', owned: bool = False):
+        # One weak reference per view, both to find it again and to hear when it goes.
+        self.__views[row] = KeyedRef(view, self.__collected, row)
+
+        if owned:
+            self.__owned[row] = True
+
+    def _dump_row(self, row: int) -> dict:
+        """Get everything stored for a row, such as for copying or pickling its player."""
+        return {
+            'name':          self.__names[row],
+            'token':         self.__tokens[row],
+            'cash':          int(self.__cash[row]),
+            'debt':          int(self.__debt[row]),
+            'game':          int(self.__game[row]),
+            'seat':          int(self.__seat[row]),
+            'real_estate':   list(self.__real_estate.get(row, ())),
+            'immunities':    list(self.__immunities.get(row, ())),
+            'special_cards': list(self.__special_cards.get(row, ())),
+        }
+
+    def _load_row(self, row: int, state: dict):
+        """Overwrite a row with what `_dump_row` returned."""
+        self.__names[row]  = state['name']
+        self.__tokens[row] = state['token']
+        self.__cash[row]   = state['cash']
+        self.__debt[row]   = state['debt']
+        self.__game[row]   = state['game']
+        self.__seat[row]   = state['seat']
+
+        for kind in ('real_estate', 'immunities', 'special_cards'):
+            store = self.__collections(kind)
+
+            if state[kind]:
+                store[row] = list(state[kind])
+            else:
+                store.pop(row, None)
+
+    def __collected(self, ref: KeyedRef):
+        row = ref.key
+
+        # A newer view of the row may have been registered since this one was.
+        if self.__views[row] is not ref:
+            return
+
+        self.__views[row] = None
+
+        if self.__owned[row]:
+            self.__release(row)
+
+    def __release(self, row: int):
+        # The player that owned the row is gone; clear the row for reuse.
+        self.__owned[row]  = False
+        self.__cash[row]   = 0
+        self.__debt[row]   = 0
+        self.__game[row]   = NO_GAME
+        self.__seat[row]   = NO_SEAT
+        self.__names[row]  = None
+        self.__tokens[row] = None
+
+        for store in (self.__real_estate, self.__immunities, self.__special_cards):
+            store.pop(row, None)
+
+        self.__free.append(row)
+
+    def collection(self, kind: str, row: int) -> list:
+        """Get one of a row's collections (`real_estate`, `immunities` or `special_cards`), creating it if needed."""
+        store = self.__collections(kind)
+        items = store.get(row)
+
+        if items is None:
+            items = store[row] = []
+
+        return items
+
+    def __collections(self, kind: str) -> dict:
+        if kind == 'real_estate':
+            return self.__real_estate
+
+        if kind == 'immunities':
+            return self.__immunities
+
+        if kind == 'special_cards':
+            return self.__special_cards
+
+        raise ValueError(f'Unknown collection: {kind}.')
+
+    def net_worth(self, assets: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """
+        Get every player's net worth: cash, less debt, plus any other assets.
+
+        Parameters:
+            assets (Optional[numpy.ndarray]):
+                The value of each row's other assets, such as deeds and buildings.
+
+        Returns:
+            numpy.ndarray:
+                The net worth of every row.
+        """
+        worth = self.cash - self.debt
+
+        return worth if assets is None else worth + assets
+
+    def rank(self, rows: Optional['np.ndarray'] = None, assets: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """
+        Rank players by net worth, richest first.
+
+        Parameters:
+            rows (Optional[numpy.ndarray]):
+                The rows to rank. If not specified, every row is ranked.
+
+            assets (Optional[numpy.ndarray]):
+                The value of each row's other assets; see `net_worth`.
+
+        Returns:
+            numpy.ndarray:
+                The rows, richest first. Ties keep row order.
+        """
+        worth = self.net_worth(assets)
+        rows  = np.arange(self.__size) if rows is None else np.asarray(rows)
+
+        return rows[np.argsort(-worth[rows], kind='stable')]
+
+    def insolvent(self, rows: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """Get the rows (of those given, or of every row) with less than zero cash."""
+        if rows is None:
+            return np.flatnonzero(self.cash < 0)
+
+        rows = np.asarray(rows)
+
+        return rows[self.cash[rows] < 0]
+
+    def rows_in_games(self, games: Iterable[int]) -> 'np.ndarray':
+        """Get the rows of every player in any of the given games."""
+        return np.flatnonzero(np.isin(self.games, np.fromiter(games, dtype=np.int32)))
+
+    def fine(self, rows: 'np.ndarray', amount: Union[int, 'np.ndarray']):
+        """
+        Take money from many players at once.
+
+        Parameters:
+            rows (numpy.ndarray):
+                The rows to fine. A row listed more than once is fined once for each time it appears.
+
+            amount (Union[int, numpy.ndarray]):
+                The fine, for all of them or for each row.
+        """
+        np.subtract.at(self.__cash, np.asarray(rows), amount)
@@ -1,3 +1,5 @@
+from typing import Callable, Optional
+
 from monopyly.models.player import Player
 from monopyly.models.deeds.deed import PropertyDeed
 
@@ -43,44 +45,51 @@ class DevelopmentRestriction:
             barring:        str = 'all',
             turn_counter:   'TurnCounter' = None
     ):
-        self.__barring = None
+        self.__barring         = None
+        self.__effect          = None
         self.__favored_player  = None
+        self.__lifted          = False
+        self.__on_end          = None
+        self.__scheduler       = None
         self.__target_property = None
         self.__turn_counter    = None
         self.__total_turns     = None
-        self.__turns_remaining           = None
-        self.__turns_passed    = None
+
+        if not isinstance(turns, int) or turns < 0:
+            raise ValueError("Turns must be a non-negative integer.")
 
         self.favored_player  = favored_player
         self.target_property = target_deed
-        self.__total_turns           = turns
-        self.barring       = barring
+        self.__total_turns   = turns
+        self.barring         = barring
 
-
-        barring:        str = 'all'  # Houses, hotels, all
-        turns:          int = 0
-        reason:         str = None
+        if turn_counter is not None:
+            self.turn_counter = turn_counter
 
     @property
     def active(self) -> bool:
         """
         Returns whether the restriction is active.
 
-        If the restriction has a turn count, and it's greater than zero, the restriction is active.
+        A restriction is active until the favored player has taken as many turns as it lasts, or until it is lifted.
 
         Returns:
              bool:
                 True if the restriction is active, False otherwise.
         """
-        if self.turns is not None and self.turns > 0:
-            return True
-
-        return False
+        return not self.__lifted and self.turns_remaining > 0
 
     @property
     def barring(self) -> str:
         return self.__barring
 
+    @barring.setter
+    def barring(self, new: str):
+        if new not in self.TYPES_OF_BARRING:
+            raise ValueError(f"Barring must be one of {self.TYPES_OF_BARRING}.")
+
+        self.__barring = new
+
     @property
     def barred_player(self) -> Player:
         if not self.target_property:
@@ -123,10 +132,12 @@ class DevelopmentRestriction:
 
     @turn_counter.setter
     def turn_counter(self, new: 'TurnCounter'):
+        from monopyly.models.turns.counter import TurnCounter
+
         if self.__turn_counter:
             raise ValueError("Turn counter is already set.")
 
-        if not isinstance(new, 'TurnCounter'):
+        if not isinstance(new, TurnCounter):
             raise ValueError("Turn counter must be a TurnCounter instance.")
 
         self.__turn_counter = new
@@ -137,25 +148,64 @@ class DevelopmentRestriction:
     def total_turns(self) ->int:
         return self.__total_turns
 
+    @property
+    def turns_passed(self) -> int:
+        return self.total_turns - self.turns_remaining
+
     @property
     def turns_remaining(self) -> int:
-        return self.__turns_remaining
-
-    def __decrement_turn(self):
-        if self.turns_remaining > 0 and self.active:
-            self.__turns_remaining -= 1
-            self.__turns_passed += 1
-            
-    def process_turn(self, turn_counter: 'TurnCounter'):
-        from monopyly.models.turns.counter import TurnCounter
+        """The number of the favored player's turns left before the restriction expires."""
+        if self.__lifted:
+            return 0
 
-        if not isinstance(turn_counter, TurnCounter):
-            raise ValueError('"turn_counter" myst be a TurnCounter object')
+        if self.__effect is None:
+            return self.total_turns
 
-        tc = turn_counter
-        
-        if self.active and tc.current_player is self.favored_player:
-            self.__decrement_turn()
+        return self.__scheduler.turns_remaining(self.__effect)
+
+    def lift(self):
+        """End the restriction early."""
+        if self.__effect is not None:
+            self.__effect.cancel()
+
+        self.__expire()
+
+    def schedule(
+            self,
+            scheduler: 'EffectScheduler',
+            on_end:    Optional[Callable[[], None]] = None,
+            turns:     Optional[int] = None
+    ):
+        """
+        Start counting the restriction down on the favored player's turns.
+
+        Parameters:
+            scheduler (EffectScheduler):
+                The scheduler of the game the restriction applies in.
+
+            on_end (Optional[Callable[[], None]]):
+                Called once, when the restriction expires or is lifted.
+
+            turns (Optional[int]):
+                The number of the favored player's turns left to count down, such as for a restriction restored
+                part way through. Defaults to `total_turns`.
+        """
+        if self.__effect is not None:
+            raise ValueError("Restriction is already scheduled.")
+
+        self.__on_end    = on_end
+        self.__scheduler = scheduler
+        self.__effect    = scheduler.schedule(
+            self.favored_player, self.total_turns if turns is None else turns, self.__expire
+        )
+
+    def __expire(self):
+        self.__lifted = True
+
+        on_end, self.__on_end = self.__on_end, None
+
+        if on_end is not None:
+            on_end()
 
     def register_with_turn_counter(self):
         if not self.turn_counter:
@@ -0,0 +1,346 @@
+"""
+An asyncio facade over a game session, for companion apps.
+
+Every action is a coroutine, and every change it makes is published as an event to the game's subscribers. Each
+subscriber reads from its own bounded queue, so any number of clients can follow any number of games from one event
+loop, without a thread per game.
+
+A subscriber that falls behind either holds the game up (the default; the action that publishes waits until the
+subscriber has room) or, if it subscribed with `overflow='drop_oldest'`, loses its oldest unread events instead.
+
+Example:
+    >>> game = AsyncGameSession(session)
+    >>> async with game.subscribe(kinds={'rent', 'bankrupt'}) as events:
+    ...     async for event in events:
+    ...         print(event)
+"""
+import asyncio
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+
+from monopyly.models.deeds.deed import PropertyDeed
+from monopyly.models.ledger.transactions.transaction import Transaction
+from monopyly.models.player import Player
+
+
+EVENT_KINDS = ('roll', 'turn', 'payment', 'rent', 'transfer', 'bankrupt')
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+DEFAULT_QUEUE_SIZE = 256
+
+
+class CompanionEvent(NamedTuple):
+    kind:    str
+    """One of `EVENT_KINDS`."""
+
+    turn:    int
+    """The number of turns played when the event happened."""
+
+    player:  Optional[Player] = None
+    """The player the event is about: who rolled, whose turn it now is, who paid, who went bankrupt."""
+
+    amount:  int = 0
+    """The amount paid, or the dice total."""
+
+    detail:  object = None
+    """Anything else: the dice, the payee, the deed."""
+
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    One client's stream of events from a game.
+
+    Iterate over it with `async for`. When the game closes, the iteration ends once every queued event has been
+    read; when the subscription itself is closed, it ends straight away.
+
+    Parameters:
+        kinds (Optional[frozenset[str]]):
+            The kinds of event to receive. If not specified, every event is received.
+
+        maxsize (int):
+            The most unread events to hold.
+
+        overflow (str):
+            What to do when the queue is full; one of `OVERFLOW_POLICIES`.
+    """
+    def __init__(
+            self,
+            kinds:    Optional[frozenset[str]] = None,
+            maxsize:  int = DEFAULT_QUEUE_SIZE,
+            overflow: str = 'block'
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'Overflow policy must be one of {OVERFLOW_POLICIES}.')
+
+        if maxsize < 1:
+            raise ValueError('Queue size must be at least one.')
+
+        self.__kinds    = kinds
+        self.__overflow = overflow
+        self.__queue    = asyncio.Queue(maxsize)
+        self.__dropped  = 0
+        self.__closed   = False
+        self.__finished = False
+
+        self.on_close = None
+
+    def __aiter__(self) -> AsyncIterator[CompanionEvent]:
+        return self
+
+    async def __anext__(self) -> CompanionEvent:
+        if self.__closed or (self.__finished and self.__queue.empty()):
+            raise StopAsyncIteration
+
+        event = await self.__queue.get()
+
+        if event is _CLOSED or self.__closed:
+            raise StopAsyncIteration
+
+        return event
+
+    async def __aenter__(self) -> 'Subscription':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed or self.__finished
+
+    @property
+    def dropped(self) -> int:
+        """The number of events lost because the subscriber fell behind."""
+        return self.__dropped
+
+    @property
+    def pending(self) -> int:
+        """The number of unread events."""
+        return self.__queue.qsize()
+
+    def wants(self, kind: str) -> bool:
+        return not self.closed and (self.__kinds is None or kind in self.__kinds)
+
+    async def put(self, event: CompanionEvent):
+        """Queue an event, waiting for room or dropping the oldest event, depending on the overflow policy."""
+        if self.__overflow == 'block':
+            await self.__queue.put(event)
+            return
+
+        while self.__queue.full():
+            self.__queue.get_nowait()
+            self.__dropped += 1
+
+        self.__queue.put_nowait(event)
+
+    def close(self):
+        """Stop receiving events, dropping any that have not been read."""
+        if self.__closed:
+            return
+
+        self.__closed = True
+
+        if self.on_close is not None:
+            self.on_close(self)
+
+        # A reader can only be waiting on an empty queue, and a publisher only on a full one. Wake whichever it is:
+        # the reader with an end marker, the publisher by emptying the queue.
+        if self.__queue.empty():
+            self.__queue.put_nowait(_CLOSED)
+            return
+
+        while not self.__queue.empty():
+            self.__queue.get_nowait()
+
+    def finish(self):
+        """End the stream once the events already queued have been read. Called when the game closes."""
+        if self.closed:
+            return
+
+        self.__finished = True
+
+        if self.on_close is not None:
+            self.on_close(self)
+
+        # A reader can only be waiting on an empty queue, so that is the only time it needs waking with an end
+        # marker; otherwise it stops once it has read what is left.
+        if not self.__queue.full():
+            self.__queue.put_nowait(_CLOSED)
+
+
+class AsyncGameSession:
+    """
+    Awaitable actions on a game, with event streams for its observers.
+
+    Actions on one game are serialized by a lock, so concurrent clients never interleave inside an action. The
+    wrapped session is still an ordinary `GameSession`; anything done to it directly is not published.
+
+    Parameters:
+        session (GameSession):
+            The game.
+    """
+    def __init__(self, session: 'GameSession'):
+        self.__session       = session
+        self.__subscriptions = set()
+        self.__lock          = asyncio.Lock()
+        self.__turn          = 0
+        self.__closed        = False
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    @property
+    def session(self) -> 'GameSession':
+        return self.__session
+
+    @property
+    def subscribers(self) -> int:
+        return len(self.__subscriptions)
+
+    @property
+    def turn(self) -> int:
+        """The number of turns played through the facade."""
+        return self.__turn
+
+    def subscribe(
+            self,
+            kinds:    Optional[Iterable[str]] = None,
+            maxsize:  int = DEFAULT_QUEUE_SIZE,
+            overflow: str = 'block'
+    ) -> Subscription:
+        """
+        Start receiving the game's events.
+
+        Parameters:
+            kinds (Optional[Iterable[str]]):
+                The kinds of event to receive (see `EVENT_KINDS`). If not specified, every event is received.
+
+            maxsize (int):
+                The most unread events to hold.
+
+            overflow (str):
+                `'block'` to hold the game up until there is room, or `'drop_oldest'` to lose the oldest unread
+                events instead.
+
+        Returns:
+            Subscription:
+                The event stream.
+        """
+        if self.__closed:
+            raise ValueError('Game is closed.')
+
+        if kinds is not None:
+            kinds = frozenset(kinds)
+            unknown = kinds.difference(EVENT_KINDS)
+
+            if unknown:
+                raise ValueError(f'Unknown event kinds: {", ".join(sorted(unknown))}.')
+
+        subscription = Subscription(kinds, maxsize, overflow)
+        subscription.on_close = self.__subscriptions.discard
+        self.__subscriptions.add(subscription)
+
+        return subscription
+
+    async def __publish(self, kind: str, player: Optional[Player] = None, amount: int = 0, detail: object = None):
+        event = CompanionEvent(kind, self.__turn, player, amount, detail)
+
+        for subscription in list(self.__subscriptions):
+            if subscription.wants(kind):
+                await subscription.put(event)
+
+    async def roll(self) -> tuple[int, tuple[int, int], bool]:
+        """Roll the game's dice for the current player."""
+        async with self.__lock:
+            result = self.__session.dice.roll()
+            await self.__publish('roll', self.__session.turn_counter.current_player, result[0], result[1])
+
+        return result
+
+    async def next_turn(self) -> Player:
+        """
+        Move on to the next player.
+
+        Returns:
+            Player:
+                The player whose turn it now is.
+        """
+        async with self.__lock:
+            counter = self.__session.turn_counter
+            counter.next_turn()
+            self.__turn += 1
+            self.__session.touch()
+
+            player = counter.current_player
+            await self.__publish('turn', player, detail=counter.current_turn)
+
+        return player
+
+    async def pay(
+            self,
+            source:      Optional[Player],
+            destination: Optional[Player],
+            amount:      int,
+            description: str = ''
+    ) -> Transaction:
+        """
+        Move money between players, or between a player and the bank (None).
+
+        Returns:
+            Transaction:
+                The settled transaction.
+        """
+        async with self.__lock:
+            transaction = Transaction(amount, source, destination, description)
+            transaction.commit(self.__session.ledger, self.__turn)
+            await self.__publish('payment', source, amount, destination)
+
+        return transaction
+
+    async def charge_rent(self, deed: PropertyDeed, payer: Player, dice_total: Optional[int] = None):
+        """
+        Charge a player rent for landing on a deed.
+
+        Returns:
+            Optional[RentTransaction]:
+                The settled payment, or None if no rent was owed.
+        """
+        async with self.__lock:
+            kwargs = {} if dice_total is None else {'dice_total': dice_total}
+            transaction = deed.charge_rent(payer, ledger=self.__session.ledger, turn=self.__turn, **kwargs)
+
+            if transaction is not None:
+                await self.__publish('rent', payer, transaction.amount, deed)
+
+        return transaction
+
+    async def transfer(self, deed: PropertyDeed, new_owner: Optional[Player], price_paid: Optional[int] = None):
+        """Hand a deed to a new owner (or back to the bank)."""
+        async with self.__lock:
+            deed.transfer(new_owner, price_paid)
+            await self.__publish('transfer', new_owner, deed.last_purchase_price, deed)
+
+    async def bankrupt(self, player: Player, creditor: Optional[Player] = None) -> list[PropertyDeed]:
+        """
+        Take a player out of the game, handing their deeds to their creditor (or the bank).
+
+        Returns:
+            list[PropertyDeed]:
+                The deeds that changed hands.
+        """
+        async with self.__lock:
+            deeds = self.__session.bankrupt(player, creditor)
+            await self.__publish('bankrupt', player, detail=creditor)
+
+        return deeds
+
+    def close(self):
+        """End every subscriber's stream, once they have read what is already queued."""
+        self.__closed = True
+
+        for subscription in list(self.__subscriptions):
+            subscription.finish()
@@ -0,0 +1,453 @@
+"""
+An append-only binary log of everything that happens in a game.
+
+Every event is one fixed-size record, written straight into a memory-mapped file. The file is only synced to disk
+every `sync_every` events (and on `flush`/`close`), so logging costs a `struct.pack_into` on the hot path.
+
+Every `keyframe_interval` turns a full snapshot of the game (see `monopyly.models.session.snapshot`) is appended to
+a companion keyframe file, and a `KEYFRAME` event pointing at it is logged. `replay` restores the nearest keyframe at
+or before the requested turn and applies only the events after it.
+
+Example:
+    >>> log = EventLog('game.events')
+    >>> log.attach(session)
+    >>> ...  # play
+    >>> log.close()
+    >>> replay('game.events', fresh_session, turn=120)
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Optional, Union
+
+from monopyly.models.ledger.ledger import BANK, Ledger
+from monopyly.models.restrictions.development.base import DevelopmentRestriction
+from monopyly.models.session.snapshot import restore_snapshot, take_snapshot
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+MAGIC   = b'MEVL'
+VERSION = 2
+
+ROLL        = 1
+PAYMENT     = 2
+TRANSFER    = 3
+DEVELOP     = 4
+MORTGAGE    = 5
+TURN        = 6
+BANKRUPT    = 7
+RESTRICTION = 8
+KEYFRAME    = 9
+RENT        = 10
+
+EVENT_KINDS = {
+    ROLL:        'roll',
+    PAYMENT:     'payment',
+    TRANSFER:    'transfer',
+    DEVELOP:     'develop',
+    MORTGAGE:    'mortgage',
+    TURN:        'turn',
+    BANKRUPT:    'bankrupt',
+    RESTRICTION: 'restriction',
+    KEYFRAME:    'keyframe',
+    RENT:        'rent',
+}
+"""The name of each event kind, keyed by id."""
+
+HEADER = struct.Struct('<4sHHQ48x')
+"""magic, version, record size, record count."""
+
+RECORD = struct.Struct('<B3xiiiiiq')
+"""kind, turn, actor, target, subject, extra, value."""
+
+KEYFRAME_HEADER = struct.Struct('<qI4x')
+"""turn, snapshot length."""
+
+EVENT_FIELDS = [
+    ('kind',    'u1'),
+    ('_pad',    'V3'),
+    ('turn',    '<i4'),
+    ('actor',   '<i4'),
+    ('target',  '<i4'),
+    ('subject', '<i4'),
+    ('extra',   '<i4'),
+    ('value',   '<i8'),
+]
+"""
+The layout of an event record. What `actor`, `target`, `subject`, `extra` and `value` hold depends on the kind:
+
+- `ROLL`: the two dice, -, the total.
+- `PAYMENT`: payer seat, payee seat (`BANK` for the bank), ledger kind id, -, the amount.
+- `TRANSFER`: new owner seat (`BANK` for the bank), -, deed index, -, the price paid.
+- `DEVELOP`: houses, hotels, deed index, -, -.
+- `MORTGAGE`: 1 if mortgaged, -, deed index, -, the mortgage amount.
+- `TURN`: the new current seat, -, -, -, complete rounds.
+- `BANKRUPT`: the player's seat, -, -, -, -.
+- `RESTRICTION`: favored seat, barring id, deed index, -, the number of turns.
+- `KEYFRAME`: -, -, -, -, the offset of the snapshot in the keyframe file.
+- `RENT`: -, -, deed index, the turn it was collected for, the amount collected.
+
+Every event is stamped with the number of turns logged before it, except `TURN`, which is stamped with the turn it
+finishes (and so is the last event of that turn).
+"""
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def keyframe_path(path: Union[str, Path]) -> Path:
+    """Get the path of the keyframe file that goes with an event log."""
+    path = Path(path)
+
+    return path.with_name(path.name + '.keyframes')
+
+
+class EventLog:
+    """
+    Writes the events of one game to a memory-mapped log file.
+
+    Parameters:
+        path (Union[str, Path]):
+            The log file. It is created, or truncated if it exists.
+
+        keyframe_interval (int):
+            Take a keyframe snapshot every this many turns. Zero disables keyframes after the first.
+
+        sync_every (int):
+            Sync the log to disk every this many events.
+
+        chunk_size (int):
+            The number of bytes the file grows by when it fills up.
+    """
+    def __init__(
+            self,
+            path:              Union[str, Path],
+            keyframe_interval: int = 64,
+            sync_every:        int = 1024,
+            chunk_size:        int = DEFAULT_CHUNK_SIZE
+    ):
+        if keyframe_interval < 0 or sync_every < 1:
+            raise ValueError('Keyframe interval must be non-negative and sync interval positive.')
+
+        chunk_size = max(chunk_size, HEADER.size + RECORD.size)
+        chunk_size -= (chunk_size - HEADER.size) % RECORD.size
+
+        self.__path              = Path(path)
+        self.__chunk_size        = chunk_size
+        self.__keyframe_interval = keyframe_interval
+        self.__sync_every        = sync_every
+
+        self.__file = open(self.__path, 'w+b')
+        self.__file.truncate(chunk_size)
+        self.__map  = mmap.mmap(self.__file.fileno(), chunk_size)
+
+        self.__keyframes = open(keyframe_path(self.__path), 'w+b')
+
+        self.__count    = 0
+        self.__offset   = HEADER.size
+        self.__unsynced = 0
+        self.__turn     = 0
+
+        self.__session = None
+        self.__seats   = {}
+        self.__deeds   = {}
+
+        HEADER.pack_into(self.__map, 0, MAGIC, VERSION, RECORD.size, 0)
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __enter__(self) -> 'EventLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self.__map is None
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    @property
+    def turn(self) -> int:
+        """The number of turns logged so far."""
+        return self.__turn
+
+    def attach(self, session: 'GameSession'):
+        """
+        Start logging a game, beginning with a keyframe of its current state.
+
+        Parameters:
+            session (GameSession):
+                The game.
+        """
+        if self.__session is not None:
+            raise ValueError('Event log is already attached to a game.')
+
+        self.__session = session
+        self.__seats   = {player: seat for seat, player in enumerate(session.turn_counter.players)}
+        self.__deeds   = {deed: index for index, deed in enumerate(session.deeds)}
+
+        for hooked in (session.dice, session.turn_counter, session.ledger, *session.deeds):
+            hooked.event_log = self
+
+        self.keyframe()
+
+    def detach(self):
+        """Stop logging the attached game."""
+        session = self.__session
+
+        if session is None:
+            return
+
+        for hooked in (session.dice, session.turn_counter, session.ledger, *session.deeds):
+            if hooked.event_log is self:
+                hooked.event_log = None
+
+        self.__session = None
+
+    def append(self, kind: int, actor: int = 0, target: int = 0, subject: int = 0, extra: int = 0, value: int = 0):
+        """
+        Write an event at the current turn.
+
+        Parameters:
+            kind (int):
+                One of the event kinds in `EVENT_KINDS`.
+
+            actor, target, subject, extra, value (int):
+                The event's fields; see `EVENT_FIELDS`.
+        """
+        if self.__offset + RECORD.size > len(self.__map):
+            self.__grow()
+
+        RECORD.pack_into(self.__map, self.__offset, kind, self.__turn, actor, target, subject, extra, value)
+
+        self.__offset   += RECORD.size
+        self.__count    += 1
+        self.__unsynced += 1
+
+        if self.__unsynced >= self.__sync_every:
+            self.flush()
+
+    def __grow(self):
+        size = len(self.__map) + self.__chunk_size
+
+        self.__file.truncate(size)
+        self.__map.resize(size)
+
+    def __seat(self, player: Optional['Player']) -> int:
+        return BANK if player is None else self.__seats.get(player, BANK)
+
+    def keyframe(self):
+        """Snapshot the attached game into the keyframe file and log where it went."""
+        if self.__session is None:
+            raise ValueError('Event log is not attached to a game.')
+
+        snapshot = take_snapshot(self.__session, ledger_tail=0, sequence=self.__turn)
+        offset   = self.__keyframes.seek(0, os.SEEK_END)
+
+        self.__keyframes.write(KEYFRAME_HEADER.pack(self.__turn, len(snapshot)))
+        self.__keyframes.write(snapshot)
+
+        self.append(KEYFRAME, value=offset)
+
+    def flush(self):
+        """Sync every event written so far, and the keyframes, to disk."""
+        if self.__map is None:
+            return
+
+        HEADER.pack_into(self.__map, 0, MAGIC, VERSION, RECORD.size, self.__count)
+        self.__map.flush()
+
+        self.__keyframes.flush()
+        os.fsync(self.__keyframes.fileno())
+
+        self.__unsynced = 0
+
+    def close(self):
+        """Flush, detach and close the log, trimming the file to the events written."""
+        if self.__map is None:
+            return
+
+        self.detach()
+        self.flush()
+
+        self.__map.close()
+        self.__map = None
+
+        self.__file.truncate(self.__offset)
+        self.__file.close()
+        self.__keyframes.close()
+
+    def on_roll(self, die_1: int, die_2: int):
+        self.append(ROLL, die_1, die_2, value=die_1 + die_2)
+
+    def on_payment(self, source: Optional['Player'], destination: Optional['Player'], amount: int, kind: str):
+        self.append(PAYMENT, self.__seat(source), self.__seat(destination), Ledger.kind_id(kind), value=amount)
+
+    def on_transfer(self, deed: 'PropertyDeed', price_paid: int):
+        self.append(TRANSFER, self.__seat(deed.owner), subject=self.__deeds.get(deed, -1), value=price_paid)
+
+    def on_develop(self, deed: 'PropertyDeed'):
+        self.append(DEVELOP, deed.current_houses, deed.current_hotels, self.__deeds.get(deed, -1))
+
+    def on_mortgage(self, deed: 'PropertyDeed'):
+        self.append(MORTGAGE, int(deed.mortgaged), subject=self.__deeds.get(deed, -1), value=deed.mortgage_amount)
+
+    def on_rent(self, deed: 'PropertyDeed', amount: int, turn: int = 0):
+        self.append(RENT, subject=self.__deeds.get(deed, -1), extra=turn, value=amount)
+
+    def on_bankrupt(self, player: 'Player'):
+        self.append(BANKRUPT, self.__seat(player))
+
+    def on_restriction(self, restriction: DevelopmentRestriction):
+        self.append(
+            RESTRICTION,
+            self.__seat(restriction.favored_player),
+            DevelopmentRestriction.TYPES_OF_BARRING.index(restriction.barring),
+            self.__deeds.get(restriction.target_property, -1),
+            value=restriction.turns_remaining
+        )
+
+    def on_turn(self, counter: 'TurnCounter'):
+        self.__turn += 1
+        self.append(TURN, counter.current_turn, value=counter.total_turns)
+
+        if self.__keyframe_interval and self.__session is not None and not self.__turn % self.__keyframe_interval:
+            self.keyframe()
+
+
+def read_events(path: Union[str, Path]) -> 'np.ndarray':
+    """
+    Map an event log into memory and view its events.
+
+    Only events that were synced to disk are included.
+
+    Parameters:
+        path (Union[str, Path]):
+            The log file.
+
+    Returns:
+        numpy.ndarray:
+            The events, as a structured array with `EVENT_FIELDS`, over the mapped file.
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, record_size, count = HEADER.unpack_from(buffer, 0)
+
+    if magic != MAGIC:
+        raise ValueError(f'{path} is not an event log.')
+
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f'Unsupported event log version {version}.')
+
+    return np.frombuffer(buffer, dtype=np.dtype(EVENT_FIELDS), count=count, offset=HEADER.size)
+
+
+def _read_keyframe(path: Path, offset: int) -> bytes:
+    with open(path, 'rb') as file:
+        file.seek(offset)
+        _, length = KEYFRAME_HEADER.unpack(file.read(KEYFRAME_HEADER.size))
+
+        return file.read(length)
+
+
+def replay(path: Union[str, Path], session: 'GameSession', turn: Optional[int] = None) -> int:
+    """
+    Rebuild the state of a logged game as of the end of a turn.
+
+    The session must have been set up with the same players, in the same seats, and the same deeds, in the same
+    order, and must not have an event log attached.
+
+    Parameters:
+        path (Union[str, Path]):
+            The log file.
+
+        session (GameSession):
+            The game to put into the replayed state.
+
+        turn (Optional[int]):
+            The turn to stop at, counted in turns since the log started. If not specified, every event is replayed.
+
+    Returns:
+        int:
+            The turn the session was left at.
+    """
+    events = read_events(path)
+    kinds  = events['kind']
+    turns  = events['turn']
+
+    if turn is None:
+        turn = int(turns[-1]) if len(events) else 0
+        end  = len(events)
+    else:
+        # Stop after the `TURN` event that finishes the turn, and the keyframe taken right after it, if any. The
+        # events after that are stamped with the same turn but belong to the next one.
+        end = int(np.searchsorted(turns, turn, side='left'))
+
+        if end < len(events) and kinds[end] == TURN:
+            end += 1
+
+        if end < len(events) and kinds[end] == KEYFRAME and turns[end] == turn:
+            end += 1
+
+    keyframes = np.flatnonzero(kinds[:end] == KEYFRAME)
+
+    if not len(keyframes):
+        raise ValueError(f'No keyframe at or before turn {turn}.')
+
+    start = int(keyframes[-1])
+    restore_snapshot(session, _read_keyframe(keyframe_path(path), int(events['value'][start])))
+
+    counter = session.turn_counter
+    seats   = counter.players
+    deeds   = session.deeds
+
+    def player(seat: int) -> Optional['Player']:
+        return None if seat == BANK else seats[seat]
+
+    for kind, _, actor, target, subject, extra, value in events[start + 1:end][
+        ['kind', 'turn', 'actor', 'target', 'subject', 'extra', 'value']
+    ].tolist():
+        if kind == PAYMENT:
+            if actor != BANK:
+                seats[actor].cash -= value
+
+            if target != BANK:
+                seats[target].cash += value
+
+        elif kind == TRANSFER:
+            deeds[subject].owner = player(actor)
+            deeds[subject].last_purchase_price = value
+
+        elif kind == DEVELOP:
+            deeds[subject].current_houses = actor
+            deeds[subject].current_hotels = target
+
+        elif kind == MORTGAGE:
+            deeds[subject].mortgaged       = bool(actor)
+            deeds[subject].mortgage_amount = value
+
+        elif kind == RENT:
+            deeds[subject].collect_rent(value, extra)
+
+        elif kind == TURN:
+            counter.next_turn()
+
+        elif kind == BANKRUPT:
+            counter.bankrupt_player(seats[actor])
+
+        elif kind == RESTRICTION:
+            DevelopmentRestriction(
+                deeds[subject], value, seats[actor], DevelopmentRestriction.TYPES_OF_BARRING[target],
+                turn_counter=counter
+            )
+
+    return turn
@@ -0,0 +1,434 @@
+"""
+Game state that forks in constant time, for lookahead and tree search.
+
+A `GameState` is a handle on immutable, shared structure: the seats are a tuple of `SeatState`, the deeds a short
+tuple of chunks of `DeedRecord`, and the ledger a linked list of entries, newest first. `fork` copies the handle and
+nothing else. A change builds only the path to what it touches: one seat tuple, one deed chunk and the chunk spine,
+or one ledger cell. Everything else stays shared with every other fork. A fork takes about a microsecond, and a branch
+costs memory in proportion to what it changed.
+
+States play by the same simplified rules as `monopyly.models.session.simulation`. Restrictions, immunities and
+special cards are not modelled.
+
+Example:
+    >>> root = session.fork(positions)
+    >>> for dice in ((1, 2), (3, 3), (6, 5)):
+    ...     branch = root.fork()
+    ...     branch.play_turn(*dice)
+    ...     branch.next_turn()
+    ...     evaluate(branch)
+"""
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional, Sequence
+
+from monopyly.models.board.markov import BOARD_SIZE
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.deeds.rent import AVERAGE_DICE_TOTAL, HOTEL, deed_rent
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.models.session.simulation import PASS_GO_SALARY
+
+
+BANK = -1
+"""The seat used for the bank, as a payer, payee or owner."""
+
+NO_DEED = -1
+"""The deed index used for ledger entries that are not about a deed."""
+
+CHUNK_BITS = 3
+CHUNK_SIZE = 1 << CHUNK_BITS
+"""The number of deeds per chunk; changing a deed copies its chunk and the chunk spine."""
+
+
+class SeatState(NamedTuple):
+    cash:     int
+    position: int = 0
+    active:   bool = True
+
+
+class DeedRecord(NamedTuple):
+    owner:     int = BANK
+    houses:    int = 0
+    hotels:    int = 0
+    mortgaged: bool = False
+
+    @property
+    def development_level(self) -> int:
+        return HOTEL if self.hotels else min(self.houses, HOTEL - 1)
+
+
+class LedgerEntry(NamedTuple):
+    turn:        int
+    kind:        str
+    source:      int
+    destination: int
+    amount:      int
+    deed:        int = NO_DEED
+
+
+class _Board:
+    """The facts shared by every state played on one deed catalog."""
+    __slots__ = ('specs', 'deed_at', 'groups', 'members')
+
+    def __init__(self, specs: tuple[DeedSpec, ...]):
+        groups  = tuple(spec.color if spec.deed_type == 'street' else spec.deed_type for spec in specs)
+        members = {}
+
+        for index, group in enumerate(groups):
+            members.setdefault(group, []).append(index)
+
+        self.specs   = specs
+        self.deed_at = {spec.space: index for index, spec in enumerate(specs)}
+        self.groups  = groups
+        self.members = {group: tuple(indices) for group, indices in members.items()}
+
+
+@lru_cache(maxsize=8)
+def _board(specs: tuple[DeedSpec, ...]) -> _Board:
+    return _Board(specs)
+
+
+def _chunked(deeds: Sequence[DeedRecord]) -> tuple[tuple[DeedRecord, ...], ...]:
+    return tuple(tuple(deeds[start:start + CHUNK_SIZE]) for start in range(0, len(deeds), CHUNK_SIZE))
+
+
+class GameState:
+    """
+    The state of a game, forkable in constant time.
+
+    Seats are numbered in turn order from 0. The bank is `BANK`, and deeds are numbered in catalog order.
+
+    Parameters:
+        cash (Sequence[int]):
+            The starting cash of each seat.
+
+        specs (Optional[Sequence[DeedSpec]]):
+            The deeds in play. Defaults to the bundled catalog.
+
+        positions (Optional[Sequence[int]]):
+            The board space of each seat. Defaults to GO.
+    """
+    __slots__ = ('__board', '__seats', '__deeds', '__ledger', '__ledger_size', '__current', '__turn')
+
+    def __init__(
+            self,
+            cash:      Sequence[int],
+            specs:     Optional[Sequence[DeedSpec]] = None,
+            positions: Optional[Sequence[int]] = None
+    ):
+        specs     = load_deeds() if specs is None else tuple(specs)
+        positions = positions or [0] * len(cash)
+
+        if len(positions) != len(cash):
+            raise ValueError('Expected one position per seat.')
+
+        self.__board       = _board(specs)
+        self.__seats       = tuple(SeatState(amount, position) for amount, position in zip(cash, positions))
+        self.__deeds       = _chunked([DeedRecord()] * len(specs))
+        self.__ledger      = None
+        self.__ledger_size = 0
+        self.__current     = 0
+        self.__turn        = 0
+
+    @classmethod
+    def from_session(
+            cls,
+            session:   'GameSession',
+            positions: Optional[Sequence[int]] = None,
+            specs:     Optional[Sequence[DeedSpec]] = None,
+            turn:      int = 0
+    ) -> 'GameState':
+        """
+        Capture the state of a live game.
+
+        The session's ledger history is not copied; the state's ledger records only what happens after the capture.
+
+        Parameters:
+            session (GameSession):
+                The game. Its deeds must be in the same order as `specs`.
+
+            positions (Optional[Sequence[int]]):
+                The board space of each seat. Defaults to GO.
+
+            specs (Optional[Sequence[DeedSpec]]):
+                The specs the session's deeds were made from. Defaults to the bundled catalog.
+
+            turn (int):
+                The turn to record ledger entries under from here on.
+
+        Returns:
+            GameState:
+                The state.
+        """
+        counter = session.turn_counter
+        players = counter.players
+        seats   = {player: seat for seat, player in enumerate(players)}
+
+        state = cls([player.cash for player in players], specs, positions)
+        state.__seats = tuple(
+            seat._replace(active=counter.is_active_seat(index)) for index, seat in enumerate(state.__seats)
+        )
+        state.__deeds = _chunked([
+            DeedRecord(seats.get(deed.owner, BANK), deed.current_houses, deed.current_hotels, deed.mortgaged)
+            for deed in session.deeds
+        ])
+        state.__current = counter.current_turn
+        state.__turn    = turn
+
+        return state
+
+    def fork(self) -> 'GameState':
+        """
+        Get an independent copy of the state.
+
+        Nothing is copied up front; the copy shares everything with this state, and changes to either one only ever
+        replace the parts they touch.
+        """
+        fork = GameState.__new__(GameState)
+        fork.__board       = self.__board
+        fork.__seats       = self.__seats
+        fork.__deeds       = self.__deeds
+        fork.__ledger      = self.__ledger
+        fork.__ledger_size = self.__ledger_size
+        fork.__current     = self.__current
+        fork.__turn        = self.__turn
+
+        return fork
+
+    @property
+    def active_count(self) -> int:
+        return sum(seat.active for seat in self.__seats)
+
+    @property
+    def current(self) -> int:
+        """The seat whose turn it is."""
+        return self.__current
+
+    @property
+    def deeds(self) -> tuple[DeedRecord, ...]:
+        return tuple(deed for chunk in self.__deeds for deed in chunk)
+
+    @property
+    def ledger_size(self) -> int:
+        return self.__ledger_size
+
+    @property
+    def seats(self) -> tuple[SeatState, ...]:
+        return self.__seats
+
+    @property
+    def specs(self) -> tuple[DeedSpec, ...]:
+        return self.__board.specs
+
+    @property
+    def turn(self) -> int:
+        """The number of turns played since the state was created or captured."""
+        return self.__turn
+
+    def deed(self, index: int) -> DeedRecord:
+        return self.__deeds[index >> CHUNK_BITS][index & (CHUNK_SIZE - 1)]
+
+    def seat(self, index: int) -> SeatState:
+        return self.__seats[index]
+
+    def __set_deed(self, index: int, deed: DeedRecord):
+        chunks = self.__deeds
+        outer  = index >> CHUNK_BITS
+        inner  = index & (CHUNK_SIZE - 1)
+        chunk  = chunks[outer]
+
+        self.__deeds = chunks[:outer] + (chunk[:inner] + (deed,) + chunk[inner + 1:],) + chunks[outer + 1:]
+
+    def __set_seat(self, index: int, seat: SeatState):
+        seats = self.__seats
+        self.__seats = seats[:index] + (seat,) + seats[index + 1:]
+
+    def __record(self, kind: str, source: int, destination: int, amount: int, deed: int):
+        self.__ledger = (LedgerEntry(self.__turn, kind, source, destination, amount, deed), self.__ledger)
+        self.__ledger_size += 1
+
+    def ledger(self, since: int = 0) -> list[LedgerEntry]:
+        """
+        Get the ledger entries recorded after the first `since`, oldest first.
+
+        Parameters:
+            since (int):
+                The number of entries to skip, such as the `ledger_size` of the state this one was forked from.
+
+        Returns:
+            list[LedgerEntry]:
+                The entries.
+        """
+        entries = []
+        cell    = self.__ledger
+
+        for _ in range(max(self.__ledger_size - since, 0)):
+            entry, cell = cell
+            entries.append(entry)
+
+        entries.reverse()
+
+        return entries
+
+    def holdings(self, seat: int) -> Iterator[int]:
+        """Yield the index of every deed a seat owns."""
+        for index, deed in enumerate(self.deeds):
+            if deed.owner == seat:
+                yield index
+
+    def count(self, seat: int, group: str) -> int:
+        """Get the number of deeds in a group a seat owns."""
+        return sum(self.deed(index).owner == seat for index in self.__board.members.get(group, ()))
+
+    def rent(self, index: int, payer: int = BANK, dice_total: int = AVERAGE_DICE_TOTAL) -> int:
+        """
+        Get the rent a seat landing on a deed would owe.
+
+        Returns:
+            int:
+                The rent. Zero if the deed is unowned, mortgaged or owned by the payer.
+        """
+        deed  = self.deed(index)
+        owner = deed.owner
+
+        if owner == BANK or owner == payer or deed.mortgaged:
+            return 0
+
+        group = self.__board.groups[index]
+        held  = self.count(owner, group)
+
+        return deed_rent(
+            self.__board.specs[index],
+            deed.development_level,
+            monopoly=held == len(self.__board.members[group]),
+            railroads_owned=held,
+            utilities_owned=held,
+            dice_total=dice_total,
+        )
+
+    def pay(self, source: int, destination: int, amount: int, kind: str = 'transfer', deed: int = NO_DEED):
+        """Move money between seats, or between a seat and the bank, and record it."""
+        if source != BANK:
+            seat = self.__seats[source]
+            self.__set_seat(source, seat._replace(cash=seat.cash - amount))
+
+        if destination != BANK:
+            seat = self.__seats[destination]
+            self.__set_seat(destination, seat._replace(cash=seat.cash + amount))
+
+        self.__record(kind, source, destination, amount, deed)
+
+    def transfer(self, index: int, new_owner: int):
+        """Hand a deed to a seat, or back to the bank."""
+        self.__set_deed(index, self.deed(index)._replace(owner=new_owner))
+
+    def buy(self, seat: int, index: int, price: Optional[int] = None):
+        """Buy a deed from the bank, at its listed price unless another is given."""
+        price = self.__board.specs[index].cost if price is None else price
+
+        self.pay(seat, BANK, price, 'purchase', index)
+        self.transfer(index, seat)
+
+    def develop(self, index: int, development_type: str):
+        """Add a house or a hotel to a deed."""
+        if development_type not in ('house', 'hotel'):
+            raise ValueError('Invalid development type.')
+
+        deed = self.deed(index)
+
+        if development_type == 'house':
+            self.__set_deed(index, deed._replace(houses=deed.houses + 1))
+        else:
+            self.__set_deed(index, deed._replace(hotels=deed.hotels + 1))
+
+    def mortgage(self, index: int, mortgaged: bool = True):
+        """Mortgage a deed, or lift its mortgage."""
+        self.__set_deed(index, self.deed(index)._replace(mortgaged=mortgaged))
+
+    def bankrupt(self, seat: int, creditor: int = BANK) -> list[int]:
+        """
+        Take a seat out of the game, handing its deeds to its creditor (or the bank).
+
+        Returns:
+            list[int]:
+                The deeds that changed hands.
+        """
+        self.__set_seat(seat, self.__seats[seat]._replace(active=False))
+
+        deeds = list(self.holdings(seat))
+
+        for index in deeds:
+            self.transfer(index, creditor)
+
+        return deeds
+
+    def next_turn(self) -> int:
+        """
+        Move on to the next seat still in the game.
+
+        Returns:
+            int:
+                The seat whose turn it now is.
+        """
+        seats = self.__seats
+        count = len(seats)
+
+        for step in range(1, count + 1):
+            seat = (self.__current + step) % count
+
+            if seats[seat].active:
+                self.__current = seat
+                break
+
+        self.__turn += 1
+
+        return self.__current
+
+    def play_turn(self, die_1: int, die_2: int) -> Optional[int]:
+        """
+        Play the current seat's turn with the given roll, without moving on to the next seat.
+
+        Follows `monopyly.models.session.simulation.play_turn`: move, collect salary for passing GO, buy an unowned
+        deed if affordable, pay rent on someone else's deed, and go bankrupt if that leaves the seat in debt.
+
+        Returns:
+            Optional[int]:
+                The current seat, if it went bankrupt this turn.
+        """
+        seat  = self.__current
+        state = self.__seats[seat]
+        total = die_1 + die_2
+        space = state.position + total
+
+        if space >= BOARD_SIZE:
+            space -= BOARD_SIZE
+            state  = state._replace(cash=state.cash + PASS_GO_SALARY)
+            self.__record('salary', BANK, seat, PASS_GO_SALARY, NO_DEED)
+
+        self.__set_seat(seat, state._replace(position=space))
+
+        index = self.__board.deed_at.get(space)
+
+        if index is None:
+            return None
+
+        owner = self.deed(index).owner
+
+        if owner == BANK:
+            if state.cash >= self.__board.specs[index].cost:
+                self.buy(seat, index)
+
+            return None
+
+        if owner == seat:
+            return None
+
+        amount = self.rent(index, seat, total)
+
+        if amount:
+            self.pay(seat, owner, amount, 'rent', index)
+
+        if self.__seats[seat].cash < 0:
+            self.bankrupt(seat, owner)
+            return seat
+
+        return None
@@ -0,0 +1,323 @@
+"""
+Thousands of games played in lockstep, as arrays.
+
+Plays by the same simplified rules as `monopyly.models.session.simulation`: players roll two dice, move, collect
+salary for passing GO, buy any deed they land on and can afford, and pay rent on deeds someone else owns; a player who
+cannot pay goes bankrupt and their deeds go to the player they owed. Instead of one `GameSession` per game, the state
+of every game is held in arrays shaped `(games, seats)` and `(games, deeds)`, and each `step` plays one turn of every
+unfinished game in a handful of array operations. Rent comes from the same `RentTable` used for single boards.
+
+How many deeds of each rent group every seat holds is kept up to date as deeds are bought and handed over on
+bankruptcy, so working out rent only looks at the deed each player landed on, never at the whole board.
+
+Example:
+    >>> simulation = LockstepSimulation(10_000, seed=1234)
+    >>> simulation.run(max_turns=500)
+    >>> simulation.winners
+"""
+from typing import Optional, Sequence
+
+from monopyly.models.board.markov import BOARD_SIZE
+from monopyly.models.deeds.rent import UNOWNED, RentTable
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.models.session.simulation import PASS_GO_SALARY
+from monopyly.utils.lazy import lazy_import
+from monopyly.utils.rng import RNGLike, RNGSource
+
+
+np = lazy_import('numpy')
+
+
+DEFAULT_PLAYERS = 4
+DEFAULT_STARTING_CASH = 1500
+
+NO_WINNER = -1
+
+
+class LockstepSimulation:
+    """
+    Many independent games, advanced one turn at a time together.
+
+    Seats are numbered from 0 in every game, and owner ids in `owners` are seat numbers (`UNOWNED` for the bank).
+
+    Parameters:
+        games (int):
+            The number of games.
+
+        players (int):
+            The number of players in each game.
+
+        starting_cash (int):
+            The cash each player starts with.
+
+        seed (RNGLike):
+            The seed or `RNGSource` for the dice.
+
+        specs (Optional[Sequence[DeedSpec]]):
+            The deeds to play with. Defaults to the bundled catalog.
+    """
+    def __init__(
+            self,
+            games:         int,
+            players:       int = DEFAULT_PLAYERS,
+            starting_cash: int = DEFAULT_STARTING_CASH,
+            seed:          RNGLike = None,
+            specs:         Optional[Sequence[DeedSpec]] = None
+    ):
+        if games < 1:
+            raise ValueError('Must simulate at least one game.')
+
+        if not 2 <= players <= 127:
+            raise ValueError('Each game must have between 2 and 127 players.')
+
+        if not isinstance(seed, RNGSource):
+            seed = RNGSource(seed)
+
+        specs = load_deeds() if specs is None else tuple(specs)
+        deeds = len(specs)
+
+        self.__rng        = seed.generator()
+        self.__rent_table = RentTable(specs)
+        self.__prices     = np.array([spec.cost for spec in specs], dtype=np.int64)
+        self.__deed_at    = np.full(BOARD_SIZE, -1, dtype=np.intp)
+        self.__deed_at[[spec.space for spec in specs]] = np.arange(deeds)
+
+        self.__positions   = np.zeros((games, players), dtype=np.int16)
+        self.__cash        = np.full((games, players), starting_cash, dtype=np.int64)
+        self.__active      = np.ones((games, players), dtype=bool)
+        self.__current     = np.zeros(games, dtype=np.intp)
+        self.__next        = np.tile((np.arange(players) + 1) % players, (games, 1))
+        self.__turns       = np.zeros(games, dtype=np.int32)
+        self.__doubles     = np.zeros(games, dtype=np.int32)
+        self.__owners      = np.full((games, deeds), UNOWNED, dtype=np.int8)
+        self.__development = np.zeros((games, deeds), dtype=np.int8)
+        self.__mortgaged   = np.zeros((games, deeds), dtype=bool)
+        self.__holdings    = np.zeros((games, players, self.__rent_table.rent_group_count), dtype=np.int8)
+        self.__rent        = np.zeros(deeds, dtype=np.int64)
+
+        self.__counts = np.full(games, players, dtype=np.int16)
+
+        self.__flat_positions   = self.__positions.reshape(-1)
+        self.__flat_cash        = self.__cash.reshape(-1)
+        self.__flat_next        = self.__next.reshape(-1)
+        self.__flat_owners      = self.__owners.reshape(-1)
+        self.__flat_development = self.__development.reshape(-1)
+        self.__flat_mortgaged   = self.__mortgaged.reshape(-1)
+        self.__flat_holdings    = self.__holdings.reshape(-1)
+
+    def __len__(self) -> int:
+        return len(self.__current)
+
+    @property
+    def active(self) -> 'np.ndarray':
+        """Whether each seat of each game is still in, `(games, seats)`."""
+        return self.__active
+
+    @property
+    def active_counts(self) -> 'np.ndarray':
+        """The number of players left in each game."""
+        return self.__active.sum(axis=1)
+
+    @property
+    def cash(self) -> 'np.ndarray':
+        """The cash of each seat of each game, `(games, seats)`."""
+        return self.__cash
+
+    @property
+    def current(self) -> 'np.ndarray':
+        """The seat whose turn it is in each game."""
+        return self.__current
+
+    @property
+    def development(self) -> 'np.ndarray':
+        """The development level of each deed of each game, `(games, deeds)`."""
+        return self.__development
+
+    @property
+    def doubles(self) -> 'np.ndarray':
+        """The number of doubles rolled in each game."""
+        return self.__doubles
+
+    @property
+    def finished(self) -> 'np.ndarray':
+        """Whether each game is down to its last player."""
+        return self.active_counts <= 1
+
+    @property
+    def holdings(self) -> 'np.ndarray':
+        """
+        The number of deeds of each rent group (see `RentTable.rent_groups`) each seat of each game holds,
+        `(games, seats, rent groups)`.
+        """
+        return self.__holdings
+
+    @property
+    def mortgaged(self) -> 'np.ndarray':
+        """Whether each deed of each game is mortgaged, `(games, deeds)`."""
+        return self.__mortgaged
+
+    @property
+    def owners(self) -> 'np.ndarray':
+        """The seat that owns each deed of each game, or `UNOWNED`, `(games, deeds)`."""
+        return self.__owners
+
+    @property
+    def positions(self) -> 'np.ndarray':
+        """The board space of each seat of each game, `(games, seats)`."""
+        return self.__positions
+
+    @property
+    def rent_by_deed(self) -> 'np.ndarray':
+        """The total rent each deed has collected, over every game."""
+        return self.__rent
+
+    @property
+    def rent_table(self) -> RentTable:
+        return self.__rent_table
+
+    @property
+    def turns(self) -> 'np.ndarray':
+        """The number of turns played in each game."""
+        return self.__turns
+
+    @property
+    def winners(self) -> 'np.ndarray':
+        """The last seat standing in each game, or `NO_WINNER` if the game is not over."""
+        return np.where(self.finished, self.__active.argmax(axis=1), NO_WINNER)
+
+    def step(self, max_turns: Optional[int] = None) -> int:
+        """
+        Play one turn of every unfinished game.
+
+        Parameters:
+            max_turns (Optional[int]):
+                Leave games that have already played this many turns alone.
+
+        Returns:
+            int:
+                The number of games that played a turn.
+        """
+        live = self.__counts > 1
+
+        if max_turns is not None:
+            live &= self.__turns < max_turns
+
+        games = np.flatnonzero(live)
+        n     = len(games)
+
+        if not n:
+            return 0
+
+        players, deed_count = self.__cash.shape[1], self.__owners.shape[1]
+        group_count         = self.__holdings.shape[2]
+
+        # Every per-seat and per-deed array is read and written through flat views with precomputed flat indices, and
+        # each boolean mask is turned into indices once: one-dimensional gathers are several times cheaper than
+        # indexing with a pair of index arrays or with a mask.
+        positions, cash_of  = self.__flat_positions, self.__flat_cash
+        owners_of, holdings = self.__flat_owners, self.__flat_holdings
+
+        # Roll: two dice per game, as `Pair.roll` does.
+        faces  = self.__rng.integers(1, 7, size=(2, n), dtype=np.int16)
+        totals = faces[0] + faces[1]
+        self.__doubles[games] += faces[0] == faces[1]
+
+        # Move, collecting salary for passing GO.
+        seats  = self.__current[games]
+        base   = games * players
+        at     = base + seats
+        spaces = positions[at] + totals
+        passed = spaces >= BOARD_SIZE
+        spaces = np.where(passed, spaces - BOARD_SIZE, spaces)
+
+        positions[at] = spaces
+
+        deeds    = self.__deed_at[spaces]
+        on_deed  = deeds >= 0
+        deeds    = np.maximum(deeds, 0)
+        deed_at  = games * deed_count + deeds
+        owners   = np.where(on_deed, owners_of[deed_at], UNOWNED)
+        cash     = cash_of[at] + passed * PASS_GO_SALARY
+        groups   = self.__rent_table.rent_groups[deeds]
+
+        # Buy unowned deeds the player can afford.
+        prices = self.__prices[deeds]
+        buy    = on_deed & (owners == UNOWNED) & (cash >= prices)
+        cash  -= np.where(buy, prices, 0)
+        buy    = np.flatnonzero(buy)
+
+        cash_of[at] = cash
+        owners_of[deed_at[buy]] = seats[buy]
+        holdings[at[buy] * group_count + groups[buy]] += 1
+
+        # Pay rent on deeds someone else owns.
+        pay = np.flatnonzero(on_deed & (owners != UNOWNED) & (owners != seats))
+
+        if len(pay):
+            payers    = games[pay]
+            landed    = deeds[pay]
+            landed_at = deed_at[pay]
+            payer     = seats[pay]
+            payer_at  = at[pay]
+            creditor  = owners[pay].astype(np.intp)
+            owed_at   = base[pay] + creditor
+            rents     = self.__rent_table.rent_for_holdings(
+                landed,
+                holdings[owed_at * group_count + groups[pay]],
+                self.__flat_development[landed_at],
+                totals[pay]
+            )
+            rents     = np.where(self.__flat_mortgaged[landed_at], 0, rents)
+
+            cash_of[payer_at] -= rents
+            cash_of[owed_at] += rents
+            self.__rent += np.bincount(landed, weights=rents, minlength=len(self.__rent)).astype(np.int64)
+
+            # A player who cannot pay is out, and their deeds go to the player they owed.
+            broke = cash_of[payer_at] < 0
+
+            if broke.any():
+                out, seat, heir = payers[broke], payer[broke], creditor[broke]
+                held = self.__owners[out] == seat[:, None]
+
+                self.__active[out, seat] = False
+                self.__counts[out] -= 1
+
+                # Link the seat before the bankrupt one (the active seat whose next seat it is) past it. The bankrupt
+                # seat keeps its own link, so the turn still passes on from it.
+                before = ((self.__next[out] == seat[:, None]) & self.__active[out]).argmax(axis=1)
+                self.__next[out, before] = self.__next[out, seat]
+                self.__owners[out] = np.where(held, heir[:, None], self.__owners[out])
+
+                self.__holdings[out, heir] += self.__holdings[out, seat]
+                self.__holdings[out, seat] = 0
+
+        self.__turns[games] += 1
+
+        # Pass the turn to the next seat still in each game.
+        self.__current[games] = self.__flat_next[at]
+
+        return n
+
+    def run(self, max_turns: int = 1000) -> int:
+        """
+        Play every game until one player is left or the turn limit is reached.
+
+        Parameters:
+            max_turns (int):
+                The most turns to play in each game.
+
+        Returns:
+            int:
+                The total number of turns played.
+        """
+        played = 0
+
+        while True:
+            stepped = self.step(max_turns)
+
+            if not stepped:
+                return played
+
+            played += stepped
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from typing import Hashable, Iterator, Optional
+
+from monopyly.models.session.session import GameSession
+
+
+class SessionRegistry:
+    """
+    Holds the live game sessions of a process.
+
+    Sessions are kept in least-recently-used order, so lookups, creation and eviction are all O(1), and idle sessions
+    can be swept from the front without scanning the rest. A registered session moves to the back whenever it is
+    touched, whether through `get` or by the game itself.
+
+    Parameters:
+        max_sessions (Optional[int]):
+            The most sessions to hold at once. When full, creating a session evicts the least recently used one. If
+            not specified, there is no limit.
+
+        idle_timeout (Optional[float]):
+            The number of seconds a session may go untouched before `evict_idle` drops it. If not specified,
+            sessions are never dropped for being idle.
+    """
+    def __init__(self, max_sessions: Optional[int] = None, idle_timeout: Optional[float] = None):
+        if max_sessions is not None and max_sessions < 1:
+            raise ValueError('max_sessions must be at least one.')
+
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError('idle_timeout must be greater than zero.')
+
+        self.__idle_timeout = idle_timeout
+        self.__max_sessions = max_sessions
+        self.__sessions     = OrderedDict()
+
+    def __contains__(self, session_id: Hashable) -> bool:
+        return session_id in self.__sessions
+
+    def __iter__(self) -> Iterator[GameSession]:
+        return iter(list(self.__sessions.values()))
+
+    def __len__(self) -> int:
+        return len(self.__sessions)
+
+    @property
+    def idle_timeout(self) -> Optional[float]:
+        return self.__idle_timeout
+
+    @property
+    def max_sessions(self) -> Optional[int]:
+        return self.__max_sessions
+
+    def add(self, session: GameSession) -> GameSession:
+        """
+        Register an existing session.
+
+        Parameters:
+            session (GameSession):
+                The session to register.
+
+        Returns:
+            GameSession:
+                The session.
+        """
+        if not isinstance(session, GameSession):
+            raise ValueError('session must be a GameSession instance.')
+
+        if session.session_id in self.__sessions:
+            raise ValueError(f'A session with id {session.session_id!r} is already registered.')
+
+        if self.__max_sessions is not None and len(self.__sessions) >= self.__max_sessions:
+            self.__released(self.__sessions.popitem(last=False)[1])
+
+        self.__sessions[session.session_id] = session
+        session.registry = self
+        session.touch()
+
+        return session
+
+    def create(self, *args, **kwargs) -> GameSession:
+        """
+        Create and register a new session.
+
+        Takes the same arguments as `GameSession`.
+
+        Returns:
+            GameSession:
+                The new session.
+        """
+        return self.add(GameSession(*args, **kwargs))
+
+    def evict(self, session_id: Hashable) -> Optional[GameSession]:
+        """
+        Drop a session.
+
+        Parameters:
+            session_id (Hashable):
+                The id of the session to drop.
+
+        Returns:
+            Optional[GameSession]:
+                The session that was dropped, or None if there was no such session.
+        """
+        session = self.__sessions.pop(session_id, None)
+
+        if session is not None:
+            self.__released(session)
+
+        return session
+
+    def evict_idle(self, idle_timeout: Optional[float] = None) -> list[GameSession]:
+        """
+        Drop every session that has been idle for longer than `idle_timeout` seconds.
+
+        Parameters:
+            idle_timeout (Optional[float]):
+                Overrides the registry's idle timeout for this sweep.
+
+        Returns:
+            list[GameSession]:
+                The sessions that were dropped, oldest first.
+        """
+        idle_timeout = idle_timeout if idle_timeout is not None else self.__idle_timeout
+
+        if idle_timeout is None:
+            return []
+
+        evicted = []
+
+        while self.__sessions:
+            session = next(iter(self.__sessions.values()))
+
+            if session.idle_for <= idle_timeout:
+                break
+
+            evicted.append(self.__released(self.__sessions.popitem(last=False)[1]))
+
+        return evicted
+
+    def get(self, session_id: Hashable) -> GameSession:
+        """
+        Look up a session and mark it as active.
+
+        Parameters:
+            session_id (Hashable):
+                The id of the session.
+
+        Returns:
+            GameSession:
+                The session.
+
+        Raises:
+            KeyError:
+                If there is no session with that id.
+        """
+        session = self.__sessions[session_id]
+        session.touch()
+
+        return session
+
+    def __released(self, session: GameSession) -> GameSession:
+        if session.registry is self:
+            session.registry = None
+
+        return session
+
+    def _touched(self, session: GameSession):
+        """Called by a registered session when it is touched."""
+        if self.__sessions.get(session.session_id) is session:
+            self.__sessions.move_to_end(session.session_id)
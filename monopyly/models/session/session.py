@@ -0,0 +1,154 @@
+import time
+from itertools import count
+from typing import Hashable, Optional, Sequence
+
+from monopyly.models.deeds.deed import PropertyDeed
+from monopyly.models.deeds.ownership import OwnershipIndex
+from monopyly.models.dice.die import Die
+from monopyly.models.dice.pair import Pair
+from monopyly.models.ledger.ledger import Ledger
+from monopyly.models.player import Player
+from monopyly.models.session.fork import GameState
+from monopyly.models.turns.counter import TurnCounter
+from monopyly.utils.rng import RNGLike, RNGSource
+
+
+_SESSION_IDS = count(1)
+
+
+class GameSession:
+    """
+    Everything that belongs to one game: its players, deeds, dice, ledger and turn counter.
+
+    Parameters:
+        players (list[Player]):
+            The players, in turn order.
+
+        deeds (Optional[list[PropertyDeed]]):
+            The deeds in play. Any deed not already tracked by an ownership index is tracked by the session's.
+
+        rng (RNGLike):
+            The seed or `RNGSource` for the game's dice. Keep it to replay the game exactly.
+
+        session_id (Optional[Hashable]):
+            The id to register the session under. If not specified, a process-unique integer is used.
+    """
+    def __init__(
+            self,
+            players:    list[Player],
+            deeds:      Optional[list[PropertyDeed]] = None,
+            rng:        RNGLike = None,
+            session_id: Optional[Hashable] = None
+    ):
+        if not isinstance(rng, RNGSource):
+            rng = RNGSource(rng)
+
+        self.__session_id   = next(_SESSION_IDS) if session_id is None else session_id
+        self.__rng          = rng
+        self.__players      = list(players)
+        self.__deeds        = list(deeds or [])
+        self.__ownership    = OwnershipIndex()
+        self.__turn_counter = TurnCounter(self.__players)
+        self.__turn_counter.game_id = self.__session_id
+        self.__dice         = Pair(Die(), Die(), rng=rng)
+        self.__ledger       = Ledger(self.__players)
+        self.__last_active  = time.monotonic()
+
+        self.registry = None
+
+        for deed in self.__deeds:
+            if deed.ownership_index is None:
+                deed.ownership_index = self.__ownership
+
+    def __repr__(self):
+        return f'GameSession(session_id={self.session_id!r}, players={len(self.players)})'
+
+    @property
+    def deeds(self) -> list[PropertyDeed]:
+        return self.__deeds
+
+    @property
+    def dice(self) -> Pair:
+        return self.__dice
+
+    @property
+    def idle_for(self) -> float:
+        """The number of seconds since the session was last touched."""
+        return time.monotonic() - self.__last_active
+
+    @property
+    def last_active(self) -> float:
+        return self.__last_active
+
+    @property
+    def ledger(self) -> Ledger:
+        return self.__ledger
+
+    @property
+    def ownership(self) -> OwnershipIndex:
+        return self.__ownership
+
+    @property
+    def players(self) -> list[Player]:
+        return self.__players
+
+    @property
+    def rng(self) -> RNGSource:
+        return self.__rng
+
+    @property
+    def session_id(self) -> Hashable:
+        return self.__session_id
+
+    @property
+    def turn_counter(self) -> TurnCounter:
+        return self.__turn_counter
+
+    def bankrupt(self, player: Player, creditor: Optional[Player] = None) -> list[PropertyDeed]:
+        """
+        Take a player out of the game, handing their deeds to their creditor.
+
+        Parameters:
+            player (Player):
+                The bankrupt player.
+
+            creditor (Optional[Player]):
+                Who gets the player's deeds. If not specified, they go back to the bank.
+
+        Returns:
+            list[PropertyDeed]:
+                The deeds that changed hands.
+        """
+        self.__turn_counter.bankrupt_player(player)
+
+        return self.__ownership.release(player, creditor)
+
+    def fork(
+            self,
+            positions: Optional[Sequence[int]] = None,
+            specs:     Optional[Sequence['DeedSpec']] = None
+    ) -> GameState:
+        """
+        Capture the game as a `GameState`, for lookahead.
+
+        The capture is the only step that reads the whole game; forking the state from there on is constant time.
+
+        Parameters:
+            positions (Optional[Sequence[int]]):
+                The board space of each seat. Defaults to GO.
+
+            specs (Optional[Sequence[DeedSpec]]):
+                The specs the session's deeds were made from. Defaults to the bundled catalog.
+
+        Returns:
+            GameState:
+                The state.
+        """
+        return GameState.from_session(self, positions, specs)
+
+    def touch(self):
+        """Mark the session as active now, moving it to the back of its registry's eviction order."""
+        self.__last_active = time.monotonic()
+
+        if self.registry is not None:
+            self.registry._touched(self)
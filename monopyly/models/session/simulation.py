@@ -0,0 +1,174 @@
+"""
+A minimal, fast game loop, for simulations and benchmarks.
+
+The rules are simplified: players roll, move, collect salary for passing GO, buy any deed they land on and can
+afford, and pay rent on deeds someone else owns. A player who cannot pay goes bankrupt, and their deeds go to the
+player they owed. Chance, Community Chest, taxes, jail and building are left out.
+
+Without building, rents stay low enough that most games reach the turn limit with several players left; those games
+are scored on net worth (cash plus the listed price of the deeds owned), so every game has a leader.
+"""
+from typing import NamedTuple, Optional, Sequence
+
+from monopyly.models.board.markov import BOARD_SIZE
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.models.ledger.transactions.purchase import PurchaseTransaction
+from monopyly.models.ledger.transactions.transaction import Transaction
+from monopyly.models.player import Player
+
+
+PASS_GO_SALARY = 200
+
+
+class GameResult(NamedTuple):
+    turns:    int
+    """The number of turns played."""
+
+    winner:   Optional[Player]
+    """The last player standing, or None if the turn limit was reached first."""
+
+    bankrupt: int
+    """The number of players who went bankrupt."""
+
+    leader:   Optional[Player] = None
+    """The winner or, if the turn limit was reached first, the player left with the highest net worth."""
+
+
+def play_turn(
+        session:   'GameSession',
+        positions: list[int],
+        board:     dict[int, 'PropertyDeed'],
+        turn:      int = 0
+) -> Optional[Player]:
+    """
+    Play the current player's turn, without advancing to the next player.
+
+    Parameters:
+        session (GameSession):
+            The game.
+
+        positions (list[int]):
+            The board space of each seat; updated in place.
+
+        board (dict[int, PropertyDeed]):
+            The deed on each board space that has one.
+
+        turn (int):
+            The turn to record transactions under.
+
+    Returns:
+        Optional[Player]:
+            The current player, if they went bankrupt this turn.
+    """
+    counter = session.turn_counter
+    ledger  = session.ledger
+    seat    = counter.current_turn
+    player  = counter.players[seat]
+
+    total, _, _ = session.dice.roll()
+    space = positions[seat] + total
+
+    if space >= BOARD_SIZE:
+        space -= BOARD_SIZE
+        Transaction(PASS_GO_SALARY, None, player, 'Passed GO').commit(ledger, turn)
+
+    positions[seat] = space
+    deed = board.get(space)
+
+    if deed is None:
+        return None
+
+    owner = deed.owner
+
+    if owner is None:
+        price = deed.listed_price
+
+        if player.cash >= price:
+            PurchaseTransaction(price, player, None, deed.name).commit(ledger, turn)
+            deed.transfer(player, price)
+
+        return None
+
+    if owner is player:
+        return None
+
+    deed.charge_rent(player, total, ledger, turn)
+
+    if player.cash < 0:
+        session.bankrupt(player, owner)
+        return player
+
+    return None
+
+
+def play_game(
+        session:   'GameSession',
+        max_turns: int = 1000,
+        specs:     Optional[Sequence[DeedSpec]] = None
+) -> GameResult:
+    """
+    Play a game until one player is left or the turn limit is reached.
+
+    Parameters:
+        session (GameSession):
+            The game. Its deeds must be in the same order as `specs`.
+
+        max_turns (int):
+            The most turns to play.
+
+        specs (Optional[Sequence[DeedSpec]]):
+            The specs the session's deeds were made from, for their board spaces. Defaults to the bundled catalog.
+
+    Returns:
+        GameResult:
+            How the game ended.
+    """
+    specs     = load_deeds() if specs is None else specs
+    board     = {spec.space: deed for spec, deed in zip(specs, session.deeds)}
+    counter   = session.turn_counter
+    positions = [0] * len(counter.players)
+    bankrupt  = 0
+    turn      = 0
+
+    while turn < max_turns and counter.active_count > 1:
+        if play_turn(session, positions, board, turn) is not None:
+            bankrupt += 1
+
+            if counter.active_count <= 1:
+                turn += 1
+                break
+
+        counter.next_turn()
+        turn += 1
+
+    winner = next(counter.active_players) if counter.active_count == 1 else None
+    leader = winner if winner is not None else richest_player(session)
+
+    return GameResult(turn, winner, bankrupt, leader)
+
+
+def richest_player(session: 'GameSession') -> Optional[Player]:
+    """
+    Find the player still in the game with the highest net worth: cash plus the listed price of the deeds they own.
+
+    Parameters:
+        session (GameSession):
+            The game.
+
+    Returns:
+        Optional[Player]:
+            The richest player, ties going to the lowest seat, or None if nobody is left.
+    """
+    counter = session.turn_counter
+    assets  = {}
+
+    for deed in session.deeds:
+        owner = deed.owner
+
+        if owner is not None:
+            assets[owner] = assets.get(owner, 0) + deed.listed_price
+
+    players = [player for seat, player in enumerate(counter.players) if counter.is_active_seat(seat)]
+
+    return max(players, key=lambda player: player.cash + assets.get(player, 0), default=None)
@@ -0,0 +1,547 @@
+"""
+Fixed-layout binary snapshots of a game.
+
+A snapshot is a header followed by fixed-size record sections (players, deeds, active development restrictions and
+the tail of the ledger), each starting on an 8-byte boundary. Every section can be read in place as a NumPy
+structured array over the snapshot's buffer, so reading a snapshot from `bytes`, a `memoryview` or an `mmap` copies
+nothing.
+
+A delta snapshot holds only the player and deed records that changed since a base snapshot (each preceded by its
+index), the restrictions in full, and the ledger entries appended since the base. `apply_delta` turns a base and a
+delta back into a full snapshot.
+
+Example:
+    >>> base  = take_snapshot(session)
+    >>> ...
+    >>> delta = diff_snapshots(base, take_snapshot(session, sequence=1))
+    >>> restore_snapshot(session, apply_delta(base, delta))
+"""
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional, Union
+
+from monopyly.models.ledger.ledger import Ledger
+from monopyly.models.restrictions.development.base import DevelopmentRestriction
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+MAGIC   = b'MSNP'
+VERSION = 2
+
+FULL  = 0
+DELTA = 1
+
+NAME_SIZE = 32
+"""The number of bytes kept of each player's (UTF-8 encoded) name."""
+
+NO_OWNER = -1
+"""The owner seat stored for deeds nobody owns."""
+
+NOT_BANKRUPT = -1
+"""The bankruptcy round stored for players still in the game."""
+
+DEFAULT_LEDGER_TAIL = 256
+"""The number of most recent ledger entries a full snapshot keeps."""
+
+HEADER = struct.Struct('<4sHBxIIHHHHH2xiiQI4x')
+"""
+magic, version, kind, sequence, base sequence, players, deeds, restrictions, player records, deed records, padding,
+current turn, total turns, ledger size, ledger records.
+"""
+
+_PLAYER_FIELDS = [
+    ('name',        f'S{NAME_SIZE}'),
+    ('cash',        '<i8'),
+    ('debt',        '<i8'),
+    ('bankrupt_at', '<i4'),
+    ('turns_taken', '<i4'),
+]
+
+_DEED_FIELDS = [
+    ('owner',           '<i2'),
+    ('houses',          'u1'),
+    ('hotels',          'u1'),
+    ('mortgaged',       'u1'),
+    ('_pad',            'V3'),
+    ('mortgage_amount', '<i8'),
+    ('rent_collected',  '<i8'),
+]
+
+_RESTRICTION_FIELDS = [
+    ('deed',            '<u2'),
+    ('favored',         '<u2'),
+    ('barring',         'u1'),
+    ('_pad',            'V3'),
+    ('turns_remaining', '<i4'),
+    ('total_turns',     '<i4'),
+]
+
+_LEDGER_FIELDS = [
+    ('amount',      '<i8'),
+    ('timestamp',   '<i8'),
+    ('source',      '<i4'),
+    ('destination', '<i4'),
+    ('turn',        '<i4'),
+    ('property',    '<i4'),
+    ('group',       '<i4'),
+    ('kind',        'i1'),
+    ('_pad',        'V3'),
+]
+
+
+def _dtype(fields: list) -> 'np.dtype':
+    return np.dtype(fields)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+SnapshotSource = Union[bytes, bytearray, memoryview, mmap.mmap, 'Snapshot']
+
+
+class Snapshot:
+    """
+    A read-only view of a snapshot buffer.
+
+    Nothing is copied; each section is a structured NumPy array over the buffer.
+
+    Parameters:
+        buffer (Union[bytes, bytearray, memoryview, mmap.mmap]):
+            The encoded snapshot.
+    """
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        if len(buffer) < HEADER.size:
+            raise ValueError('Buffer is too small to be a snapshot.')
+
+        (
+            magic, version, kind, sequence, base_sequence, players, deeds, restrictions, player_records,
+            deed_records, current_turn, total_turns, ledger_size, ledger_records
+        ) = HEADER.unpack_from(buffer, 0)
+
+        if magic != MAGIC:
+            raise ValueError('Buffer is not a snapshot.')
+
+        if version != VERSION:
+            raise ValueError(f'Unsupported snapshot version {version}.')
+
+        if kind not in (FULL, DELTA):
+            raise ValueError(f'Unknown snapshot kind {kind}.')
+
+        self.__buffer        = buffer
+        self.__kind          = kind
+        self.__sequence      = sequence
+        self.__base_sequence = base_sequence
+        self.__player_count  = players
+        self.__deed_count    = deeds
+        self.__current_turn  = current_turn
+        self.__total_turns   = total_turns
+        self.__ledger_size   = ledger_size
+
+        offset = HEADER.size
+
+        if kind == DELTA:
+            self.__player_index, offset = self.__section('<u2', player_records, offset)
+            self.__deed_index, offset   = self.__section('<u2', deed_records, offset)
+        else:
+            self.__player_index = self.__deed_index = None
+
+        self.__players, offset      = self.__section(_dtype(_PLAYER_FIELDS), player_records, offset)
+        self.__deeds, offset        = self.__section(_dtype(_DEED_FIELDS), deed_records, offset)
+        self.__restrictions, offset = self.__section(_dtype(_RESTRICTION_FIELDS), restrictions, offset)
+        self.__ledger, offset       = self.__section(_dtype(_LEDGER_FIELDS), ledger_records, offset)
+
+        self.__size = offset
+
+    def __len__(self) -> int:
+        """The number of bytes the snapshot takes up."""
+        return self.__size
+
+    def __section(self, dtype, count: int, offset: int) -> tuple['np.ndarray', int]:
+        dtype = np.dtype(dtype)
+        end   = offset + dtype.itemsize * count
+
+        if end > len(self.__buffer):
+            raise ValueError('Snapshot is truncated.')
+
+        return np.frombuffer(self.__buffer, dtype=dtype, count=count, offset=offset), _aligned(end)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'Snapshot':
+        """
+        Map a snapshot file into memory and view it.
+
+        Parameters:
+            path (Union[str, Path]):
+                The snapshot file.
+
+        Returns:
+            Snapshot:
+                A view over the mapped file.
+        """
+        with open(path, 'rb') as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def base_sequence(self) -> int:
+        """The sequence number of the snapshot a delta applies to. Zero for full snapshots."""
+        return self.__base_sequence
+
+    @property
+    def buffer(self) -> Union[bytes, bytearray, memoryview, mmap.mmap]:
+        return self.__buffer
+
+    @property
+    def current_turn(self) -> int:
+        return self.__current_turn
+
+    @property
+    def deed_count(self) -> int:
+        """The number of deeds in the game (not the number of deed records in a delta)."""
+        return self.__deed_count
+
+    @property
+    def deed_index(self) -> Optional['np.ndarray']:
+        """For a delta, the index of each deed record. None for full snapshots."""
+        return self.__deed_index
+
+    @property
+    def deeds(self) -> 'np.ndarray':
+        return self.__deeds
+
+    @property
+    def is_delta(self) -> bool:
+        return self.__kind == DELTA
+
+    @property
+    def ledger(self) -> 'np.ndarray':
+        """The ledger entries kept in the snapshot, oldest first."""
+        return self.__ledger
+
+    @property
+    def ledger_size(self) -> int:
+        """The total number of entries in the ledger when the snapshot was taken."""
+        return self.__ledger_size
+
+    @property
+    def player_count(self) -> int:
+        """The number of seats in the game (not the number of player records in a delta)."""
+        return self.__player_count
+
+    @property
+    def player_index(self) -> Optional['np.ndarray']:
+        """For a delta, the seat of each player record. None for full snapshots."""
+        return self.__player_index
+
+    @property
+    def players(self) -> 'np.ndarray':
+        return self.__players
+
+    @property
+    def restrictions(self) -> 'np.ndarray':
+        return self.__restrictions
+
+    @property
+    def sequence(self) -> int:
+        return self.__sequence
+
+    @property
+    def total_turns(self) -> int:
+        return self.__total_turns
+
+
+def _as_snapshot(source: SnapshotSource) -> Snapshot:
+    return source if isinstance(source, Snapshot) else Snapshot(source)
+
+
+def _encode(
+        kind:          int,
+        sequence:      int,
+        base_sequence: int,
+        player_count:  int,
+        deed_count:    int,
+        current_turn:  int,
+        total_turns:   int,
+        ledger_size:   int,
+        players:       'np.ndarray',
+        deeds:         'np.ndarray',
+        restrictions:  'np.ndarray',
+        ledger:        'np.ndarray',
+        player_index:  Optional['np.ndarray'] = None,
+        deed_index:    Optional['np.ndarray'] = None
+) -> bytes:
+    sections = [players, deeds, restrictions, ledger]
+
+    if kind == DELTA:
+        sections = [player_index.astype('<u2'), deed_index.astype('<u2')] + sections
+
+    size = HEADER.size
+    for section in sections:
+        size = _aligned(size + section.nbytes)
+
+    out = bytearray(size)
+    HEADER.pack_into(
+        out, 0, MAGIC, VERSION, kind, sequence, base_sequence, player_count, deed_count, len(restrictions),
+        len(players), len(deeds), current_turn, total_turns, ledger_size, len(ledger)
+    )
+
+    view   = memoryview(out)
+    offset = HEADER.size
+
+    for section in sections:
+        view[offset:offset + section.nbytes] = section.tobytes()
+        offset = _aligned(offset + section.nbytes)
+
+    return bytes(out)
+
+
+def _ledger_records(ledger: Ledger, n: int) -> 'np.ndarray':
+    tail    = ledger.tail(n)
+    records = np.zeros(len(tail['amount']), dtype=_dtype(_LEDGER_FIELDS))
+
+    for name, column in tail.items():
+        records[name] = column
+
+    return records
+
+
+def take_snapshot(session: 'GameSession', ledger_tail: int = DEFAULT_LEDGER_TAIL, sequence: int = 0) -> bytes:
+    """
+    Encode the state of a game as a full snapshot.
+
+    Parameters:
+        session (GameSession):
+            The game.
+
+        ledger_tail (int):
+            The number of most recent ledger entries to keep.
+
+        sequence (int):
+            A number identifying the snapshot, such as a checkpoint counter. Deltas record the sequence number of
+            their base.
+
+    Returns:
+        bytes:
+            The snapshot.
+    """
+    counter   = session.turn_counter
+    seats     = counter.players
+    seat_of   = {player: seat for seat, player in enumerate(seats)}
+    deed_of   = {deed: index for index, deed in enumerate(session.deeds)}
+    bankrupt  = counter.bankrupt_players
+    scheduler = counter.scheduler
+
+    players = np.zeros(len(seats), dtype=_dtype(_PLAYER_FIELDS))
+    players['name']        = [(player.name or '').encode('utf-8')[:NAME_SIZE] for player in seats]
+    players['cash']        = [player.cash for player in seats]
+    players['debt']        = [player.debt for player in seats]
+    players['bankrupt_at'] = [
+        NOT_BANKRUPT if counter.is_active_seat(seat) else bankrupt.get(player.name, 0)
+        for seat, player in enumerate(seats)
+    ]
+    players['turns_taken'] = [scheduler.turns_taken(player) for player in seats]
+
+    deeds = np.zeros(len(session.deeds), dtype=_dtype(_DEED_FIELDS))
+    deeds['owner']           = [seat_of.get(deed.owner, NO_OWNER) for deed in session.deeds]
+    deeds['houses']          = [deed.current_houses for deed in session.deeds]
+    deeds['hotels']          = [deed.current_hotels for deed in session.deeds]
+    deeds['mortgaged']       = [deed.mortgaged for deed in session.deeds]
+    deeds['mortgage_amount'] = [deed.mortgage_amount for deed in session.deeds]
+    deeds['rent_collected']  = [deed.total_rent_collected for deed in session.deeds]
+
+    active = [r for r in counter.registered_restrictions if r.target_property in deed_of]
+
+    restrictions = np.zeros(len(active), dtype=_dtype(_RESTRICTION_FIELDS))
+    restrictions['deed']            = [deed_of[r.target_property] for r in active]
+    restrictions['favored']         = [seat_of[r.favored_player] for r in active]
+    restrictions['barring']         = [DevelopmentRestriction.TYPES_OF_BARRING.index(r.barring) for r in active]
+    restrictions['turns_remaining'] = [r.turns_remaining for r in active]
+    restrictions['total_turns']     = [r.total_turns for r in active]
+
+    return _encode(
+        FULL, sequence, 0, len(seats), len(session.deeds), counter.current_turn, counter.total_turns,
+        len(session.ledger), players, deeds, restrictions, _ledger_records(session.ledger, ledger_tail)
+    )
+
+
+def _changed(old: 'np.ndarray', new: 'np.ndarray') -> 'np.ndarray':
+    """The indices of the records that differ, compared byte for byte."""
+    width = new.dtype.itemsize
+    old   = old.view(np.uint8).reshape(-1, width)
+    new   = new.view(np.uint8).reshape(-1, width)
+
+    return np.flatnonzero((old != new).any(axis=1))
+
+
+def diff_snapshots(base: SnapshotSource, current: SnapshotSource) -> bytes:
+    """
+    Encode the changes between two full snapshots of the same game.
+
+    Parameters:
+        base (SnapshotSource):
+            The earlier snapshot.
+
+        current (SnapshotSource):
+            The later snapshot.
+
+    Returns:
+        bytes:
+            A delta snapshot that `apply_delta` can apply to `base`.
+    """
+    base, current = _as_snapshot(base), _as_snapshot(current)
+
+    if base.is_delta or current.is_delta:
+        raise ValueError('Deltas can only be taken between full snapshots.')
+
+    if (base.player_count, base.deed_count) != (current.player_count, current.deed_count):
+        raise ValueError('Snapshots are not of the same game.')
+
+    if current.ledger_size < base.ledger_size:
+        raise ValueError('The current snapshot is older than the base.')
+
+    player_index = _changed(base.players, current.players)
+    deed_index   = _changed(base.deeds, current.deeds)
+    new_entries  = min(current.ledger_size - base.ledger_size, len(current.ledger))
+
+    return _encode(
+        DELTA, current.sequence, base.sequence, current.player_count, current.deed_count, current.current_turn,
+        current.total_turns, current.ledger_size, current.players[player_index], current.deeds[deed_index],
+        current.restrictions, current.ledger[len(current.ledger) - new_entries:], player_index, deed_index
+    )
+
+
+def apply_delta(base: SnapshotSource, delta: SnapshotSource, ledger_tail: int = DEFAULT_LEDGER_TAIL) -> bytes:
+    """
+    Rebuild a full snapshot from a base snapshot and a delta taken against it.
+
+    Parameters:
+        base (SnapshotSource):
+            The full snapshot the delta was taken against.
+
+        delta (SnapshotSource):
+            The delta.
+
+        ledger_tail (int):
+            The number of most recent ledger entries to keep.
+
+    Returns:
+        bytes:
+            The full snapshot.
+    """
+    base, delta = _as_snapshot(base), _as_snapshot(delta)
+
+    if base.is_delta or not delta.is_delta:
+        raise ValueError('Expected a full base snapshot and a delta.')
+
+    if delta.base_sequence != base.sequence:
+        raise ValueError(
+            f'Delta applies to snapshot {delta.base_sequence}, not snapshot {base.sequence}.'
+        )
+
+    players = base.players.copy()
+    players[delta.player_index] = delta.players
+
+    deeds = base.deeds.copy()
+    deeds[delta.deed_index] = delta.deeds
+
+    ledger = np.concatenate((base.ledger, delta.ledger))[-ledger_tail:] if ledger_tail else delta.ledger[:0]
+
+    return _encode(
+        FULL, delta.sequence, 0, delta.player_count, delta.deed_count, delta.current_turn, delta.total_turns,
+        delta.ledger_size, players, deeds, delta.restrictions, ledger
+    )
+
+
+def restore_snapshot(session: 'GameSession', snapshot: SnapshotSource):
+    """
+    Put a game back into the state recorded in a full snapshot.
+
+    The session must have been set up with the same players, in the same seats, and the same deeds, in the same
+    order. The ledger is not rewound; cash balances are restored directly.
+
+    If the session has an event log attached, nothing about the restore itself is logged; the log is detached while
+    the state is put back, then re-attached, which logs a keyframe of the restored state for `replay` to start from.
+
+    Parameters:
+        session (GameSession):
+            The game.
+
+        snapshot (SnapshotSource):
+            The snapshot.
+    """
+    snapshot = _as_snapshot(snapshot)
+
+    if snapshot.is_delta:
+        raise ValueError('Apply a delta to its base snapshot before restoring it.')
+
+    counter = session.turn_counter
+    seats   = counter.players
+
+    if (snapshot.player_count, snapshot.deed_count) != (len(seats), len(session.deeds)):
+        raise ValueError('Snapshot is not of this game.')
+
+    event_log = counter.event_log
+
+    if event_log is not None:
+        event_log.detach()
+
+    try:
+        _restore(session, snapshot)
+    finally:
+        if event_log is not None:
+            event_log.attach(session)
+
+
+def _restore(session: 'GameSession', snapshot: Snapshot):
+    counter = session.turn_counter
+    seats   = counter.players
+    players = snapshot.players
+
+    for player, cash, debt in zip(seats, players['cash'].tolist(), players['debt'].tolist()):
+        player.cash = cash
+        player.debt = debt
+
+    restrictions = {}
+
+    for record in snapshot.restrictions.tolist():
+        deed, favored, barring, _, turns_remaining, total_turns = record
+
+        restriction = DevelopmentRestriction(
+            session.deeds[deed], total_turns, seats[favored], DevelopmentRestriction.TYPES_OF_BARRING[barring]
+        )
+        restrictions[restriction] = turns_remaining
+
+    counter.restore(
+        snapshot.current_turn,
+        snapshot.total_turns,
+        {
+            seats[seat]: int(players['bankrupt_at'][seat])
+            for seat in np.flatnonzero(players['bankrupt_at'] != NOT_BANKRUPT).tolist()
+        },
+        dict(zip(seats, players['turns_taken'].tolist())),
+        restrictions
+    )
+
+    for deed, owner, houses, hotels, mortgaged, mortgage_amount, rent in zip(
+            session.deeds,
+            snapshot.deeds['owner'].tolist(),
+            snapshot.deeds['houses'].tolist(),
+            snapshot.deeds['hotels'].tolist(),
+            snapshot.deeds['mortgaged'].tolist(),
+            snapshot.deeds['mortgage_amount'].tolist(),
+            snapshot.deeds['rent_collected'].tolist()
+    ):
+        new_owner = None if owner == NO_OWNER else seats[owner]
+
+        if deed.owner is not new_owner:
+            deed.owner = new_owner
+
+        deed.mortgaged            = bool(mortgaged)
+        deed.mortgage_amount      = mortgage_amount
+        deed.current_houses       = houses
+        deed.current_hotels       = hotels
+        deed.total_rent_collected = rent
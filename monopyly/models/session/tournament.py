@@ -0,0 +1,359 @@
+"""
+Play many bot-vs-bot games across a process pool.
+
+The deed catalog is packed into shared memory once; each worker decodes it from there when it starts, instead of
+having it pickled into every task. Games are handed out in batches, and each batch comes back as a small NumPy record
+array (plus rent totals by deed) that is folded into the running totals as soon as it arrives, so memory stays flat
+however many games are played.
+
+Every game is seeded from the tournament seed and its own number, so results do not depend on the number of workers
+or the order batches finish in.
+
+Example:
+    >>> results = run_tournament(10_000, processes=8, seed=1234)
+    >>> results.win_rate
+    >>> results.rent_by_deed
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, Union
+
+from monopyly.models.deeds.loader import load_deeds, pack_deeds, specs_from_buffer
+from monopyly.models.deeds.spec import DeedSpec
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+DEFAULT_PLAYERS = 4
+DEFAULT_STARTING_CASH = 1500
+DEFAULT_MAX_TURNS = 1000
+DEFAULT_BATCH_SIZE = 64
+
+NO_WINNER = -1
+
+
+def result_dtype(players: int) -> 'np.dtype':
+    """
+    The record layout of one game's result, for a game of the given number of players.
+
+    `winner` is the seat of the last player standing or, for a game that reached the turn limit first (`finished` is
+    False), of the richest player left.
+    """
+    return np.dtype([
+        ('game',     np.int64),
+        ('winner',   np.int8),
+        ('finished', np.bool_),
+        ('bankrupt', np.int8),
+        ('turns',    np.int32),
+        ('cash',     np.int64, (players,)),
+    ])
+
+
+class TournamentResults:
+    """
+    Running totals over the games of a tournament.
+
+    Parameters:
+        specs (Sequence[DeedSpec]):
+            The deeds the games were played with.
+
+        players (int):
+            The number of players in each game.
+
+        keep_games (bool):
+            Whether to keep every game's result record, as well as the totals.
+    """
+    def __init__(self, specs: Sequence[DeedSpec], players: int, keep_games: bool = False):
+        self.__specs        = tuple(specs)
+        self.__players      = players
+        self.__games        = 0
+        self.__turns        = 0
+        self.__wins         = np.zeros(players, dtype=np.int64)
+        self.__draws        = 0
+        self.__bankruptcies = 0
+        self.__cash         = np.zeros(players, dtype=np.int64)
+        self.__rent         = np.zeros(len(self.__specs), dtype=np.int64)
+        self.__records      = [] if keep_games else None
+
+    @property
+    def cash_by_seat(self) -> 'np.ndarray':
+        """The mean final cash of each seat."""
+        return self.__cash / max(self.__games, 1)
+
+    @property
+    def draws(self) -> int:
+        """The number of games that hit the turn limit with more than one player left, and were won on net worth."""
+        return self.__draws
+
+    @property
+    def games(self) -> int:
+        return self.__games
+
+    @property
+    def mean_turns(self) -> float:
+        return self.__turns / self.__games if self.__games else 0.0
+
+    @property
+    def records(self) -> Optional['np.ndarray']:
+        """Every game's result, in game order, if the results were kept."""
+        if self.__records is None:
+            return None
+
+        if not self.__records:
+            return np.empty(0, dtype=result_dtype(self.__players))
+
+        records = np.concatenate(self.__records)
+
+        return records[np.argsort(records['game'], kind='stable')]
+
+    @property
+    def rent_by_deed(self) -> dict[str, int]:
+        """The total rent each deed collected, over every game."""
+        return {spec.name: int(rent) for spec, rent in zip(self.__specs, self.__rent)}
+
+    @property
+    def wins(self) -> 'np.ndarray':
+        """The number of games each seat won, outright or on net worth at the turn limit."""
+        return self.__wins.copy()
+
+    @property
+    def win_rate(self) -> 'np.ndarray':
+        """The fraction of games each seat won."""
+        return self.__wins / max(self.__games, 1)
+
+    def add(self, records: 'np.ndarray', rent: 'np.ndarray'):
+        """
+        Fold a batch of results into the totals.
+
+        Parameters:
+            records (numpy.ndarray):
+                One record per game; see `result_dtype`.
+
+            rent (numpy.ndarray):
+                The rent each deed collected over the batch.
+        """
+        winners = records['winner']
+        decided = winners[winners != NO_WINNER]
+
+        self.__games        += len(records)
+        self.__turns        += int(records['turns'].sum())
+        self.__draws        += len(records) - int(records['finished'].sum())
+        self.__bankruptcies += int(records['bankrupt'].sum())
+        self.__wins         += np.bincount(decided, minlength=self.__players)
+        self.__cash         += records['cash'].sum(axis=0)
+        self.__rent         += rent
+
+        if self.__records is not None:
+            self.__records.append(records)
+
+    def summary(self) -> dict:
+        """Get the totals as plain data, such as for JSON."""
+        return {
+            'games':        self.__games,
+            'mean_turns':   self.mean_turns,
+            'draws':        self.__draws,
+            'bankruptcies': self.__bankruptcies,
+            'win_rate':     self.win_rate.tolist(),
+            'cash_by_seat': self.cash_by_seat.tolist(),
+            'rent_by_deed': self.rent_by_deed,
+        }
+
+
+# The deed catalog of a worker process, decoded once from shared memory when the worker starts.
+_specs = None
+
+
+def _attach(name: str, size: int):
+    global _specs
+
+    memory = shared_memory.SharedMemory(name=name)
+
+    try:
+        _specs = specs_from_buffer(memory.buf[:size])
+    finally:
+        memory.close()
+
+
+def play_batch(
+        games:         Sequence[int],
+        seed:          int,
+        players:       int = DEFAULT_PLAYERS,
+        starting_cash: int = DEFAULT_STARTING_CASH,
+        max_turns:     int = DEFAULT_MAX_TURNS,
+        specs:         Optional[Sequence[DeedSpec]] = None
+) -> tuple['np.ndarray', 'np.ndarray']:
+    """
+    Play a batch of games.
+
+    Parameters:
+        games (Sequence[int]):
+            The number of each game, which (with the seed) decides its dice.
+
+        seed (int):
+            The tournament seed.
+
+        players (int):
+            The number of players in each game.
+
+        starting_cash (int):
+            The cash each player starts with.
+
+        max_turns (int):
+            The most turns to play in each game.
+
+        specs (Optional[Sequence[DeedSpec]]):
+            The deeds to play with. Defaults to the worker's shared catalog, or the bundled one.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray]:
+            One result record per game (see `result_dtype`), and the rent each deed collected over the batch.
+    """
+    from monopyly.models.deeds.deed import PropertyDeed
+    from monopyly.models.player import Player
+    from monopyly.models.player_table import PlayerTable
+    from monopyly.models.session.session import GameSession
+    from monopyly.models.session.simulation import play_game
+    from monopyly.utils.rng import RNGSource
+
+    specs   = specs or _specs or load_deeds()
+    records = np.zeros(len(games), dtype=result_dtype(players))
+    rent    = np.zeros(len(specs), dtype=np.int64)
+
+    for index, game in enumerate(games):
+        table = PlayerTable(players)
+        table.add_many(players, cash=starting_cash, game=game, seat=np.arange(players))
+        seats = [Player(table, row) for row in range(players)]
+        deeds = PropertyDeed.from_catalog(specs)
+        rng   = RNGSource(np.random.SeedSequence(seed, spawn_key=(game,)))
+
+        result = play_game(GameSession(seats, deeds, rng=rng, session_id=game), max_turns, specs)
+
+        record = records[index]
+        record['game']     = game
+        record['winner']   = NO_WINNER if result.leader is None else result.leader.row
+        record['finished'] = result.winner is not None
+        record['bankrupt'] = result.bankrupt
+        record['turns']    = result.turns
+        record['cash']     = table.cash
+
+        rent += [deed.rent_history.total for deed in deeds]
+
+    return records, rent
+
+
+def _play_batch(args: tuple) -> tuple['np.ndarray', 'np.ndarray']:
+    return play_batch(*args)
+
+
+def iter_batches(
+        games:         int,
+        seed:          int = 0,
+        players:       int = DEFAULT_PLAYERS,
+        starting_cash: int = DEFAULT_STARTING_CASH,
+        max_turns:     int = DEFAULT_MAX_TURNS,
+        processes:     Optional[int] = None,
+        batch_size:    int = DEFAULT_BATCH_SIZE,
+        csv_file:      Optional[Union[str, Path]] = None
+) -> Iterator[tuple['np.ndarray', 'np.ndarray']]:
+    """
+    Play a tournament, yielding each batch of results as it finishes.
+
+    Batches arrive in the order they finish, not game order. See `run_tournament` for the parameters.
+
+    Yields:
+        tuple[numpy.ndarray, numpy.ndarray]:
+            A batch of result records, and the rent each deed collected over it; see `play_batch`.
+    """
+    if games < 0:
+        raise ValueError('Cannot play a negative number of games.')
+
+    if batch_size < 1:
+        raise ValueError('Batch size must be at least one.')
+
+    specs   = load_deeds(csv_file)
+    batches = [
+        (range(start, min(start + batch_size, games)), seed, players, starting_cash, max_turns)
+        for start in range(0, games, batch_size)
+    ]
+
+    if processes == 1:
+        for batch in batches:
+            yield play_batch(*batch, specs=specs)
+
+        return
+
+    packed = pack_deeds(specs)
+    memory = shared_memory.SharedMemory(create=True, size=len(packed))
+
+    try:
+        memory.buf[:len(packed)] = packed
+
+        with multiprocessing.Pool(processes, initializer=_attach, initargs=(memory.name, len(packed))) as pool:
+            yield from pool.imap_unordered(_play_batch, batches)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def run_tournament(
+        games:         int,
+        seed:          int = 0,
+        players:       int = DEFAULT_PLAYERS,
+        starting_cash: int = DEFAULT_STARTING_CASH,
+        max_turns:     int = DEFAULT_MAX_TURNS,
+        processes:     Optional[int] = None,
+        batch_size:    int = DEFAULT_BATCH_SIZE,
+        csv_file:      Optional[Union[str, Path]] = None,
+        keep_games:    bool = False,
+        on_batch:      Optional[Callable[[TournamentResults], None]] = None
+) -> TournamentResults:
+    """
+    Play many bot-vs-bot games and total up the results.
+
+    Parameters:
+        games (int):
+            The number of games.
+
+        seed (int):
+            The tournament seed. The same seed plays the same games, whatever the number of processes.
+
+        players (int):
+            The number of players in each game.
+
+        starting_cash (int):
+            The cash each player starts with.
+
+        max_turns (int):
+            The most turns to play in each game.
+
+        processes (Optional[int]):
+            The number of worker processes. If not specified, one per CPU; if 1, games are played in this process.
+
+        batch_size (int):
+            The number of games per task handed to a worker.
+
+        csv_file (Optional[Union[str, Path]]):
+            The properties CSV to play with. If not specified, the bundled catalog is used.
+
+        keep_games (bool):
+            Whether to keep every game's result record, as well as the totals.
+
+        on_batch (Optional[Callable[[TournamentResults], None]]):
+            Called with the running totals after each batch is folded in, such as to report progress.
+
+    Returns:
+        TournamentResults:
+            The totals.
+    """
+    results = TournamentResults(load_deeds(csv_file), players, keep_games)
+
+    for records, rent in iter_batches(games, seed, players, starting_cash, max_turns, processes, batch_size, csv_file):
+        results.add(records, rent)
+
+        if on_batch is not None:
+            on_batch(results)
+
+    return results
@@ -1,39 +1,94 @@
+from array import array
+from functools import partial
+from typing import Iterator, Optional
+
 from monopyly.models.player import Player
-from monopyly.utils.metaclass import Singleton
 from monopyly.models.restrictions.development.base import DevelopmentRestriction
+from monopyly.models.turns.scheduler import EffectScheduler
+
+
+class TurnCounter:
+    """
+    Keeps track of whose turn it is in a single game.
+
+    Each game gets its own counter (usually through its `GameSession`), so any number of games can run in one
+    process.
 
+    Every player keeps the seat they started in for the whole game. The players still in the game form a ring over
+    those seats (a pair of next/previous seat arrays plus a bitmask of active seats), so advancing the turn, dropping
+    a bankrupt player and looking up the current player are all constant time, and turn order never changes when
+    someone is eliminated.
 
-class TurnCounter(metaclass=Singleton):
+    Turn-limited effects, such as development restrictions and rent immunities, are kept in the counter's
+    `scheduler` and expire on their own as the players they count down on finish their turns.
+    """
 
-    __players: list[Player]
-    __development_restrictions: list[DevelopmentRestriction]
+    __players: tuple[Player, ...]
+    __development_restrictions: dict[DevelopmentRestriction, None]
 
 
     def __init__(self, players: list[Player]):
-        self.__bankrupt_players = {}
-        self.__current_turn     = 0
-        self.__players          = None
-        self.__total_turns      = 0
+        self.__active                     = 0
+        self.__active_count               = 0
+        self.__bankrupt_players           = {}
+        self.__current_turn               = 0
+        self.__development_restrictions   = {}
+        self.__next                       = array('i')
+        self.__players                    = None
+        self.__prev                       = array('i')
+        self.__scheduler                  = EffectScheduler()
+        self.__seat_of                    = {}
+        self.__total_turns                = 0
+
+        self.event_log = None
+        self.game_id   = None
 
         self.players = players
 
+    @property
+    def active_count(self) -> int:
+        """The number of players still in the game."""
+        return self.__active_count
+
+    @property
+    def active_players(self) -> Iterator[Player]:
+        """The players still in the game, in turn order, starting with the current player."""
+        if not self.__active_count:
+            return
+
+        seat = self.__current_turn
+
+        if not self.is_active_seat(seat):
+            seat = self.__advance(seat)
+
+        for _ in range(self.__active_count):
+            yield self.__players[seat]
+            seat = self.__next[seat]
+
     @property
     def bankrupt_players(self):
         return self.__bankrupt_players
 
     @property
-    def current_turn(self):
+    def current_turn(self) -> int:
+        """The seat of the player whose turn it is."""
         return self.__current_turn
 
     @property
     def current_player(self):
+        """
+        The player whose turn it is.
+
+        A player who goes bankrupt during their own turn stays the current player until `next_turn` is called.
+        """
         if not self.players:
             raise ValueError("Cannot get current player without players.")
 
-        return self.players[self.current_turn]
+        return self.__players[self.__current_turn]
 
     @property
-    def players(self):
+    def players(self) -> tuple[Player, ...]:
+        """Every player who started the game, indexed by seat, including those who have gone bankrupt."""
         return self.__players
 
     @players.setter
@@ -41,43 +96,177 @@ class TurnCounter(metaclass=Singleton):
         if self.players:
             raise ValueError("Cannot reset players after they have been set.")
 
-        self.__players = new
+        self.__players = tuple(new)
+        self.__seat_of = {player: seat for seat, player in enumerate(self.__players)}
+        self.__seat_all()
 
     @property
     def registered_restrictions(self) -> list[DevelopmentRestriction]:
-        return self.__development_restrictions
+        """The development restrictions registered with the counter that have not expired yet, oldest first."""
+        return list(self.__development_restrictions)
+
+    @property
+    def scheduler(self) -> EffectScheduler:
+        return self.__scheduler
 
     @property
     def total_turns(self):
+        """The number of complete rounds of turns played."""
         return self.__total_turns
 
+    def __advance(self, seat: int) -> int:
+        seat = self.__next[seat]
+
+        # A seat keeps its links when it is dropped from the ring, so this only loops when the seats after a
+        # bankrupt current player went bankrupt too.
+        while not self.is_active_seat(seat):
+            seat = self.__next[seat]
+
+        return seat
+
+    def __seat_all(self):
+        seats = len(self.__players)
+
+        self.__next         = array('i', ((seat + 1) % seats for seat in range(seats)))
+        self.__prev         = array('i', ((seat - 1) % seats for seat in range(seats)))
+        self.__active       = (1 << seats) - 1
+        self.__active_count = seats
+
+    def is_active(self, player: Player) -> bool:
+        """Check whether a player is still in the game."""
+        seat = self.__seat_of.get(player)
+
+        return seat is not None and self.is_active_seat(seat)
+
+    def is_active_seat(self, seat: int) -> bool:
+        return bool(self.__active >> seat & 1)
+
+    def seat_of(self, player: Player) -> int:
+        """
+        Get the seat a player started the game in.
+
+        Raises:
+            ValueError:
+                If the player is not in the game.
+        """
+        try:
+            return self.__seat_of[player]
+        except KeyError:
+            raise ValueError("Player is not in the game.") from None
+
+    def __drop_seat(self, seat: int):
+        prev, next_ = self.__prev[seat], self.__next[seat]
+        self.__next[prev] = next_
+        self.__prev[next_] = prev
+
+        self.__active       &= ~(1 << seat)
+        self.__active_count -= 1
+
+    def __register(self, restriction: DevelopmentRestriction, turns: Optional[int] = None):
+        # Registered restrictions are an insertion-ordered set; each one drops itself when it expires or is lifted.
+        self.__development_restrictions[restriction] = None
+        restriction.schedule(self.__scheduler, partial(self.__development_restrictions.pop, restriction, None), turns)
+
     def bankrupt_player(self, player: Player):
-        if player not in self.players:
+        seat = self.__seat_of.get(player)
+
+        if seat is None or not self.is_active_seat(seat):
             raise ValueError("Player is not in the game.")
 
-        self.players.remove(player)
+        self.__drop_seat(seat)
+
         self.__bankrupt_players[player.name] = self.total_turns
+        self.__scheduler.expire_all(player)
+
+        if self.event_log is not None:
+            self.event_log.on_bankrupt(player)
 
     def next_turn(self):
-        if not self.players or len(self.players) <= 1:
+        if self.__active_count <= 1:
             raise ValueError("Cannot proceed to next turn without two players or more.")
 
-        for restriction in self.registered_restrictions:
-            restriction.process_turn(self)
+        seat = self.__current_turn
+
+        if self.is_active_seat(seat):
+            self.__scheduler.end_turn(self.__players[seat])
+
+        following = self.__advance(seat)
 
-        self.__current_turn = (self.current_turn + 1) % len(self.players)
-        if self.current_turn == 0:
+        if following <= seat:
             self.__total_turns += 1
 
+        self.__current_turn = following
+
+        if self.event_log is not None:
+            self.event_log.on_turn(self)
+
     def register_restriction(self, restriction: DevelopmentRestriction):
-        if restriction not in self.registered_restrictions:
-            if not isinstance(restriction, DevelopmentRestriction):
-                raise ValueError('Invalid restriction type.')
+        if not isinstance(restriction, DevelopmentRestriction):
+            raise ValueError('Invalid restriction type.')
+
+        if restriction in self.__development_restrictions:
+            return
 
-            self.__development_restrictions.append(restriction)
+        self.__register(restriction)
 
+        if self.event_log is not None:
+            self.event_log.on_restriction(restriction)
 
     def reset(self):
+        self.__scheduler.reset()
+        self.__development_restrictions.clear()
         self.__bankrupt_players = {}
         self.__current_turn     = 0
         self.__total_turns      = 0
+        self.__seat_all()
+
+    def restore(
+            self,
+            current_turn:     int,
+            total_turns:      int,
+            bankrupt_players: Optional[dict[Player, int]] = None,
+            turns_taken:      Optional[dict[Player, int]] = None,
+            restrictions:     Optional[dict[DevelopmentRestriction, int]] = None
+    ):
+        """
+        Put the counter back into a saved state. Every registered restriction is dropped.
+
+        Nothing is reported to the event log: the players and restrictions restored were already logged when they
+        first went bankrupt or were registered.
+
+        Parameters:
+            current_turn (int):
+                The seat of the player whose turn it is.
+
+            total_turns (int):
+                The number of complete rounds played.
+
+            bankrupt_players (Optional[dict[Player, int]]):
+                The players who have gone bankrupt, and the round they went bankrupt in.
+
+            turns_taken (Optional[dict[Player, int]]):
+                The number of turns each player has finished, for the scheduler.
+
+            restrictions (Optional[dict[DevelopmentRestriction, int]]):
+                The restrictions to register, and the number of the favored player's turns each has left.
+        """
+        if not 0 <= current_turn < len(self.__players):
+            raise ValueError("Current turn must be a seat in the game.")
+
+        self.reset()
+        self.__scheduler.reset(turns_taken)
+
+        for player, round_ in (bankrupt_players or {}).items():
+            seat = self.seat_of(player)
+
+            if self.is_active_seat(seat):
+                self.__drop_seat(seat)
+
+            self.__bankrupt_players[player.name] = round_
+
+        for restriction, turns in (restrictions or {}).items():
+            if restriction not in self.__development_restrictions:
+                self.__register(restriction, turns)
+
+        self.__current_turn = current_turn
+        self.__total_turns  = total_turns
@@ -0,0 +1,167 @@
+import heapq
+from itertools import count
+from typing import Callable, Optional
+
+from monopyly.models.player import Player
+
+
+class ScheduledEffect:
+    """
+    A handle on an effect waiting in an `EffectScheduler`.
+
+    Parameters:
+        player (Player):
+            The player whose turns the effect counts down on.
+
+        expires_at (int):
+            The number of turns the player will have taken when the effect expires.
+
+        on_expire (Callable[[], None]):
+            Called once, when the effect expires.
+    """
+    __slots__ = ('player', 'expires_at', 'on_expire', 'cancelled', 'expired')
+
+    def __init__(self, player: Player, expires_at: int, on_expire: Callable[[], None]):
+        self.player     = player
+        self.expires_at = expires_at
+        self.on_expire  = on_expire
+        self.cancelled  = False
+        self.expired    = False
+
+    @property
+    def pending(self) -> bool:
+        return not (self.cancelled or self.expired)
+
+    def cancel(self):
+        """Drop the effect without calling `on_expire`."""
+        self.cancelled = True
+
+
+class EffectScheduler:
+    """
+    Expires turn-limited effects (development restrictions, rent immunities) when they run out.
+
+    Effects count down on one player's turns, so each player gets a min-heap of effects keyed by the number of turns
+    that player will have taken when the effect expires. Ending a turn only looks at the top of the current player's
+    heap, so the cost per turn depends on how many effects are due, not on how many are active.
+
+    Cancelled effects are left in their heap and skipped when they reach the top.
+    """
+    def __init__(self):
+        self.__heaps       = {}
+        self.__sequence    = count()
+        self.__turns_taken = {}
+
+    def __len__(self) -> int:
+        return sum(1 for heap in self.__heaps.values() for _, _, effect in heap if effect.pending)
+
+    def turns_taken(self, player: Player) -> int:
+        """Get the number of turns a player has finished."""
+        return self.__turns_taken.get(player, 0)
+
+    def turns_remaining(self, effect: ScheduledEffect) -> int:
+        """Get the number of the effect's player's turns left before it expires."""
+        if not effect.pending:
+            return 0
+
+        return max(0, effect.expires_at - self.turns_taken(effect.player))
+
+    def schedule(self, player: Player, turns: int, on_expire: Callable[[], None]) -> ScheduledEffect:
+        """
+        Schedule an effect to expire after a number of a player's turns.
+
+        Parameters:
+            player (Player):
+                The player whose turns the effect counts down on.
+
+            turns (int):
+                The number of the player's turns the effect lasts.
+
+            on_expire (Callable[[], None]):
+                Called when the effect expires.
+
+        Returns:
+            ScheduledEffect:
+                A handle that can be used to cancel the effect.
+        """
+        if not isinstance(turns, int) or turns < 0:
+            raise ValueError('Turns must be a non-negative integer.')
+
+        effect = ScheduledEffect(player, self.turns_taken(player) + turns, on_expire)
+
+        if not turns:
+            self.__expire(effect)
+            return effect
+
+        heapq.heappush(self.__heaps.setdefault(player, []), (effect.expires_at, next(self.__sequence), effect))
+
+        return effect
+
+    def end_turn(self, player: Player) -> list[ScheduledEffect]:
+        """
+        Record that a player finished a turn, and expire whatever was due.
+
+        Parameters:
+            player (Player):
+                The player whose turn ended.
+
+        Returns:
+            list[ScheduledEffect]:
+                The effects that expired.
+        """
+        taken = self.__turns_taken[player] = self.__turns_taken.get(player, 0) + 1
+        heap  = self.__heaps.get(player)
+
+        expired = []
+
+        while heap and heap[0][0] <= taken:
+            _, _, effect = heapq.heappop(heap)
+
+            if effect.pending:
+                self.__expire(effect)
+                expired.append(effect)
+
+        if heap is not None and not heap:
+            del self.__heaps[player]
+
+        return expired
+
+    def expire_all(self, player: Optional[Player] = None) -> list[ScheduledEffect]:
+        """
+        Expire every pending effect now, such as when a player goes bankrupt or the game is reset.
+
+        Parameters:
+            player (Optional[Player]):
+                Only expire effects that count down on this player's turns. If not specified, every effect expires.
+
+        Returns:
+            list[ScheduledEffect]:
+                The effects that expired.
+        """
+        players = list(self.__heaps) if player is None else [player]
+        expired = []
+
+        for key in players:
+            for _, _, effect in sorted(self.__heaps.pop(key, ())):
+                if effect.pending:
+                    self.__expire(effect)
+                    expired.append(effect)
+
+        return expired
+
+    def reset(self, turns_taken: Optional[dict[Player, int]] = None):
+        """
+        Expire every effect and start counting turns again.
+
+        Parameters:
+            turns_taken (Optional[dict[Player, int]]):
+                The number of turns each player has already finished, such as when restoring a saved game. Defaults
+                to none.
+        """
+        self.expire_all()
+        self.__turns_taken = dict(turns_taken or {})
+
+    @staticmethod
+    def __expire(effect: ScheduledEffect):
+        effect.expired = True
+        effect.on_expire()
@@ -0,0 +1,51 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+class _MissingModule(ModuleType):
+    """Stands in for a module that is not installed, and only complains when it is actually used."""
+    def __getattr__(self, name):
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module the first time one of its attributes is used, rather than now.
+
+    Uses the standard library's `LazyLoader`, so once the module has loaded it is an ordinary module again and
+    attribute access costs nothing extra. Heavy dependencies (NumPy, pandas) are imported this way so that importing
+    `monopyly` itself stays cheap.
+
+    Annotations that name a lazily imported module must be quoted (`-> 'np.ndarray'`), or they would load it.
+
+    Parameters:
+        name (str):
+            The full name of the module.
+
+    Returns:
+        ModuleType:
+            The module, or a stand-in that loads it on first use. If the module is not installed, the stand-in
+            raises `ModuleNotFoundError` on first use instead.
+
+    Example:
+        >>> np = lazy_import('numpy')
+    """
+    module = sys.modules.get(name)
+
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+
+    if spec is None:
+        return _MissingModule(name)
+
+    loader      = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module      = importlib.util.module_from_spec(spec)
+
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
@@ -0,0 +1,109 @@
+from typing import Optional, Sequence, Union
+
+from monopyly.utils.lazy import lazy_import
+
+
+np = lazy_import('numpy')
+
+
+class RNGSource:
+    """
+    A reproducible source of independent random streams.
+
+    Wraps a NumPy `SeedSequence`. Every call to `generator` hands out a `Generator` on a fresh child stream, and
+    `spawn` splits the source into independent sub-sources (one per worker process, say). Two sources built from the
+    same seed hand out the same streams in the same order, so any game can be replayed exactly from its seed.
+
+    Parameters:
+        seed (Optional[Union[int, Sequence[int], numpy.random.SeedSequence]]):
+            The master seed. If not specified, fresh entropy is pulled from the OS; read it back from `entropy` to
+            replay the run later.
+
+    Example:
+        >>> master = RNGSource(1234)
+        >>> workers = master.spawn(8)
+        >>> die = Die(rng=workers[0])
+    """
+    def __init__(self, seed: Optional[Union[int, Sequence[int], 'np.random.SeedSequence']] = None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.__seed_sequence = seed
+        else:
+            self.__seed_sequence = np.random.SeedSequence(seed)
+
+    def __getstate__(self):
+        return {'seed_sequence': self.__seed_sequence}
+
+    def __setstate__(self, state):
+        self.__seed_sequence = state['seed_sequence']
+
+    def __repr__(self):
+        return f'RNGSource(entropy={self.entropy}, spawn_key={self.spawn_key})'
+
+    @property
+    def entropy(self) -> int:
+        """The master entropy this source (and every source spawned from it) derives from."""
+        return self.__seed_sequence.entropy
+
+    @property
+    def seed_sequence(self) -> 'np.random.SeedSequence':
+        return self.__seed_sequence
+
+    @property
+    def spawn_key(self) -> tuple[int, ...]:
+        """Where this source sits in the spawn tree of its master seed."""
+        return self.__seed_sequence.spawn_key
+
+    def generator(self) -> 'np.random.Generator':
+        """
+        Get a `Generator` on the next independent child stream.
+
+        Returns:
+            numpy.random.Generator:
+                A generator that shares no state with any other generator handed out by this source.
+        """
+        return np.random.Generator(np.random.PCG64(self.__seed_sequence.spawn(1)[0]))
+
+    def spawn(self, n: int) -> list['RNGSource']:
+        """
+        Split off `n` independent sources.
+
+        Parameters:
+            n (int):
+                The number of sources to spawn.
+
+        Returns:
+            list[RNGSource]:
+                The new sources.
+        """
+        return [RNGSource(child) for child in self.__seed_sequence.spawn(n)]
+
+
+RNGLike = Union[None, int, 'np.random.SeedSequence', RNGSource, 'np.random.Generator']
+
+
+def resolve_generator(rng: RNGLike = None) -> 'np.random.Generator':
+    """
+    Turn anything that can describe a random stream into a `Generator`.
+
+    Parameters:
+        rng (RNGLike):
+            One of;
+              - `None`; a generator seeded from fresh OS entropy.
+              - an `int` or `SeedSequence`; a generator seeded from it.
+              - an `RNGSource`; the source's next child stream.
+              - a `Generator`; returned as-is.
+
+    Returns:
+        numpy.random.Generator:
+            The generator.
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+
+    if isinstance(rng, RNGSource):
+        return rng.generator()
+
+    if rng is None or isinstance(rng, (int, np.random.SeedSequence)):
+        return np.random.default_rng(rng)
+
+    raise TypeError(f'Cannot build a random generator from {type(rng)}!')
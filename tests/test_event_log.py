@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from monopyly.models.deeds.deed import PropertyDeed
+from monopyly.models.deeds.loader import load_deeds
+from monopyly.models.player import Player
+from monopyly.models.restrictions.development.base import DevelopmentRestriction
+from monopyly.models.session.event_log import EventLog, replay
+from monopyly.models.session.session import GameSession
+from monopyly.models.session.simulation import play_turn
+from monopyly.models.session.snapshot import Snapshot, take_snapshot
+
+
+STARTING_CASH = 300
+"""Low enough that players go bankrupt within a couple of hundred turns."""
+
+TURNS = 240
+
+
+def _session(seed: int) -> GameSession:
+    players = []
+
+    for seat in range(4):
+        player = Player()
+        player.name = f'Player {seat + 1}'
+        player.cash = STARTING_CASH
+        players.append(player)
+
+    return GameSession(players, PropertyDeed.from_catalog(), rng=seed)
+
+
+class ReplayTest(unittest.TestCase):
+    """Replaying a log to the end of any turn rebuilds the state the game was in at that point."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.path = Path(directory.name) / 'game.events'
+
+    def __play(self, seed: int) -> dict[int, Snapshot]:
+        session   = _session(seed)
+        counter   = session.turn_counter
+        board     = {spec.space: deed for spec, deed in zip(load_deeds(), session.deeds)}
+        positions = [0] * len(counter.players)
+        snapshots = {}
+
+        with EventLog(self.path, keyframe_interval=16) as log:
+            log.attach(session)
+            snapshots[0] = Snapshot(take_snapshot(session, ledger_tail=0))
+
+            for turn in range(TURNS):
+                if turn == 20:
+                    DevelopmentRestriction(session.deeds[3], 12, counter.players[1], turn_counter=counter)
+
+                if turn == 30:
+                    owned = next(deed for deed in session.deeds if deed.owner is not None)
+                    owned.mortgage()
+
+                if turn == 50 and owned.mortgaged:
+                    owned.lift_mortgage()
+
+                if play_turn(session, positions, board, turn) is not None and counter.active_count <= 1:
+                    break
+
+                counter.next_turn()
+                snapshots[log.turn] = Snapshot(take_snapshot(session, ledger_tail=0))
+
+        return snapshots
+
+    def assertSameState(self, expected: Snapshot, actual: Snapshot, turn: int):
+        for section in ('players', 'deeds', 'restrictions'):
+            self.assertTrue(
+                (getattr(expected, section) == getattr(actual, section)).all(),
+                f'{section} differ after turn {turn}'
+            )
+
+        self.assertEqual(expected.current_turn, actual.current_turn, f'current turn differs after turn {turn}')
+        self.assertEqual(expected.total_turns, actual.total_turns, f'total turns differ after turn {turn}')
+
+    def test_replay_matches_live_game_at_every_turn(self):
+        for seed in (3, 7):
+            snapshots = self.__play(seed)
+
+            self.assertGreater(len(snapshots), 1)
+
+            for turn, expected in snapshots.items():
+                session = _session(seed)
+
+                self.assertEqual(replay(self.path, session, turn), turn)
+                self.assertSameState(expected, Snapshot(take_snapshot(session, ledger_tail=0)), turn)
+
+
+if __name__ == '__main__':
+    unittest.main()